@@ -1,6 +1,27 @@
-from django.apps import AppConfig
+import importlib
+
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_migrate
+
+# receivers of the optional apps, connected only if all the apps they need are installed
+optional_signals = {
+    'allianceauth_graphql.srp.signals': ('allianceauth.srp',),
+    'allianceauth_graphql.calendar.signals': ('allianceauth.timerboard', 'allianceauth.optimer'),
+    'allianceauth_graphql.hrapplications.signals': ('allianceauth.hrapplications',),
+    'allianceauth_graphql.community_creations.allianceauth_pve_integration.signals': ('allianceauth_pve',),
+}
 
 
 class AllianceauthGraphqlConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'allianceauth_graphql'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .indexes import create_missing_indexes
+
+        post_migrate.connect(create_missing_indexes, sender=self)
+
+        for module, required_apps in optional_signals.items():
+            if all(apps.is_installed(app) for app in required_apps):
+                importlib.import_module(module)
@@ -0,0 +1,73 @@
+import hashlib
+from calendar import timegm
+from datetime import datetime
+
+from graphql_jwt import backends, exceptions
+from graphql_jwt.utils import get_credentials, get_payload, get_user_by_payload
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext as _
+
+User = get_user_model()
+
+JWT_USER_CACHE_TIMEOUT = getattr(settings, 'GRAPHQL_JWT_USER_CACHE_TIMEOUT', 60)
+
+
+def jwt_token_cache_key(token: str) -> str:
+    return f'allianceauth_graphql:jwt_token:{hashlib.sha256(token.encode()).hexdigest()}'
+
+
+def load_user(user_pk):
+    """Loads the user with the profile, main character and state used by most resolvers"""
+    return (
+        User.objects
+        .select_related('profile__main_character', 'profile__state')
+        .filter(pk=user_pk)
+        .first()
+    )
+
+
+def get_user_by_token(token: str, context=None):
+    """
+    Returns the user of the token with profile, main character and state preloaded.
+
+    The token is decoded and its user is looked up by the configured graphql_jwt handlers only when
+    the user pk of the token is not cached. The user is loaded again on every request.
+    """
+    user_pk = cache.get(jwt_token_cache_key(token))
+
+    if user_pk is None:
+        payload = get_payload(token, context)
+        user = get_user_by_payload(payload)
+        if user is None:
+            return None
+
+        timeout = JWT_USER_CACHE_TIMEOUT
+        if 'exp' in payload:
+            timeout = min(timeout, payload['exp'] - timegm(datetime.utcnow().utctimetuple()))
+        cache.set(jwt_token_cache_key(token), user.pk, timeout)
+        user_pk = user.pk
+
+    user = load_user(user_pk)
+
+    if user is not None and not user.is_active:
+        raise exceptions.JSONWebTokenError(_("User is disabled"))
+
+    return user
+
+
+class JSONWebTokenBackend(backends.JSONWebTokenBackend):
+    """JSONWebTokenBackend caching the users with the data used by most resolvers"""
+
+    def authenticate(self, request=None, **kwargs):
+        if request is None or getattr(request, "_jwt_token_auth", False):
+            return None
+
+        token = get_credentials(request, **kwargs)
+
+        if token is not None:
+            return get_user_by_token(token, request)
+
+        return None
@@ -38,7 +38,7 @@ class Query:
 
     @login_required
     def resolve_authentication_user_groups(self, info):
-        groups = info.context.user.groups.all()
+        groups = info.context.user.groups.select_related('authgroup')
         if 'allianceauth.eveonline.autogroups' in settings.INSTALLED_APPS:
             groups = groups\
                 .filter(managedalliancegroup__isnull=True)\
@@ -0,0 +1,2 @@
+from .queries import Query
+from .mutations import Mutation
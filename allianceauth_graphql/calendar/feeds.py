@@ -0,0 +1,200 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils import timezone
+
+from allianceauth.optimer.models import OpTimer
+
+from ..models import CalendarFeed
+from ..timerboard.queries import visible_timers
+
+
+FEED_PAST_DAYS = getattr(settings, 'GRAPHQL_CALENDAR_FEED_PAST_DAYS', 7)
+
+FEED_TOKEN_SALT = 'allianceauth_graphql.calendar.feed'
+FEED_LAST_MODIFIED_CACHE_KEY = 'allianceauth_graphql_calendar_feed_last_modified'
+
+
+def feed_version_subquery():
+    return Coalesce(
+        Subquery(CalendarFeed.objects.filter(user_id=OuterRef('pk')).values('version')[:1]),
+        0
+    )
+
+
+def feed_token(user, version=None) -> str:
+    """Returns the feed token of the user, it is valid until the feed URL is regenerated"""
+    if version is None:
+        version = CalendarFeed.objects.filter(user=user).values_list('version', flat=True).first() or 0
+    return signing.dumps([user.pk, version], salt=FEED_TOKEN_SALT, compress=True)
+
+
+def regenerate_feed_token(user) -> str:
+    """Invalidates the feed tokens given to the user before and returns a new one"""
+    with transaction.atomic():
+        feed, _ = CalendarFeed.objects.select_for_update().get_or_create(user=user)
+        feed.version += 1
+        feed.save(update_fields=['version'])
+
+    return feed_token(user, feed.version)
+
+
+def feed_url(request, token) -> str:
+    return request.build_absolute_uri(reverse('allianceauth_graphql:calendar_feed', args=[token]))
+
+
+def feed_user(token):
+    """Returns the active user of the feed token, None if the token is invalid or has been regenerated"""
+    try:
+        user_pk, version = signing.loads(token, salt=FEED_TOKEN_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+    return (
+        User.objects
+        .select_related('profile__main_character')
+        .annotate(feed_version=feed_version_subquery())
+        .filter(pk=user_pk, is_active=True, feed_version=version)
+        .first()
+    )
+
+
+def touch_feeds():
+    """Marks the feeds as modified, it has to be called every time a timer or an operation changes"""
+    cache.set(FEED_LAST_MODIFIED_CACHE_KEY, timezone.now().replace(microsecond=0), None)
+
+
+def feeds_last_modified() -> datetime.datetime:
+    """
+    Last time a timer or an operation changed.
+
+    If the cache has been cleared the current time is stored, so the feeds are sent again once.
+    """
+    return cache.get_or_set(
+        FEED_LAST_MODIFIED_CACHE_KEY,
+        lambda: timezone.now().replace(microsecond=0),
+        None
+    )
+
+
+def feed_window_start() -> datetime.datetime:
+    """Start of the feed window, it moves once a day so it is part of the feed version"""
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - datetime.timedelta(days=FEED_PAST_DAYS)
+
+
+def escape_text(value) -> str:
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def format_time(value: datetime.datetime) -> str:
+    return value.astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def content_line(name, value) -> str:
+    """Returns the content line folded at 75 octets, as required by RFC 5545"""
+    line = f'{name}:{value}'.encode()
+    chunks = []
+    while len(line) > 75:
+        cut = 75 if not chunks else 74
+        # never split a multi-byte character
+        while cut > 0 and (line[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(line[:cut])
+        line = line[cut:]
+    chunks.append(line)
+    return '\r\n '.join(chunk.decode() for chunk in chunks) + '\r\n'
+
+
+def render_event(uid, start, summary, location, description, stamp) -> str:
+    return ''.join([
+        'BEGIN:VEVENT\r\n',
+        content_line('UID', uid),
+        content_line('DTSTAMP', format_time(stamp)),
+        content_line('DTSTART', format_time(start)),
+        content_line('SUMMARY', escape_text(summary)),
+        content_line('LOCATION', escape_text(location)),
+        content_line('DESCRIPTION', escape_text(description)),
+        'END:VEVENT\r\n',
+    ])
+
+
+def timer_event(timer, domain, stamp) -> str:
+    location = f'{timer.system} {timer.planet_moon}'.strip()
+    return render_event(
+        f'timer-{timer.pk}@{domain}',
+        timer.eve_time,
+        f'{timer.objective} {timer.structure} {timer.get_timer_type_display()} - {location}',
+        location,
+        timer.details,
+        stamp
+    )
+
+
+def optimer_event(op, domain, stamp) -> str:
+    description = [
+        f'Doctrine: {op.doctrine}',
+        f'FC: {op.fc}',
+        f'Duration: {op.duration}',
+    ]
+    if op.type is not None:
+        description.append(f'Type: {op.type.type}')
+    if op.description:
+        description.append(op.description)
+
+    return render_event(
+        f'optimer-{op.pk}@{domain}',
+        op.start,
+        op.operation_name,
+        op.system,
+        '\n'.join(description),
+        stamp
+    )
+
+
+def render_feed(user, domain, include_timers, include_optimers, stamp):
+    """
+    Yields the iCalendar feed of the user in chunks, reading the rows lazily.
+
+    The timers come first and then the operations, calendar clients don't need the events sorted.
+    """
+    window_start = feed_window_start()
+
+    yield ''.join([
+        'BEGIN:VCALENDAR\r\n',
+        'VERSION:2.0\r\n',
+        'PRODID:-//allianceauth-graphql//calendar feed//EN\r\n',
+        'CALSCALE:GREGORIAN\r\n',
+        'METHOD:PUBLISH\r\n',
+    ])
+
+    if include_timers:
+        timers = visible_timers(user, from_=window_start).order_by('eve_time', 'id')
+        for timer in timers.iterator():
+            yield timer_event(timer, domain, stamp)
+
+    if include_optimers:
+        optimers = (
+            OpTimer.objects
+            .select_related('type')
+            .filter(start__gte=window_start)
+            .order_by('start', 'id')
+        )
+        for op in optimers.iterator():
+            yield optimer_event(op, domain, stamp)
+
+    yield 'END:VCALENDAR\r\n'
@@ -0,0 +1,21 @@
+import graphene
+from graphql_jwt.decorators import login_required
+
+from ..decorators import permissions_required
+from .feeds import feed_url, regenerate_feed_token
+
+
+class RegenerateCalendarFeedUrlMutation(graphene.Mutation):
+    ok = graphene.Boolean()
+    calendar_feed_url = graphene.String()
+
+    @classmethod
+    @login_required
+    @permissions_required(('auth.timer_view', 'auth.optimer_view'))
+    def mutate(cls, root, info):
+        token = regenerate_feed_token(info.context.user)
+        return cls(ok=True, calendar_feed_url=feed_url(info.context, token))
+
+
+class Mutation:
+    calendar_regenerate_feed_url = RegenerateCalendarFeedUrlMutation.Field()
@@ -0,0 +1,76 @@
+import heapq
+from itertools import islice
+
+import graphene
+from graphql_jwt.decorators import login_required
+
+from allianceauth.optimer.models import OpTimer
+from allianceauth.timerboard.models import Timer
+
+from ..decorators import get_permission_cache, permissions_required
+from ..pagination import pagination_arguments
+from ..timerboard.queries import TIMERS_DEFAULT_LIMIT, aware, visible_timers
+from .feeds import feed_token, feed_url
+from .types import CalendarEventType
+
+
+def merge_events(timers, optimers, offset=0, limit=None):
+    """
+    Merges the structure timers and the operations, both already ordered by time, in time order.
+
+    Each queryset is fetched at most up to the end of the requested page and lazily,
+    so the events are yielded while the rows are read.
+    """
+    if offset < 0 or (limit is not None and limit < 0):
+        raise Exception("Offset and limit must be positive")
+
+    stop = None if limit is None else offset + limit
+    if stop is not None:
+        timers = timers[:stop]
+        optimers = optimers[:stop]
+
+    merged = heapq.merge(
+        ((timer.eve_time, 0, timer) for timer in timers.iterator()),
+        ((op.start, 1, op) for op in optimers.iterator()),
+        key=lambda event: event[:2]
+    )
+    return (event for _, _, event in islice(merged, offset, stop))
+
+
+class Query:
+    calendar_events = graphene.List(
+        graphene.NonNull(CalendarEventType),
+        required=True,
+        from_=graphene.DateTime(required=True, name='from'),
+        to=graphene.DateTime(required=True),
+        **pagination_arguments(default_limit=TIMERS_DEFAULT_LIMIT)
+    )
+
+    calendar_feed_url = graphene.String(required=True)
+
+    @login_required
+    @permissions_required(('auth.timer_view', 'auth.optimer_view'))
+    def resolve_calendar_feed_url(self, info):
+        return feed_url(info.context, feed_token(info.context.user))
+
+    @login_required
+    @permissions_required(('auth.timer_view', 'auth.optimer_view'))
+    def resolve_calendar_events(self, info, from_, to, offset, limit):
+        perm_cache = get_permission_cache(info.context)
+        from_, to = aware(from_), aware(to)
+
+        if perm_cache.has_perm('auth.timer_view'):
+            timers = visible_timers(info.context.user, from_=from_, to=to).order_by('eve_time', 'id')
+        else:
+            timers = Timer.objects.none()
+
+        optimers = (
+            OpTimer.objects
+            .select_related('eve_character', 'type')
+            .filter(start__gte=from_, start__lt=to)
+            .order_by('start', 'id')
+        )
+        if not perm_cache.has_perm('auth.optimer_view'):
+            optimers = optimers.none()
+
+        return merge_events(timers, optimers, offset, limit)
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from allianceauth.optimer.models import OpTimer, OpTimerType
+from allianceauth.timerboard.models import Timer
+
+from .feeds import touch_feeds
+
+
+@receiver([post_save, post_delete], sender=Timer)
+@receiver([post_save, post_delete], sender=OpTimer)
+@receiver([post_save, post_delete], sender=OpTimerType)
+def invalidate_calendar_feeds(sender, instance, **kwargs):
+    touch_feeds()
@@ -0,0 +1,9 @@
+import graphene
+
+from ..optimer.types import OpTimerModelType
+from ..timerboard.types import StructureTimerType
+
+
+class CalendarEventType(graphene.Union):
+    class Meta:
+        types = (StructureTimerType, OpTimerModelType)
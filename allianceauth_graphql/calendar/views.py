@@ -0,0 +1,44 @@
+import hashlib
+
+from django.http import Http404, HttpResponseForbidden, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from ..decorators import RequestPermissionCache
+from .feeds import feed_user, feed_window_start, feeds_last_modified, render_feed
+
+
+def calendar_feed(request, token):
+    """
+    iCalendar feed of the timers and the operations the owner of the token can see.
+
+    The ETag and Last-Modified headers are computed without reading the events,
+    so the clients polling an unchanged feed get a 304 response.
+    """
+    user = feed_user(token)
+    if user is None:
+        raise Http404
+
+    perm_cache = RequestPermissionCache(user)
+    include_timers = perm_cache.has_perm('auth.timer_view') and user.profile.main_character is not None
+    include_optimers = perm_cache.has_perm('auth.optimer_view')
+    if not include_timers and not include_optimers:
+        return HttpResponseForbidden()
+
+    last_modified = max(feeds_last_modified(), feed_window_start())
+    corporation_id = user.profile.main_character.corporation_id if include_timers else None
+    version = f'{user.pk}:{corporation_id}:{include_timers}:{include_optimers}:{last_modified.isoformat()}'
+    etag = quote_etag(hashlib.md5(version.encode()).hexdigest())
+    last_modified_timestamp = int(last_modified.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_timestamp)
+    if response is None:
+        response = StreamingHttpResponse(
+            render_feed(user, request.get_host(), include_timers, include_optimers, last_modified),
+            content_type='text/calendar; charset=utf-8'
+        )
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified_timestamp)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
@@ -1,6 +1,6 @@
 import graphene
 from graphene_django.forms.mutation import DjangoModelFormMutation
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
 from django.utils import timezone
 from django.db import transaction
@@ -10,7 +10,9 @@ from allianceauth.services.hooks import get_extension_logger
 from allianceauth_pve.models import Rotation, Entry, EntryRole, EntryCharacter
 from allianceauth_pve.forms import NewRotationForm
 
+from allianceauth_graphql.decorators import permission_required
 from .inputs import EntryInput, RotationCloseInput
+from .summaries import RotationSummaryUpdate, add_to_daily_totals
 from .types import RotationType, EntryType
 
 logger = get_extension_logger(__name__)
@@ -43,6 +45,7 @@ class CreateRattingEntry(graphene.Mutation):
 
         if ok:
             with transaction.atomic():
+                summary_update = RotationSummaryUpdate(rotation_id)
                 entry = Entry.objects.create(
                     rotation_id=rotation_id,
                     estimated_total=input['estimated_total'],
@@ -83,6 +86,9 @@ class CreateRattingEntry(graphene.Mutation):
 
                 EntryCharacter.objects.bulk_create(to_add)
 
+                summary_update.add_entry(entry.pk)
+                summary_update.save()
+
         else:
             entry = None
 
@@ -113,6 +119,9 @@ class ModifyRattingEntry(graphene.Mutation):
 
         if ok:
             with transaction.atomic():
+                summary_update = RotationSummaryUpdate(entry.rotation_id)
+                summary_update.remove_entry(entry.pk)
+
                 entry.ratting_shares.all().delete()
                 entry.roles.all().delete()
                 entry.estimated_total = input['estimated_total']
@@ -150,6 +159,9 @@ class ModifyRattingEntry(graphene.Mutation):
 
                 EntryCharacter.objects.bulk_create(to_add)
 
+                summary_update.add_entry(entry.pk)
+                summary_update.save()
+
         return cls(ok=ok, errors=errors, entry=entry)
 
 
@@ -172,7 +184,11 @@ class DeleteRattingEntry(graphene.Mutation):
             ok = False
         else:
             ok = True
-            entry.delete()
+            with transaction.atomic():
+                summary_update = RotationSummaryUpdate(rotation.pk)
+                summary_update.remove_entry(entry.pk)
+                entry.delete()
+                summary_update.save()
 
         return cls(ok=ok, rotation=rotation)
 
@@ -211,6 +227,8 @@ class CloseRotation(graphene.Mutation):
                 rotation.closed_at = timezone.now()
                 rotation.save()
 
+                add_to_daily_totals([rotation])
+
             ok = True
 
         return cls(ok=ok)
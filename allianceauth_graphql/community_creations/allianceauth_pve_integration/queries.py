@@ -1,8 +1,8 @@
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
 from django.utils import timezone
-from django.db.models import Q, Exists, F, OuterRef
+from django.db.models import Q, Exists, F, OuterRef, Prefetch
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
@@ -12,16 +12,34 @@ from allianceauth.authentication.models import CharacterOwnership
 from allianceauth.eveonline.models import EveCharacter
 
 
-from allianceauth_pve.models import Rotation, PveButton, RoleSetup, General
-from allianceauth_pve.actions import running_averages
+from allianceauth_pve.models import Rotation, PveButton, RoleSetup, General, Entry
+from allianceauth_graphql.decorators import permission_required
 from allianceauth_graphql.eveonline.types import EveCharacterType
 
+from .summaries import RotationSummaryLoader, running_averages
 from .types import RotationType, RoleSetupType, RattingSummaryType, PveButtonType
 
 
 User = get_user_model()
 
 
+def with_summary_loader(rotations):
+    """Evaluates the rotations sharing a summary loader, so the summaries are loaded together"""
+    rotations = list(rotations)
+    loader = RotationSummaryLoader(rotations)
+    for rotation in rotations:
+        rotation.summary_loader = loader
+    return rotations
+
+
+def rotations_list_queryset():
+    return Rotation.objects.prefetch_related(
+        Prefetch('entries', queryset=Entry.objects.order_by('-created_at'), to_attr='ordered_entries'),
+        'entry_buttons',
+        'roles_setups',
+    )
+
+
 class Query:
     pve_get_rotation = graphene.Field(RotationType, id=graphene.Int(required=True))
     pve_closed_rotations = graphene.List(RotationType)
@@ -39,7 +57,7 @@ class Query:
     @login_required
     @permission_required('allianceauth_pve.access_pve')
     def resolve_pve_closed_rotations(self, info):
-        return Rotation.objects.filter(is_closed=True).order_by('-closed_at')
+        return with_summary_loader(rotations_list_queryset().filter(is_closed=True).order_by('-closed_at'))
 
     @login_required
     def resolve_pve_char_running_averages(self, info, start_date, end_date=None):
@@ -48,7 +66,7 @@ class Query:
     @login_required
     @permission_required('allianceauth_pve.access_pve')
     def resolve_pve_active_rotations(self, info):
-        return Rotation.objects.filter(is_closed=False).order_by('-priority')
+        return with_summary_loader(rotations_list_queryset().filter(is_closed=False).order_by('-priority'))
 
     @login_required
     @permission_required('allianceauth_pve.manage_entries')
@@ -90,7 +108,7 @@ class Query:
     @login_required
     @permission_required('allianceauth_pve.manage_rotations')
     def resolve_pve_roles_setups(self, info):
-        return RoleSetup.objects.all()
+        return RoleSetup.objects.prefetch_related('roles')
 
     @login_required
     @permission_required('allianceauth_pve.manage_rotations')
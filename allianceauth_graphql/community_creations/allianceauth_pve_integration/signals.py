@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from allianceauth_pve.models import Rotation, Entry
+
+from allianceauth_graphql.models import PveRotationSummary
+
+from .summaries import add_to_daily_totals, remove_from_daily_totals, update_summaries
+
+
+@receiver([post_save, post_delete], sender=Entry)
+def update_pve_rotation_summary(sender, instance: Entry, **kwargs):
+    # the shares are saved after the entry, so the summary is updated once the transaction is committed
+    transaction.on_commit(lambda: update_summaries([instance.rotation_id]))
+
+
+@receiver(post_save, sender=Rotation)
+def add_pve_rotation_to_daily_totals(sender, instance: Rotation, **kwargs):
+    # rotations closed in the allianceauth-pve views, the ones already added are skipped
+    if instance.is_closed:
+        transaction.on_commit(lambda: add_to_daily_totals([instance]))
+
+
+@receiver(pre_delete, sender=Rotation)
+def remove_pve_rotation_from_daily_totals(sender, instance: Rotation, **kwargs):
+    remove_from_daily_totals(instance)
+
+
+@receiver(post_delete, sender=Rotation)
+def delete_pve_rotation_summary(sender, instance: Rotation, **kwargs):
+    PveRotationSummary.objects.filter(rotation_id=instance.pk).delete()
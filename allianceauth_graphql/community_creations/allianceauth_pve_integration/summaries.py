@@ -0,0 +1,400 @@
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from allianceauth_pve.models import Entry, EntryCharacter, Rotation, RotationSetupSummary
+
+from allianceauth_graphql.models import PveDailyTotal, PveRotationSummary, PveRotationUserSummary
+
+User = get_user_model()
+
+
+def entries_states(rotation_ids) -> dict:
+    """Number of entries, last update and estimated total of the entries of every rotation"""
+    states = (
+        Entry.objects
+        .filter(rotation_id__in=rotation_ids)
+        .values('rotation_id')
+        .order_by()
+        .annotate(
+            entry_count=models.Count('pk'),
+            last_entry_update=models.Max('updated_at'),
+            estimated_total=Coalesce(models.Sum('estimated_total'), 0),
+        )
+    )
+    result = {
+        rotation_id: {'entry_count': 0, 'last_entry_update': None, 'estimated_total': 0}
+        for rotation_id in rotation_ids
+    }
+    result.update({state.pop('rotation_id'): state for state in states})
+    return result
+
+
+def is_up_to_date(summary: PveRotationSummary, state: dict) -> bool:
+    return summary.entry_count == state['entry_count'] and summary.last_entry_update == state['last_entry_update']
+
+
+def shares_contributions(shares) -> dict:
+    """
+    Sums the estimated share before taxes and the number of shares of every user.
+
+    `shares` are tuples of entry id, user id, site count, role value and entry estimated total.
+    """
+    shares = list(shares)
+    entry_weights = defaultdict(int)
+    for entry_id, _, site_count, role_value, _ in shares:
+        entry_weights[entry_id] += site_count * role_value
+
+    contributions = defaultdict(lambda: [0.0, 0])
+    for entry_id, user_id, site_count, role_value, estimated_total in shares:
+        if entry_weights[entry_id]:
+            contributions[user_id][0] += estimated_total * site_count * role_value / entry_weights[entry_id]
+        contributions[user_id][1] += 1
+
+    return contributions
+
+
+def shares_values(queryset):
+    return queryset.values_list('entry_id', 'user_id', 'site_count', 'role__value', 'entry__estimated_total')
+
+
+def helped_setups(rotation_id) -> dict:
+    return dict(
+        RotationSetupSummary.objects
+        .filter(rotation_id=rotation_id)
+        .order_by()
+        .values('user_id')
+        .annotate(total_setups=models.Sum('valid_setups'))
+        .values_list('user_id', 'total_setups')
+    )
+
+
+def compute_summaries(rotation_ids) -> dict:
+    """
+    Computes the summary of every rotation from its entries, without storing it.
+
+    Returns the estimated share, the number of shares and the helped setups of every user by rotation.
+    """
+    shares = defaultdict(list)
+    rotation_shares = (
+        EntryCharacter.objects
+        .filter(entry__rotation_id__in=rotation_ids)
+        .values_list('entry__rotation_id', 'entry_id', 'user_id', 'site_count', 'role__value', 'entry__estimated_total')
+    )
+    for rotation_id, *share in rotation_shares:
+        shares[rotation_id].append(share)
+
+    setups = defaultdict(dict)
+    rotation_setups = (
+        RotationSetupSummary.objects
+        .filter(rotation_id__in=rotation_ids)
+        .order_by()
+        .values('rotation_id', 'user_id')
+        .annotate(total_setups=models.Sum('valid_setups'))
+        .values_list('rotation_id', 'user_id', 'total_setups')
+    )
+    for rotation_id, user_id, total_setups in rotation_setups:
+        setups[rotation_id][user_id] = total_setups
+
+    return {
+        rotation_id: {
+            user_id: (estimated_share, share_count, setups[rotation_id].get(user_id, 0))
+            for user_id, (estimated_share, share_count) in shares_contributions(shares[rotation_id]).items()
+        }
+        for rotation_id in rotation_ids
+    }
+
+
+def rebuild_summary(rotation_id) -> PveRotationSummary:
+    """Computes again the whole summary of the rotation and stores it"""
+    with transaction.atomic():
+        PveRotationSummary.objects.get_or_create(rotation_id=rotation_id)
+        # concurrent rebuilds of the same rotation wait for the lock
+        summary = PveRotationSummary.objects.select_for_update().get(rotation_id=rotation_id)
+
+        state = entries_states([rotation_id])[rotation_id]
+        summary.entry_count = state['entry_count']
+        summary.last_entry_update = state['last_entry_update']
+        summary.save()
+
+        summary.users.all().delete()
+        PveRotationUserSummary.objects.bulk_create([
+            PveRotationUserSummary(
+                summary=summary,
+                user_id=user_id,
+                estimated_share=estimated_share,
+                share_count=share_count,
+                helped_setups=setups,
+            )
+            for user_id, (estimated_share, share_count, setups) in compute_summaries([rotation_id])[rotation_id].items()
+        ])
+
+    return summary
+
+
+def update_summaries(rotation_ids):
+    """Rebuilds the stored summaries of the rotations that are missing or out of date"""
+    rotation_ids = list(Rotation.objects.filter(pk__in=rotation_ids).values_list('pk', flat=True))
+    states = entries_states(rotation_ids)
+    summaries = PveRotationSummary.objects.in_bulk(rotation_ids)
+
+    for rotation_id in rotation_ids:
+        if rotation_id not in summaries or not is_up_to_date(summaries[rotation_id], states[rotation_id]):
+            rebuild_summary(rotation_id)
+
+
+class RotationSummaryUpdate:
+    """
+    Incremental update of the stored summary of a rotation, for the entry mutations.
+
+    It has to be created inside the transaction, before the entries are changed. If the stored
+    summary is missing or already out of date, it is rebuilt instead.
+    """
+
+    def __init__(self, rotation_id):
+        self.rotation_id = rotation_id
+        self.changes = defaultdict(lambda: [0.0, 0])
+        self.summary = PveRotationSummary.objects.select_for_update().filter(rotation_id=rotation_id).first()
+        if self.summary is not None and not is_up_to_date(self.summary, entries_states([rotation_id])[rotation_id]):
+            self.summary = None
+
+    def apply(self, entry_id, sign):
+        if self.summary is None:
+            return
+        shares = shares_values(EntryCharacter.objects.filter(entry_id=entry_id))
+        for user_id, (estimated_share, share_count) in shares_contributions(shares).items():
+            self.changes[user_id][0] += sign * estimated_share
+            self.changes[user_id][1] += sign * share_count
+
+    def remove_entry(self, entry_id):
+        """Removes the shares of the entry, before they are deleted or modified"""
+        self.apply(entry_id, -1)
+
+    def add_entry(self, entry_id):
+        """Adds the shares of the entry, after they are created"""
+        self.apply(entry_id, 1)
+
+    def save(self):
+        if self.summary is None:
+            rebuild_summary(self.rotation_id)
+            return
+
+        rows = {row.user_id: row for row in self.summary.users.filter(user_id__in=self.changes.keys())}
+        to_create = []
+        for user_id, (estimated_share, share_count) in self.changes.items():
+            row = rows.get(user_id)
+            if row is None:
+                row = PveRotationUserSummary(summary=self.summary, user_id=user_id)
+                to_create.append(row)
+            row.estimated_share += estimated_share
+            row.share_count += share_count
+
+        PveRotationUserSummary.objects.bulk_create(to_create)
+        PveRotationUserSummary.objects.bulk_update(rows.values(), ['estimated_share', 'share_count'])
+        self.summary.users.filter(share_count=0).delete()
+
+        # the valid setups are capped per day, so they are read again instead of summed
+        setups = helped_setups(self.rotation_id)
+        rows = list(self.summary.users.all())
+        for row in rows:
+            row.helped_setups = setups.get(row.user_id, 0)
+        PveRotationUserSummary.objects.bulk_update(rows, ['helped_setups'])
+
+        state = entries_states([self.rotation_id])[self.rotation_id]
+        self.summary.entry_count = state['entry_count']
+        self.summary.last_entry_update = state['last_entry_update']
+        self.summary.save()
+
+
+def load_summaries(rotations) -> dict:
+    """
+    Returns the summary rows of every rotation, with the main characters of the users.
+
+    The stored summaries are read when they are up to date, the others are computed from the entries
+    without storing them, so reading never writes. They are stored by the entry mutations and receivers.
+    """
+    rotation_ids = [rotation.pk for rotation in rotations]
+    states = entries_states(rotation_ids)
+    summaries = PveRotationSummary.objects.in_bulk(rotation_ids)
+    out_of_date = [
+        rotation_id for rotation_id in rotation_ids
+        if rotation_id not in summaries or not is_up_to_date(summaries[rotation_id], states[rotation_id])
+    ]
+
+    rows = [
+        (row.summary_id, row.user, row.estimated_share, row.helped_setups)
+        for row in (
+            PveRotationUserSummary.objects
+            .filter(summary_id__in=set(rotation_ids) - set(out_of_date))
+            .select_related('user__profile__main_character')
+        )
+    ]
+
+    computed = compute_summaries(out_of_date) if out_of_date else {}
+    users = User.objects.select_related('profile__main_character').in_bulk(
+        {user_id for users in computed.values() for user_id in users}
+    )
+    rows.extend(
+        (rotation_id, users[user_id], estimated_share, setups)
+        for rotation_id, users_summaries in computed.items()
+        for user_id, (estimated_share, _, setups) in users_summaries.items()
+    )
+    rows.sort(key=lambda row: (-row[2], row[1].pk))
+
+    result = {rotation.pk: [] for rotation in rotations}
+    rotations = {rotation.pk: rotation for rotation in rotations}
+    for rotation_id, user, estimated_share, setups in rows:
+        rotation = rotations[rotation_id]
+        estimated_total = estimated_share * (100 - rotation.tax_rate) / 100
+        rotation_total = states[rotation.pk]['estimated_total']
+        result[rotation.pk].append({
+            'user': user.pk,
+            'main_character': user.profile.main_character,
+            'helped_setups': setups,
+            'estimated_total': estimated_total,
+            'actual_total': estimated_total * rotation.actual_total / rotation_total if rotation.actual_total and rotation_total else 0.0,
+        })
+
+    return result
+
+
+class RotationSummaryLoader:
+    """Loads the summaries of a page of rotations together, the first time one of them is resolved"""
+
+    def __init__(self, rotations):
+        self.rotations = rotations
+        self.summaries = None
+
+    def get(self, rotation):
+        if self.summaries is None:
+            self.summaries = load_summaries(self.rotations)
+        return self.summaries[rotation.pk]
+
+
+def daily_changes(rotations, summaries) -> dict:
+    """Totals of the summaries of the rotations, by user and closing day"""
+    changes = defaultdict(lambda: [0.0, 0.0, 0])
+    for rotation in rotations:
+        day = timezone.localdate(rotation.closed_at)
+        for row in summaries[rotation.pk]:
+            change = changes[(row['user'], day)]
+            change[0] += row['estimated_total']
+            change[1] += row['actual_total']
+            change[2] += row['helped_setups']
+    return changes
+
+
+def update_daily_totals(changes, sign=1):
+    """Adds or, with a negative sign, subtracts the changes to the daily totals. It has to run in a transaction"""
+    if not changes:
+        return
+
+    totals = {
+        (total.user_id, total.day): total
+        for total in PveDailyTotal.objects.select_for_update().filter(
+            user_id__in={user_id for user_id, _ in changes},
+            day__in={day for _, day in changes},
+        )
+    }
+    to_create = []
+    for (user_id, day), (estimated_total, actual_total, helped_setups) in changes.items():
+        total = totals.get((user_id, day))
+        if total is None:
+            total = PveDailyTotal(user_id=user_id, day=day)
+            to_create.append(total)
+        total.estimated_total += sign * estimated_total
+        total.actual_total += sign * actual_total
+        total.helped_setups += sign * helped_setups
+
+    PveDailyTotal.objects.bulk_create(to_create)
+    PveDailyTotal.objects.bulk_update(totals.values(), ['estimated_total', 'actual_total', 'helped_setups'])
+
+
+def add_to_daily_totals(rotations):
+    """
+    Adds the summaries of closed rotations to the daily totals of their users, on the closing day.
+
+    Every rotation is added only once, the ones already added are skipped.
+    """
+    rotations = [rotation for rotation in rotations if rotation.is_closed and rotation.closed_at is not None]
+    if not rotations:
+        return
+
+    update_summaries([rotation.pk for rotation in rotations])
+    summaries = load_summaries(rotations)
+
+    with transaction.atomic():
+        to_add = set(
+            PveRotationSummary.objects
+            .select_for_update()
+            .filter(rotation_id__in=summaries.keys(), added_to_daily_totals=False)
+            .values_list('rotation_id', flat=True)
+        )
+
+        update_daily_totals(daily_changes([rotation for rotation in rotations if rotation.pk in to_add], summaries))
+        PveRotationSummary.objects.filter(rotation_id__in=to_add).update(added_to_daily_totals=True)
+
+
+def remove_from_daily_totals(rotation):
+    """Subtracts the summary of a rotation from the daily totals, before the rotation is deleted"""
+    if not PveRotationSummary.objects.filter(rotation_id=rotation.pk, added_to_daily_totals=True).exists():
+        return
+
+    with transaction.atomic():
+        update_daily_totals(daily_changes([rotation], load_summaries([rotation])), sign=-1)
+        PveRotationSummary.objects.filter(rotation_id=rotation.pk).update(added_to_daily_totals=False)
+
+
+def rotations_missing_from_daily_totals():
+    """Closed rotations not added to the daily totals, like the ones closed before the totals were kept"""
+    added = PveRotationSummary.objects.filter(added_to_daily_totals=True).values('rotation_id')
+    return (
+        Rotation.objects
+        .filter(is_closed=True, closed_at__isnull=False)
+        .exclude(pk__in=models.Subquery(added))
+    )
+
+
+def add_closed_rotations_to_daily_totals():
+    """Adds the closed rotations missing from the daily totals"""
+    add_to_daily_totals(rotations_missing_from_daily_totals())
+
+
+def running_averages(user, start_date, end_date=None) -> dict:
+    """
+    Totals of the user in the rotations closed from `start_date` to `end_date` included, summed from the daily totals.
+
+    The rotations are added to the daily totals when they are closed, the ones missing from them
+    are summed from their summaries, so nothing is written here.
+    Returns an empty dict if the user has no share in those rotations.
+    """
+    totals = PveDailyTotal.objects.filter(user=user, day__gte=start_date)
+    missing = rotations_missing_from_daily_totals().filter(closed_at__date__gte=start_date)
+    if end_date is not None:
+        totals = totals.filter(day__lte=end_date)
+        missing = missing.filter(closed_at__date__lte=end_date)
+
+    result = totals.aggregate(
+        days=models.Count('pk'),
+        helped_setups=Coalesce(models.Sum('helped_setups'), 0),
+        estimated_total=models.Sum('estimated_total'),
+        actual_total=models.Sum('actual_total'),
+    )
+    days = result.pop('days')
+
+    missing_rotations = list(missing)
+    if missing_rotations:
+        changes = daily_changes(missing_rotations, load_summaries(missing_rotations))
+        for (user_id, _), (estimated_total, actual_total, helped_setups) in changes.items():
+            if user_id == user.pk:
+                days += 1
+                result['helped_setups'] += helped_setups
+                result['estimated_total'] = (result['estimated_total'] or 0) + estimated_total
+                result['actual_total'] = (result['actual_total'] or 0) + actual_total
+
+    if days == 0:
+        return {}
+    return result
@@ -6,6 +6,8 @@ from allianceauth.services.hooks import get_extension_logger
 
 from allianceauth_pve.models import Rotation, EntryCharacter, Entry, EntryRole, PveButton, RoleSetup, GeneralRole
 
+from .summaries import RotationSummaryLoader
+
 
 logger = get_extension_logger(__name__)
 
@@ -19,6 +21,8 @@ class RattingSummaryType(graphene.ObjectType):
     actual_total = graphene.Float()
 
     def resolve_main_character(self, info):
+        if 'main_character' in self:
+            return self['main_character']
         try:
             return User.objects.select_related('profile__main_character').get(pk=self['user']).profile.main_character
         except:
@@ -49,10 +53,13 @@ class RotationType(DjangoObjectType):
         model = Rotation
 
     def resolve_entries(self, info):
+        if hasattr(self, 'ordered_entries'):
+            return self.ordered_entries
         return self.entries.order_by('-created_at')
 
     def resolve_summary(self, info):
-        return self.summary.order_by('-estimated_total')
+        loader = getattr(self, 'summary_loader', None) or RotationSummaryLoader([self])
+        return loader.get(self)
 
 
 class EntryRoleType(DjangoObjectType):
@@ -1,11 +1,11 @@
 import graphene
-from graphql_jwt.decorators import login_required, user_passes_test, permission_required
+from graphql_jwt.decorators import login_required
 
 from allianceauth.corputils.views import access_corpstats_test, SWAGGER_SPEC_PATH
 from allianceauth.corputils.models import CorpStats
 from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
 
-from ..decorators import tokens_required
+from ..decorators import tokens_required, user_passes_test, permission_required
 
 from esi.models import Token
 
@@ -22,9 +22,9 @@ class AddCorpStatsMutation(graphene.Mutation):
     @permission_required('corputils.add_corpstats')
     @tokens_required(scopes='esi-corporations.read_corporation_membership.v1')
     def mutate(cls, root, info, token_id):
-        user = info.context.user
-        token = Token.objects.get(pk=token_id)
-        if token.user != user:
+        try:
+            token = info.context.esi_tokens.get(pk=token_id)
+        except Token.DoesNotExist:
             raise PermissionError("Token not valid")
 
         if EveCharacter.objects.filter(character_id=token.character_id).exists():
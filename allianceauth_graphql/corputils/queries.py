@@ -1,9 +1,10 @@
 import graphene
-from graphql_jwt.decorators import user_passes_test, login_required
+from graphql_jwt.decorators import login_required
 
 from allianceauth.corputils.views import access_corpstats_test
 from allianceauth.corputils.models import CorpStats, CorpMember
 
+from ..decorators import user_passes_test
 from .types import CorpStatsType, CorpMemberType
 
 
@@ -15,7 +16,12 @@ class Query:
     @login_required
     @user_passes_test(access_corpstats_test)
     def resolve_corputils_get_all_corpstats(self, info):
-        return CorpStats.objects.visible_to(info.context.user).order_by('corp__corporation_name')
+        return (
+            CorpStats.objects.visible_to(info.context.user)
+            .select_related('corp')
+            .prefetch_related('members')
+            .order_by('corp__corporation_name')
+        )
 
     @login_required
     @user_passes_test(access_corpstats_test)
@@ -31,6 +37,7 @@ class Query:
         avaiable = CorpStats.objects.visible_to(info.context.user)
         return (
             CorpMember.objects
+            .select_related('corpstats')
             .filter(
                 corpstats__in=avaiable,
                 character_name__icontains=search_string
@@ -1,21 +1,103 @@
 from functools import wraps
 from graphql_jwt.exceptions import PermissionDenied
-from graphql_jwt.decorators import context, user_passes_test
+from graphql_jwt.decorators import context
+
+from django.conf import settings
+from django.core.cache import cache
 
 from esi.models import Token
 
 
+TOKENS_CACHE_TIMEOUT = getattr(settings, 'GRAPHQL_TOKENS_CACHE_TIMEOUT', 60)
+
+
+class RequestPermissionCache:
+    """
+    Permissions of the request user, loaded once per request.
+
+    The full permission set (user, group and state permissions) is read through
+    the authentication backends on creation, the results of the `user_passes_test`
+    functions are stored the first time they are evaluated.
+    `checks_avoided` counts the checks answered from the cache.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.user_pk = user.pk
+        self.is_superuser = user.is_active and user.is_superuser
+        self.perms = frozenset(user.get_all_permissions())
+        self.tests = {}
+        self.checks_avoided = 0
+
+    def has_perm(self, perm):
+        self.checks_avoided += 1
+        return self.is_superuser or perm in self.perms
+
+    def has_perms(self, perms):
+        return all(self.has_perm(perm) for perm in perms)
+
+    def has_any_perm(self, perms):
+        return any(self.has_perm(perm) for perm in perms)
+
+    def passes_test(self, test_func):
+        if test_func in self.tests:
+            self.checks_avoided += 1
+        else:
+            self.tests[test_func] = bool(test_func(self.user))
+        return self.tests[test_func]
+
+
+def get_permission_cache(request) -> RequestPermissionCache:
+    """Returns the permission cache of the request, creating it if missing or if the user changed"""
+    perm_cache = getattr(request, '_graphql_permission_cache', None)
+    if perm_cache is None or perm_cache.user_pk != request.user.pk:
+        perm_cache = RequestPermissionCache(request.user)
+        request._graphql_permission_cache = perm_cache
+    return perm_cache
+
+
+def tokens_cache_key(user_pk) -> str:
+    return f'allianceauth_graphql:tokens:{user_pk}'
+
+
+def get_valid_token_pks(user, scopes) -> list:
+    """
+    Returns the pks of the valid tokens of the user having all the scopes.
+
+    The pks of the valid tokens are cached per user and per scope set,
+    the cache is invalidated when a token of the user is saved or deleted.
+    """
+    scopes_key = ' '.join(sorted(scopes.split() if isinstance(scopes, str) else scopes))
+    cache_key = tokens_cache_key(user.pk)
+    available_scopes = cache.get(cache_key, {})
+
+    if scopes_key not in available_scopes:
+        available_scopes[scopes_key] = list(
+            Token.objects
+            .filter(user__pk=user.pk)
+            .require_scopes(scopes)
+            .require_valid()
+            .values_list('pk', flat=True)
+        )
+        cache.set(cache_key, available_scopes, TOKENS_CACHE_TIMEOUT)
+
+    return available_scopes[scopes_key]
+
+
 def tokens_required(scopes, exc=PermissionDenied):
+    """
+    Decorator for resolvers that checks whether a user has a valid token with the scopes.
+
+    The valid tokens are stored in the `esi_tokens` attribute of the context.
+    """
     def decorator(func):
         @wraps(func)
         @context(func)
         def _wrapped_func(context, *args, **kwargs):
-            tokens = Token.objects\
-                .filter(user__pk=context.user.pk)\
-                .require_scopes(scopes)\
-                .require_valid()
+            token_pks = get_valid_token_pks(context.user, scopes)
 
-            if tokens.exists():
+            if len(token_pks) > 0:
+                context.esi_tokens = Token.objects.filter(user__pk=context.user.pk, pk__in=token_pks)
                 return func(*args, **kwargs)
             else:
                 raise exc('Required token missing')
@@ -23,6 +105,42 @@ def tokens_required(scopes, exc=PermissionDenied):
     return decorator
 
 
+def user_passes_test(test_func, exc=PermissionDenied):
+    """
+    Decorator for resolvers that checks that the user passes the given test.
+
+    This decorator is the request cached version of the graphql_jwt user_passes_test.
+    """
+    def decorator(func):
+        @wraps(func)
+        @context(func)
+        def _wrapped_func(context, *args, **kwargs):
+            if get_permission_cache(context).passes_test(test_func):
+                return func(*args, **kwargs)
+            raise exc
+        return _wrapped_func
+    return decorator
+
+
+def permission_required(perm):
+    """
+    Decorator for resolvers that checks whether a user has all the permissions.
+
+    This decorator is the request cached version of the graphql_jwt permission_required.
+    """
+    perms = (perm,) if isinstance(perm, str) else perm
+
+    def decorator(func):
+        @wraps(func)
+        @context(func)
+        def _wrapped_func(context, *args, **kwargs):
+            if get_permission_cache(context).has_perms(perms):
+                return func(*args, **kwargs)
+            raise PermissionDenied
+        return _wrapped_func
+    return decorator
+
+
 def permissions_required(perm):
     """
     Decorator for views that checks whether a user has any particular permission
@@ -30,11 +148,12 @@ def permissions_required(perm):
 
     This decorator is the graphql modified version of the allianceauth permission_required.
     """
-    def check_perms(user):
-        for perm_ in perm:
-            perm_ = (perm_,)
-            if user.has_perms(perm_):
-                return True
-
-        return False
-    return user_passes_test(check_perms)
+    def decorator(func):
+        @wraps(func)
+        @context(func)
+        def _wrapped_func(context, *args, **kwargs):
+            if get_permission_cache(context).has_any_perm(perm):
+                return func(*args, **kwargs)
+            raise PermissionDenied
+        return _wrapped_func
+    return decorator
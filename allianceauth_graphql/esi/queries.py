@@ -9,4 +9,4 @@ class Query:
 
     @login_required
     def resolve_esi_user_tokens(self, info):
-        return info.context.user.token_set.all()
+        return info.context.user.token_set.select_related('user').prefetch_related('scopes')
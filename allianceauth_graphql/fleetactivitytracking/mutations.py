@@ -1,7 +1,7 @@
 import datetime
 
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 from graphene_django.forms.mutation import DjangoFormMutation
 
 from django.utils import timezone
@@ -16,7 +16,7 @@ from allianceauth.eveonline.providers import provider
 from esi.models import Token
 
 from .types import FatlinkType
-from ..decorators import tokens_required
+from ..decorators import tokens_required, permission_required
 
 
 class AddFatParticipation(graphene.Mutation):
@@ -39,7 +39,7 @@ class AddFatParticipation(graphene.Mutation):
     @tokens_required(scopes=_required_scopes)
     def mutate(cls, root, info, token_id, fatlink_hash):
         try:
-            token = Token.objects.all().require_scopes(' '.join(cls._required_scopes)).get(pk=token_id)
+            token = info.context.esi_tokens.get(pk=token_id)
             c = token.get_esi_client(spec_file=SWAGGER_SPEC_PATH)
             character_online = c.Location.get_characters_character_id_online(
                 character_id=token.character_id
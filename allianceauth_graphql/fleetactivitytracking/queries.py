@@ -1,7 +1,7 @@
 import datetime
 
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
 from django.contrib.auth import get_user_model
 from django.db.models.functions import ExtractMonth, ExtractYear
@@ -11,6 +11,7 @@ from allianceauth.fleetactivitytracking.models import Fatlink, Fat
 from allianceauth.fleetactivitytracking.views import MemberStat, first_day_of_next_month, CorpStat
 from allianceauth.eveonline.models import EveCorporationInfo, EveCharacter
 
+from ..decorators import permission_required
 from .types import FatlinkType, FatType, FatUserStatsType, FatCorpStatsType, FatPersonalStatsType, FatPersonalMonthlyStatsType
 
 User = get_user_model()
@@ -26,12 +27,17 @@ class Query:
 
     @login_required
     def resolve_fat_recent_fat(self, info, num=5):
-        return Fat.objects.filter(user=info.context.user).order_by('-id')[:num]
+        return (
+            Fat.objects
+            .select_related('character', 'fatlink', 'user')
+            .filter(user=info.context.user)
+            .order_by('-id')[:num]
+        )
 
     @login_required
     @permission_required('auth.fleetactivitytracking')
     def resolve_fat_get_fatlinks(self, info, num=5):
-        return Fatlink.objects.order_by('-id')[:num]
+        return Fatlink.objects.select_related('creator__profile__main_character').order_by('-id')[:num]
 
     @login_required
     @permission_required('auth.fleetactivitytracking_statistics')
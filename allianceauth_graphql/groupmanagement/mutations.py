@@ -1,15 +1,21 @@
+from collections import defaultdict
+
 import graphene
-from graphql_jwt.decorators import login_required, user_passes_test
+from graphql_jwt.decorators import login_required
 
 from django.contrib.auth.models import Group
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.db import transaction
+from django.db.models import Count
 
 from allianceauth.groupmanagement.managers import GroupManager
 from allianceauth.groupmanagement.models import RequestLog, GroupRequest
 from allianceauth.services.hooks import get_extension_logger
 from allianceauth.notifications import notify
+from allianceauth.notifications.models import Notification
 
+from ..decorators import user_passes_test
 from .types import GroupRequestAddStatus, GroupRequestLeaveStatus
 
 
@@ -171,6 +177,67 @@ class GroupMembershipRemove(graphene.Mutation):
         return cls(ok=ok, error=error)
 
 
+class GroupMembershipBulkRemove(graphene.Mutation):
+    class Arguments:
+        group_id = graphene.Int(required=True)
+        user_ids = graphene.List(graphene.NonNull(graphene.Int))
+        main_not_in_alliance_id = graphene.Int()
+
+    ok = graphene.Boolean()
+    error = graphene.String()
+    removed = graphene.List(graphene.Int)
+
+    @classmethod
+    @login_required
+    @user_passes_test(GroupManager.can_manage_groups)
+    def mutate(cls, root, info, group_id, user_ids=None, main_not_in_alliance_id=None):
+        ok = False
+        error = None
+        removed = []
+        a_user = info.context.user
+        logger.debug(f"group_membership_bulk_remove called by user {a_user} for group id {group_id}")
+
+        if user_ids is None and main_not_in_alliance_id is None:
+            return cls(ok=ok, error="A list of users or a filter is required", removed=removed)
+
+        try:
+            group = Group.objects.select_related('authgroup').get(pk=group_id)
+        except ObjectDoesNotExist:
+            return cls(ok=ok, error="Group does not exist", removed=removed)
+
+        # Check its a joinable group i.e. not corp or internal
+        # And the user has permission to manage it
+        if not GroupManager.check_internal_group(group) or not GroupManager.can_manage_group(a_user, group):
+            logger.warning(f"User {a_user} attempted to remove users from group {group_id} but permission was denied")
+            return cls(ok=ok, error='Permission denied', removed=removed)
+
+        members = group.user_set.all()
+        if user_ids is not None:
+            members = members.filter(pk__in=user_ids)
+        if main_not_in_alliance_id is not None:
+            members = members.exclude(profile__main_character__alliance_id=main_not_in_alliance_id)
+
+        members = list(members.order_by('pk').values_list('pk', 'username'))
+
+        with transaction.atomic():
+            RequestLog.objects.bulk_create([
+                RequestLog(
+                    request_type=None,
+                    group=group,
+                    request_info=username + ":" + group.name,
+                    action=1,
+                    request_actor=a_user
+                ) for _, username in members
+            ])
+            removed = [pk for pk, _ in members]
+            group.user_set.remove(*removed)
+
+        logger.info(f"User {a_user} removed {len(removed)} users from group {group}")
+        ok = True
+
+        return cls(ok=ok, error=error, removed=removed)
+
+
 class GroupMembershipAcceptRequest(graphene.Mutation):
     class Arguments:
         group_request_id = graphene.Int(required=True)
@@ -393,11 +460,193 @@ class GroupLeaveRejectRequest(graphene.Mutation):
         return cls(ok=ok, error=error)
 
 
+def max_notifications_per_user() -> int:
+    """NOTIFICATIONS_MAX_PER_USER, or the default of Alliance Auth if it's missing or invalid"""
+    try:
+        max_notifications = int(getattr(settings, 'NOTIFICATIONS_MAX_PER_USER', Notification.NOTIFICATIONS_MAX_PER_USER_DEFAULT))
+    except (TypeError, ValueError):
+        return Notification.NOTIFICATIONS_MAX_PER_USER_DEFAULT
+    return max_notifications if max_notifications >= 0 else Notification.NOTIFICATIONS_MAX_PER_USER_DEFAULT
+
+
+def prune_notifications(user_pks):
+    """
+    Deletes the oldest notifications of the users having more than NOTIFICATIONS_MAX_PER_USER,
+    like Notification.objects.notify_user does before creating a notification.
+    """
+    max_notifications = max_notifications_per_user()
+    over_limit = (
+        Notification.objects
+        .filter(user_id__in=user_pks)
+        .order_by()
+        .values('user_id')
+        .annotate(num_notifications=Count('pk'))
+        .filter(num_notifications__gt=max_notifications)
+        .values_list('user_id', flat=True)
+    )
+    for user_pk in over_limit:
+        expired = (
+            Notification.objects
+            .filter(user_id=user_pk)
+            .order_by('-timestamp', '-pk')
+            .values_list('pk', flat=True)[max_notifications:]
+        )
+        Notification.objects.filter(pk__in=list(expired)).delete()
+
+
+def process_group_requests(user, group_request_ids, leave_request, accept):
+    """
+    Accepts or rejects a list of join or leave requests in a single transaction.
+
+    The permission to manage a group is checked once per group, the memberships are changed
+    with one add/remove per group and logs and notifications are inserted in bulk,
+    then the notifications over the per user maximum are pruned.
+    Returns the ids of the processed requests and the errors of the skipped ones.
+    """
+    group_requests = (
+        GroupRequest.objects
+        .select_related('group__authgroup', 'user__profile__state')
+        .prefetch_related('group__authgroup__states')
+        .filter(id__in=group_request_ids, leave_request=leave_request)
+        .order_by('pk')
+    )
+
+    errors = []
+    requests_by_group = defaultdict(list)
+    for group_request in group_requests:
+        requests_by_group[group_request.group].append(group_request)
+
+    found_ids = {group_request.pk for requests in requests_by_group.values() for group_request in requests}
+    for group_request_id in group_request_ids:
+        if group_request_id not in found_ids:
+            errors.append(f"Group request {group_request_id} doesn't exist")
+
+    to_process = {}
+    for group, requests in requests_by_group.items():
+        if not GroupManager.can_manage_group(user, group):
+            logger.warning(f"User {user} attempted to process group requests {[r.pk for r in requests]} but permission was denied")
+            errors.extend(f"Permission denied for group request {group_request.pk}" for group_request in requests)
+            continue
+
+        if accept and not leave_request:
+            joinable = [r for r in requests if GroupManager.joinable_group(group, r.user.profile.state)]
+            errors.extend(f"Permission denied for group request {r.pk}" for r in requests if r not in joinable)
+            requests = joinable
+
+        if requests:
+            to_process[group] = requests
+
+    processed = [group_request for requests in to_process.values() for group_request in requests]
+    if not processed:
+        return [], errors
+
+    if leave_request:
+        title = "Group Leave Request Accepted" if accept else "Group Leave Request Rejected"
+        message = "Your request to leave {group} has been {outcome}."
+    else:
+        title = "Group Application Accepted" if accept else "Group Application Rejected"
+        message = "Your application to {group} has been {outcome}."
+
+    with transaction.atomic():
+        if accept:
+            for group, requests in to_process.items():
+                users = [group_request.user for group_request in requests]
+                if leave_request:
+                    group.user_set.remove(*users)
+                else:
+                    group.user_set.add(*users)
+
+        RequestLog.objects.bulk_create([
+            RequestLog(
+                request_type=leave_request,
+                group=group_request.group,
+                request_info=str(group_request),
+                action=int(accept),
+                request_actor=user
+            ) for group_request in processed
+        ])
+
+        GroupRequest.objects.filter(pk__in=[group_request.pk for group_request in processed]).delete()
+
+        Notification.objects.bulk_create([
+            Notification(
+                user=group_request.user,
+                title=title,
+                level=Notification.Level.SUCCESS if accept else Notification.Level.DANGER,
+                message=message.format(group=group_request.group, outcome="accepted" if accept else "rejected"),
+            ) for group_request in processed
+        ])
+
+        notified_users = {group_request.user_id for group_request in processed}
+        prune_notifications(notified_users)
+        transaction.on_commit(
+            lambda: [Notification.objects.invalidate_user_notification_cache(user_pk) for user_pk in notified_users]
+        )
+
+    logger.info(
+        f"User {user} {'accepted' if accept else 'rejected'} {len(processed)} group "
+        f"{'leave' if leave_request else 'join'} requests"
+    )
+
+    return [group_request.pk for group_request in processed], errors
+
+
+class GroupRequestsBulkMutation(graphene.Mutation):
+    class Meta:
+        abstract = True
+
+    class Arguments:
+        group_request_ids = graphene.List(graphene.NonNull(graphene.Int), required=True)
+
+    ok = graphene.Boolean()
+    processed = graphene.List(graphene.Int)
+    errors = graphene.List(graphene.String)
+
+    leave_request = False
+    accept = True
+
+    @classmethod
+    @login_required
+    @user_passes_test(GroupManager.can_manage_groups)
+    def mutate(cls, root, info, group_request_ids):
+        user = info.context.user
+        logger.debug(f"{cls.__name__} called by user {user} for group request ids {group_request_ids}")
+
+        processed, errors = process_group_requests(user, group_request_ids, cls.leave_request, cls.accept)
+
+        return cls(ok=len(errors) == 0, processed=processed, errors=errors)
+
+
+class GroupMembershipBulkAcceptRequests(GroupRequestsBulkMutation):
+    leave_request = False
+    accept = True
+
+
+class GroupMembershipBulkRejectRequests(GroupRequestsBulkMutation):
+    leave_request = False
+    accept = False
+
+
+class GroupLeaveBulkAcceptRequests(GroupRequestsBulkMutation):
+    leave_request = True
+    accept = True
+
+
+class GroupLeaveBulkRejectRequests(GroupRequestsBulkMutation):
+    leave_request = True
+    accept = False
+
+
 class Mutation:
     groupmanagement_join_group_request = AddGroupRequest.Field()
     groupmanagement_leave_group_request = LeaveGroupRequest.Field()
     groupmanagement_remove_member = GroupMembershipRemove.Field()
+    groupmanagement_remove_members = GroupMembershipBulkRemove.Field()
     groupmanagement_accept_join_request = GroupMembershipAcceptRequest.Field()
     groupmanagement_reject_join_request = GroupMembershipRejectRequest.Field()
     groupmanagement_accept_leave_request = GroupLeaveAcceptRequest.Field()
     groupmanagement_reject_leave_request = GroupLeaveRejectRequest.Field()
+    groupmanagement_accept_join_requests = GroupMembershipBulkAcceptRequests.Field()
+    groupmanagement_reject_join_requests = GroupMembershipBulkRejectRequests.Field()
+    groupmanagement_accept_leave_requests = GroupLeaveBulkAcceptRequests.Field()
+    groupmanagement_reject_leave_requests = GroupLeaveBulkRejectRequests.Field()
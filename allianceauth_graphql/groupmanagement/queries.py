@@ -1,5 +1,5 @@
 import graphene
-from graphql_jwt.decorators import login_required, user_passes_test
+from graphql_jwt.decorators import login_required
 
 from django.db.models import Case, When, Exists, OuterRef, Q, Count
 from django.conf import settings
@@ -10,9 +10,11 @@ from allianceauth.groupmanagement.managers import GroupManager
 from allianceauth.groupmanagement.models import GroupRequest, RequestLog
 from allianceauth.services.hooks import get_extension_logger
 
+from ..decorators import user_passes_test
+from ..pagination import pagination_arguments, paginate
 from allianceauth_graphql.authentication.types import GroupType
 
-from .types import GroupManagementType, GroupMembershipListType, GroupMembershipAuditType
+from .types import GroupManagementType, GroupMembershipListType, GroupMembershipAuditType, RequestLogType
 
 
 logger = get_extension_logger(__name__)
@@ -22,13 +24,25 @@ class Query:
     groupmanagement_user_joinable_groups = graphene.List(GroupType)
     groupmanagement_manage_requests = graphene.Field(GroupManagementType)
     groupmanagement_groups = graphene.List(GroupType)
-    groupmanagement_group_memberships = graphene.Field(GroupMembershipListType, group_id=graphene.Int(required=True))
-    groupmanagement_group_membership_audit = graphene.Field(GroupMembershipAuditType, group_id=graphene.Int(required=True))
+    groupmanagement_group_memberships = graphene.Field(
+        GroupMembershipListType,
+        group_id=graphene.Int(required=True),
+        **pagination_arguments()
+    )
+    groupmanagement_group_membership_audit = graphene.Field(
+        GroupMembershipAuditType,
+        group_id=graphene.Int(required=True),
+        **pagination_arguments()
+    )
 
     @login_required
     def resolve_groupmanagement_user_joinable_groups(self, info):
         user = info.context.user
-        groups_qs = GroupManager.get_joinable_groups_for_user(user, include_hidden=False).order_by('name')
+        groups_qs = (
+            GroupManager.get_joinable_groups_for_user(user, include_hidden=False)
+            .select_related('authgroup')
+            .order_by('name')
+        )
 
         return groups_qs.annotate(
             status=Case(
@@ -60,8 +74,6 @@ class Query:
     def resolve_groupmanagement_manage_requests(self, info):
         user = info.context.user
         logger.debug(f"group_management called by user {user}")
-        acceptrequests = []
-        leaverequests = []
 
         if GroupManager.has_management_permission(user):
             # Full access
@@ -71,13 +83,26 @@ class Query:
             users__groups = GroupManager.get_group_leaders_groups(user)
             group_requests = GroupRequest.objects.filter(group__in=users__groups)
 
-        for grouprequest in group_requests:
-            if grouprequest.leave_request:
-                leaverequests.append(grouprequest)
-            else:
-                acceptrequests.append(grouprequest)
+        group_requests = (
+            group_requests
+            .select_related('user__profile__main_character', 'user__profile__state', 'group')
+            .order_by('pk')
+        )
 
-        logger.debug(f"Providing user {user} with {len(acceptrequests)} acceptrequests and {len(leaverequests)} leaverequests.")
+        # the lists are paginated by their own fields
+        acceptrequests = group_requests.filter(leave_request=False)
+        leaverequests = group_requests.filter(leave_request=True)
+
+        group_counts = (
+            Group.objects
+            .filter(pk__in=group_requests.values('group'))
+            .select_related('authgroup')
+            .annotate(
+                num_accept_requests=Count('grouprequest', filter=Q(grouprequest__leave_request=False)),
+                num_leave_requests=Count('grouprequest', filter=Q(grouprequest__leave_request=True)),
+            )
+            .order_by('name')
+        )
 
         show_leave_tab = (
             getattr(settings, 'GROUPMANAGEMENT_AUTO_LEAVE', False)
@@ -88,6 +113,14 @@ class Query:
             'leave_requests': leaverequests,
             'accept_requests': acceptrequests,
             'auto_leave': show_leave_tab,
+            'group_counts': [
+                {
+                    'group': group,
+                    'accept_requests': group.num_accept_requests,
+                    'leave_requests': group.num_leave_requests,
+                }
+                for group in group_counts
+            ],
         }
 
     @login_required
@@ -105,6 +138,7 @@ class Query:
 
         return (
             groups
+            .select_related('authgroup')
             .exclude(authgroup__internal=True)
             .annotate(num_members=Count('user'))
             .order_by('name')
@@ -112,11 +146,16 @@ class Query:
 
     @login_required
     @user_passes_test(GroupManager.can_manage_groups)
-    def resolve_groupmanagement_group_memberships(self, info, group_id):
+    def resolve_groupmanagement_group_memberships(self, info, group_id, offset, limit=None):
         user = info.context.user
         logger.debug(f"group_membership_list called by user {user} for group id {group_id}")
         try:
-            group = Group.objects.get(id=group_id)
+            group = (
+                Group.objects
+                .select_related('authgroup')
+                .annotate(num_members=Count('user'))
+                .get(id=group_id)
+            )
             # Check its a joinable group i.e. not corp or internal
             # And the user has permission to manage it
             if (not GroupManager.check_internal_group(group)
@@ -131,23 +170,26 @@ class Query:
         except ObjectDoesNotExist:
             raise Exception("Group doesn't exist")
 
-        group_leaders = group.authgroup.group_leaders.all()
-        members = list()
-        for member in \
-            group.user_set\
-                .all()\
-                .order_by('profile__main_character__character_name'):
+        group_leaders = set(group.authgroup.group_leaders.values_list('pk', flat=True))
+        members_qs = (
+            group.user_set
+            .select_related('profile__main_character', 'profile__state')
+            .order_by('profile__main_character__character_name', 'pk')
+        )
 
-            members.append({
+        members = [
+            {
                 'user': member,
-                'is_leader': member in group_leaders
-            })
+                'is_leader': member.pk in group_leaders,
+            }
+            for member in paginate(members_qs, offset, limit)
+        ]
 
         return {'group': group, 'members': members}
 
     @login_required
     @user_passes_test(GroupManager.can_manage_groups)
-    def resolve_groupmanagement_group_membership_audit(self, info, group_id):
+    def resolve_groupmanagement_group_membership_audit(self, info, group_id, offset, limit=None):
         user = info.context.user
         logger.debug("group_management_audit called by user %s" % user)
         try:
@@ -161,6 +203,12 @@ class Query:
         except ObjectDoesNotExist:
             raise Exception("Group does not exist")
 
-        entries = RequestLog.objects.filter(group=group).order_by('-date')
+        entries = RequestLogType.load_requestors(
+            paginate(
+                RequestLog.objects.filter(group=group).order_by('-date', '-pk'),
+                offset,
+                limit
+            )
+        )
 
         return {'group': group, 'entries': entries}
@@ -5,6 +5,8 @@ from django.contrib.auth.models import User
 
 from allianceauth.groupmanagement.models import GroupRequest, AuthGroup, RequestLog
 
+from ..pagination import pagination_arguments, paginate
+
 
 class AuthGroupType(DjangoObjectType):
     group = graphene.Field('allianceauth_graphql.authentication.types.GroupType', required=True)
@@ -38,10 +40,23 @@ class GroupRequestType(DjangoObjectType):
         model = GroupRequest
 
 
+class GroupRequestCountType(graphene.ObjectType):
+    group = graphene.Field('allianceauth_graphql.authentication.types.GroupType', required=True)
+    accept_requests = graphene.Int(required=True)
+    leave_requests = graphene.Int(required=True)
+
+
 class GroupManagementType(graphene.ObjectType):
-    leave_requests = graphene.List(GroupRequestType)
-    accept_requests = graphene.List(GroupRequestType)
+    leave_requests = graphene.List(GroupRequestType, **pagination_arguments())
+    accept_requests = graphene.List(GroupRequestType, **pagination_arguments())
     auto_leave = graphene.Boolean()
+    group_counts = graphene.List(GroupRequestCountType)
+
+    def resolve_leave_requests(self, info, offset, limit=None):
+        return paginate(self['leave_requests'], offset, limit)
+
+    def resolve_accept_requests(self, info, offset, limit=None):
+        return paginate(self['accept_requests'], offset, limit)
 
 
 class MemberType(graphene.ObjectType):
@@ -91,7 +106,25 @@ class RequestLogType(DjangoObjectType):
         else:
             return GroupRequestLogActionType.REJECT
 
+    @staticmethod
+    def load_requestors(entries):
+        """Loads the requestors of a page of entries with a single query"""
+        entries = list(entries)
+        users = (
+            User.objects
+            .select_related('profile__main_character', 'profile__state')
+            .in_bulk({entry.requestor() for entry in entries}, field_name='username')
+        )
+
+        for entry in entries:
+            entry.requestor_user = users.get(entry.requestor())
+
+        return entries
+
     def resolve_requestor(self, info):
+        if hasattr(self, 'requestor_user'):
+            return self.requestor_user
+
         username = self.requestor()
         return User.objects.get(username=username)
 
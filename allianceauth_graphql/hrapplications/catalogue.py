@@ -0,0 +1,97 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from allianceauth.eveonline.models import EveCorporationInfo
+from allianceauth.hrapplications.models import ApplicationForm, ApplicationQuestion, ApplicationChoice
+
+
+FORM_CATALOGUE_CACHE_TIMEOUT = getattr(settings, 'GRAPHQL_HR_FORM_CATALOGUE_CACHE_TIMEOUT', 60 * 60)
+
+CATALOGUE_MODELS = (ApplicationForm, ApplicationQuestion, ApplicationChoice, EveCorporationInfo)
+
+
+def catalogue_cache_key() -> str:
+    """
+    Cache key of the catalogue, it contains the fields of the cached models.
+
+    After an update changing the fields the catalogue is stored under a new key,
+    so rows with the old fields are never read.
+    """
+    fields = ' '.join(
+        f'{model._meta.label}.{field.attname}'
+        for model in CATALOGUE_MODELS
+        for field in model._meta.concrete_fields
+    )
+    return f'allianceauth_graphql_hr_form_catalogue_{hashlib.md5(fields.encode()).hexdigest()}'
+
+
+FORM_CATALOGUE_CACHE_KEY = catalogue_cache_key()
+
+
+def field_values(instance) -> dict:
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+def set_prefetched(instance, name, objects):
+    """Stores the related objects like prefetch_related does, so the relation is read without queries"""
+    queryset = getattr(instance, name).all()
+    queryset._result_cache = objects
+    queryset._prefetch_done = True
+    instance._prefetched_objects_cache = {**getattr(instance, '_prefetched_objects_cache', {}), name: queryset}
+
+
+def build_form_catalogue() -> list:
+    forms = (
+        ApplicationForm.objects
+        .select_related('corp')
+        .prefetch_related('questions__choices')
+        .order_by('pk')
+    )
+    return [
+        {
+            'form': field_values(form),
+            'corp': field_values(form.corp),
+            'questions': [
+                {
+                    'question': field_values(question),
+                    'choices': [field_values(choice) for choice in question.choices.all()],
+                }
+                for question in form.questions.all()
+            ],
+        }
+        for form in forms
+    ]
+
+
+def load_form(data) -> ApplicationForm:
+    form = ApplicationForm(**data['form'])
+    form.corp = EveCorporationInfo(**data['corp'])
+
+    questions = []
+    for question_data in data['questions']:
+        question = ApplicationQuestion(**question_data['question'])
+        choices = [ApplicationChoice(**choice) for choice in question_data['choices']]
+        for choice in choices:
+            choice.question = question
+        set_prefetched(question, 'choices', choices)
+        questions.append(question)
+
+    set_prefetched(form, 'questions', questions)
+    return form
+
+
+def form_catalogue() -> dict:
+    """
+    Returns the application forms by id, with corporation, questions and choices loaded.
+
+    The field values are cached as plain dicts and the forms are rebuilt from them without queries.
+    The catalogue is rebuilt after a form, a question, a choice or the corporation of a form changes.
+    """
+    catalogue = cache.get_or_set(FORM_CATALOGUE_CACHE_KEY, build_form_catalogue, FORM_CATALOGUE_CACHE_TIMEOUT)
+    return {data['form']['id']: load_form(data) for data in catalogue}
+
+
+def invalidate_form_catalogue():
+    cache.delete(FORM_CATALOGUE_CACHE_KEY)
@@ -1,10 +1,11 @@
 import graphene
-from graphql_jwt.decorators import login_required, user_passes_test, permission_required
+from graphql_jwt.decorators import login_required
 
 from allianceauth.hrapplications.views import create_application_test
 from allianceauth.hrapplications.models import ApplicationForm, Application, ApplicationResponse, ApplicationComment
 from allianceauth.notifications import notify
 
+from ..decorators import user_passes_test, permission_required
 from .inputs import FormAnswerInputType
 from .types import ApplicationAdminType, ApplicationType
 
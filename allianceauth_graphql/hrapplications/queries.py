@@ -1,13 +1,33 @@
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 
-from allianceauth.hrapplications.models import Application, ApplicationForm
+from allianceauth.hrapplications.models import Application, ApplicationResponse, ApplicationComment
 
+from ..decorators import permission_required
+from .catalogue import form_catalogue
+from .reviewers import reviewable_applications
 from .types import ApplicationType, ApplicationFormType, ApplicationStatus, ApplicationAdminType
 
 
+def preload_applications(queryset, admin=False):
+    """
+    Loads together with the applications the relations selected by the list queries.
+
+    The responses are ordered like the questions were answered,
+    the comments and the reviewer are loaded only for the admin type.
+    """
+    queryset = queryset.select_related('user__profile__main_character', 'user__profile__state', 'form__corp').prefetch_related(
+        Prefetch('responses', queryset=ApplicationResponse.objects.select_related('question').order_by('pk'))
+    )
+    if admin:
+        queryset = queryset.select_related('reviewer', 'reviewer_character').prefetch_related(
+            Prefetch('comments', queryset=ApplicationComment.objects.select_related('user').order_by('created', 'pk'))
+        )
+    return queryset
+
+
 class Query:
     hr_corp_applications = graphene.List(ApplicationAdminType)
     hr_finished_corp_applications = graphene.List(ApplicationAdminType)
@@ -17,34 +37,18 @@ class Query:
 
     @login_required
     def resolve_hr_corp_applications(self, info):
-        user = info.context.user
-        main_char = user.profile.main_character
-        res = Application.objects.none()
-
-        if user.is_superuser:
-            res = Application.objects.filter(approved=None).order_by('-created')
-        elif user.has_perm('auth.human_resources') and main_char and ApplicationForm.objects.filter(corp__corporation_id=main_char.corporation_id).exists():
-            res = Application.objects.filter(form__corp__corporation_id=main_char.corporation_id, approved=None).order_by('-created')
-
-        return res
+        res = reviewable_applications(info.context, Application.objects.filter(approved=None)).order_by('-created')
+        return preload_applications(res, admin=True)
 
     @login_required
     def resolve_hr_finished_corp_applications(self, info):
-        user = info.context.user
-        main_char = user.profile.main_character
-        res = Application.objects.none()
-
-        if user.is_superuser:
-            res = Application.objects.exclude(approved=None).order_by('-created')
-        elif user.has_perm('auth.human_resources') and main_char and ApplicationForm.objects.filter(corp__corporation_id=main_char.corporation_id).exists():
-            res = Application.objects.filter(form__corp__corporation_id=main_char.corporation_id)\
-                .exclude(approved=None).order_by('-created')
-
-        return res
+        res = reviewable_applications(info.context, Application.objects.exclude(approved=None)).order_by('-created')
+        return preload_applications(res, admin=True)
 
     @login_required
     def resolve_hr_list_available_forms(self, info):
-        return ApplicationForm.objects.exclude(applications__user=info.context.user)
+        applied_form_ids = set(info.context.user.applications.values_list('form_id', flat=True))
+        return [form for form_id, form in form_catalogue().items() if form_id not in applied_form_ids]
 
     @login_required
     def resolve_hr_personal_applications(self, info, status=None):
@@ -57,24 +61,19 @@ class Query:
             else:
                 approved = False
             res = res.filter(approved=approved)
-        return res
+        return preload_applications(res)
 
     @login_required
     @permission_required('auth.human_resources')
     def resolve_hr_search_application(self, info, search_string: str):
-        user = info.context.user
         searchstring = search_string.lower()
 
-        app_list = Application.objects.all()
-        if not user.is_superuser:
-            try:
-                app_list = app_list.filter(
-                    form__corp__corporation_id=user.profile.main_character.corporation_id
-                )
-            except AttributeError:
-                return None
+        if not info.context.user.is_superuser and info.context.user.profile.main_character is None:
+            return None
+
+        app_list = reviewable_applications(info.context, Application.objects.all())
 
-        return app_list.filter(
+        app_list = app_list.filter(
             Q(user__profile__main_character__character_name__icontains=searchstring) |
             Q(user__profile__main_character__corporation_name__icontains=searchstring) |
             Q(user__profile__main_character__alliance_name__icontains=searchstring) |
@@ -82,4 +81,6 @@ class Query:
             Q(user__character_ownerships__character__corporation_name__icontains=searchstring) |
             Q(user__character_ownerships__character__alliance_name__icontains=searchstring) |
             Q(user__username__icontains=searchstring)
-        )
+        ).distinct()
+
+        return preload_applications(app_list, admin=True)
@@ -0,0 +1,60 @@
+from django.core.cache import cache
+
+from allianceauth.hrapplications.models import ApplicationForm
+
+from ..decorators import get_permission_cache
+
+
+FORM_CORPORATIONS_CACHE_KEY = 'allianceauth_graphql_hr_form_corporation_ids'
+
+
+def form_corporation_ids() -> frozenset:
+    """Ids of the corporations having an application form, cached until a form changes"""
+    return cache.get_or_set(
+        FORM_CORPORATIONS_CACHE_KEY,
+        lambda: frozenset(ApplicationForm.objects.values_list('corp__corporation_id', flat=True)),
+        None
+    )
+
+
+def invalidate_form_corporation_ids():
+    cache.delete(FORM_CORPORATIONS_CACHE_KEY)
+
+
+def get_reviewable_corp_ids(request):
+    """
+    Returns the ids of the corporations whose applications the request user can review.
+
+    None means every corporation, like for superusers. The result is computed
+    once per request from the permission cache and the cached form corporations.
+    """
+    cached = getattr(request, '_graphql_hr_reviewable_corp_ids', None)
+    if cached is not None and cached[0] == request.user.pk:
+        return cached[1]
+
+    perm_cache = get_permission_cache(request)
+    main_character = request.user.profile.main_character
+
+    if perm_cache.is_superuser:
+        corp_ids = None
+    elif (
+        perm_cache.has_perm('auth.human_resources')
+        and main_character
+        and main_character.corporation_id in form_corporation_ids()
+    ):
+        corp_ids = frozenset((main_character.corporation_id,))
+    else:
+        corp_ids = frozenset()
+
+    request._graphql_hr_reviewable_corp_ids = (request.user.pk, corp_ids)
+    return corp_ids
+
+
+def reviewable_applications(request, queryset):
+    """Filters the applications to the ones the request user can review"""
+    corp_ids = get_reviewable_corp_ids(request)
+    if corp_ids is None:
+        return queryset
+    if not corp_ids:
+        return queryset.none()
+    return queryset.filter(form__corp__corporation_id__in=corp_ids)
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from allianceauth.eveonline.models import EveCorporationInfo
+from allianceauth.hrapplications.models import ApplicationForm, ApplicationQuestion, ApplicationChoice
+
+from .catalogue import invalidate_form_catalogue
+from .reviewers import form_corporation_ids, invalidate_form_corporation_ids
+
+
+@receiver([post_save, post_delete], sender=ApplicationForm)
+def invalidate_hr_form_corporations(sender, instance: ApplicationForm, **kwargs):
+    invalidate_form_corporation_ids()
+
+
+@receiver([post_save, post_delete], sender=ApplicationForm)
+@receiver([post_save, post_delete], sender=ApplicationQuestion)
+@receiver([post_save, post_delete], sender=ApplicationChoice)
+@receiver(m2m_changed, sender=ApplicationForm.questions.through)
+def invalidate_hr_form_catalogue(sender, **kwargs):
+    invalidate_form_catalogue()
+
+
+@receiver(post_save, sender=EveCorporationInfo)
+def invalidate_hr_form_catalogue_corporation(sender, instance: EveCorporationInfo, **kwargs):
+    # corporations are updated all the time, only the ones having a form are in the catalogue
+    if instance.corporation_id in form_corporation_ids():
+        invalidate_form_catalogue()
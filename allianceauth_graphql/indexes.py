@@ -0,0 +1,114 @@
+from django.core.checks import Tags, Warning, register
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+
+
+# Indexes on the tables of the optional Alliance Auth apps, used by the queries of this app.
+# Those apps own the tables, so the indexes aren't in the migration state of any app: they are
+# created with plain SQL by the migrations and again after every migrate if they are missing,
+# like when the app is installed later or one of its migrations rebuilds the table.
+OPTIONAL_INDEXES = {
+    'srp_srpuserrequest': {
+        'aagql_srpreq_fleet_status': ('srp_fleet_main_id', 'srp_status'),
+        'aagql_srpreq_fleet_time': ('srp_fleet_main_id', 'post_time'),
+        'aagql_srpreq_fleet_loss': ('srp_fleet_main_id', 'kb_total_loss'),
+    },
+    'timerboard_timer': {
+        'aagql_timer_public_time': ('corp_timer', 'eve_time'),
+        'aagql_timer_corp_time': ('eve_corp_id', 'corp_timer', 'eve_time'),
+    },
+    'optimer_optimer': {
+        'aagql_optimer_start': ('start',),
+    },
+}
+
+
+# migrations adding the indexes of every table, they are kept only while it is applied
+INDEX_MIGRATIONS = {
+    'srp_srpuserrequest': '0004_srpuserrequest_indexes',
+    'timerboard_timer': '0005_timer_indexes',
+    'optimer_optimer': '0006_optimer_indexes',
+}
+
+
+def migrated_tables(connection) -> list:
+    applied = MigrationRecorder(connection).applied_migrations()
+    return [table for table, migration in INDEX_MIGRATIONS.items() if ('allianceauth_graphql', migration) in applied]
+
+
+def missing_indexes(connection, tables=None) -> list:
+    """
+    Returns the table, name and columns of the indexes missing on the existing tables.
+
+    By default the tables whose index migration is applied are checked.
+    """
+    tables = migrated_tables(connection) if tables is None else tables
+
+    missing = []
+    with connection.cursor() as cursor:
+        existing_tables = set(connection.introspection.table_names(cursor))
+        for table in tables:
+            if table not in existing_tables:
+                continue
+            constraints = connection.introspection.get_constraints(cursor, table)
+            missing.extend(
+                (table, name, columns)
+                for name, columns in OPTIONAL_INDEXES[table].items()
+                if name not in constraints
+            )
+
+    return missing
+
+
+def create_indexes(schema_editor, tables=None):
+    """Creates the missing indexes of the tables that exist, by default of the ones whose index migration is applied"""
+    quote_name = schema_editor.quote_name
+    for table, name, columns in missing_indexes(schema_editor.connection, tables):
+        schema_editor.execute(
+            f'CREATE INDEX {quote_name(name)} ON {quote_name(table)} '
+            f'({", ".join(quote_name(column) for column in columns)})'
+        )
+
+
+def drop_indexes(schema_editor, tables):
+    """Drops the indexes of the tables that exist"""
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        existing_tables = set(connection.introspection.table_names(cursor))
+        existing = {
+            (table, name)
+            for table in tables if table in existing_tables
+            for name in connection.introspection.get_constraints(cursor, table)
+        }
+
+    for table in tables:
+        for name in OPTIONAL_INDEXES[table]:
+            if (table, name) in existing:
+                schema_editor.execute(
+                    schema_editor.sql_delete_index % {
+                        'name': schema_editor.quote_name(name),
+                        'table': schema_editor.quote_name(table),
+                    }
+                )
+
+
+def create_missing_indexes(sender, using, **kwargs):
+    """post_migrate receiver, creates the indexes dropped or skipped by the migrations"""
+    connection = connections[using]
+    if missing_indexes(connection):
+        with connection.schema_editor() as schema_editor:
+            create_indexes(schema_editor)
+
+
+@register(Tags.database)
+def check_indexes(app_configs, databases=None, **kwargs):
+    errors = []
+    for alias in databases or []:
+        for table, name, _ in missing_indexes(connections[alias]):
+            errors.append(Warning(
+                f"Index {name} on {table} is missing, some queries will be slow",
+                hint="Run the migrations to create it",
+                obj=table,
+                id='allianceauth_graphql.W001',
+            ))
+    return errors
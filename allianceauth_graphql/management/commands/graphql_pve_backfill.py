@@ -0,0 +1,22 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Builds the stored summaries and the daily totals of the allianceauth-pve rotations created before they were kept up to date"
+
+    def handle(self, *args, **options):
+        if not apps.is_installed('allianceauth_pve'):
+            raise CommandError("allianceauth-pve is not installed")
+
+        from allianceauth_pve.models import Rotation
+
+        from ...community_creations.allianceauth_pve_integration.summaries import (
+            add_closed_rotations_to_daily_totals, update_summaries,
+        )
+
+        rotation_ids = list(Rotation.objects.values_list('pk', flat=True))
+        update_summaries(rotation_ids)
+        add_closed_rotations_to_daily_totals()
+
+        self.stdout.write(self.style.SUCCESS(f"Updated the summaries and the daily totals of {len(rotation_ids)} rotations"))
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SrpKillmail',
+            fields=[
+                ('killmail_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('srp_request_id', models.PositiveIntegerField(blank=True, null=True, unique=True)),
+                ('ship_type_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('ship_name', models.CharField(default='', max_length=254)),
+                ('ship_value', models.BigIntegerField(blank=True, null=True)),
+                ('victim_id', models.PositiveIntegerField(blank=True, null=True)),
+            ],
+        ),
+    ]
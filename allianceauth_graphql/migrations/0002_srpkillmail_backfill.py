@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+def backfill_killmails(apps, schema_editor):
+    try:
+        SrpUserRequest = apps.get_model('srp', 'SrpUserRequest')
+    except LookupError:
+        # Alliance Auth SRP isn't migrated yet, so there are no requests to register
+        return
+
+    SrpKillmail = apps.get_model('allianceauth_graphql', 'SrpKillmail')
+
+    killmails = {}
+    requests = (
+        SrpUserRequest.objects
+        .order_by('pk')
+        .values_list('pk', 'killboard_link', 'srp_ship_name', 'kb_total_loss')
+    )
+    for request_id, killboard_link, ship_name, ship_value in requests.iterator():
+        # same parsing as SRPManager.get_kill_id
+        killmail_id = ''.join(c for c in killboard_link if c in '0123456789')
+        if killmail_id and len(killmail_id) < 19 and int(killmail_id) not in killmails:
+            killmails[int(killmail_id)] = SrpKillmail(
+                killmail_id=int(killmail_id),
+                srp_request_id=request_id,
+                ship_name=ship_name,
+                ship_value=ship_value,
+            )
+
+    SrpKillmail.objects.bulk_create(killmails.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allianceauth_graphql', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_killmails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('allianceauth_graphql', '0002_srpkillmail_backfill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SrpRequestIntake',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('srp_fleet_main_id', models.PositiveIntegerField()),
+                ('killboard_link', models.CharField(max_length=254)),
+                ('additional_info', models.CharField(blank=True, default='', max_length=254)),
+                ('status', models.CharField(choices=[('pending', 'Pending validation'), ('processing', 'Processing'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], default='pending', max_length=10)),
+                ('error', models.CharField(blank=True, default='', max_length=254)),
+                ('srp_request_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('claimed', models.DateTimeField(blank=True, null=True)),
+                ('processed', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created'], name='allianceaut_status_3fea2b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from allianceauth_graphql.indexes import create_indexes, drop_indexes
+
+
+# Alliance Auth timerboard owns the timerboard_timer table, the indexes are created with plain SQL outside the
+# migration state and only if the table exists. They are created again after every migrate
+# if they are missing, see allianceauth_graphql.indexes
+TABLES = ['timerboard_timer']
+
+
+def add_indexes(apps, schema_editor):
+    create_indexes(schema_editor, TABLES)
+
+
+def remove_indexes(apps, schema_editor):
+    drop_indexes(schema_editor, TABLES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allianceauth_graphql', '0004_srpuserrequest_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('allianceauth_graphql', '0006_optimer_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PveRotationSummary',
+            fields=[
+                ('rotation_id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('last_entry_update', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PveRotationUserSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('estimated_share', models.FloatField(default=0)),
+                ('share_count', models.PositiveIntegerField(default=0)),
+                ('helped_setups', models.PositiveIntegerField(default=0)),
+                ('summary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='users', to='allianceauth_graphql.pverotationsummary')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='pverotationusersummary',
+            constraint=models.UniqueConstraint(fields=('summary', 'user'), name='aagql_unique_pve_rotation_user'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('allianceauth_graphql', '0007_pverotationsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pverotationsummary',
+            name='added_to_daily_totals',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='PveDailyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('estimated_total', models.FloatField(default=0)),
+                ('actual_total', models.FloatField(default=0)),
+                ('helped_setups', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='pvedailytotal',
+            constraint=models.UniqueConstraint(fields=('user', 'day'), name='aagql_unique_pve_user_day'),
+        ),
+    ]
@@ -1,3 +1,132 @@
+from django.contrib.auth.models import User
 from django.db import models
 
-# Create your models here.
+
+class SrpKillmail(models.Model):
+    """
+    Killmail of an SRP request.
+
+    The killmail id is the primary key, so checking if a killmail has already been requested
+    doesn't scan the killboard links. The data resolved from zKillboard and ESI is stored
+    to avoid calling them again when a submission is retried.
+
+    Alliance Auth SRP is optional, so the SRP request is referenced by id.
+    """
+
+    killmail_id = models.BigIntegerField(primary_key=True)
+    srp_request_id = models.PositiveIntegerField(null=True, blank=True, unique=True)
+    ship_type_id = models.PositiveIntegerField(null=True, blank=True)
+    ship_name = models.CharField(max_length=254, default="")
+    ship_value = models.BigIntegerField(null=True, blank=True)
+    victim_id = models.PositiveIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return str(self.killmail_id)
+
+    @property
+    def is_resolved(self) -> bool:
+        return self.ship_type_id is not None and self.victim_id is not None
+
+
+class SrpRequestIntake(models.Model):
+    """
+    SRP request submitted while the asynchronous intake is enabled.
+
+    It is stored as pending validation and then validated by the `process_srp_intakes` task,
+    which claims it as processing, then creates the SRP request or stores the reason why it was rejected.
+    Alliance Auth SRP is optional, so the SRP fleet and request are referenced by id.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending validation'
+        PROCESSING = 'processing', 'Processing'
+        ACCEPTED = 'accepted', 'Accepted'
+        REJECTED = 'rejected', 'Rejected'
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    srp_fleet_main_id = models.PositiveIntegerField()
+    killboard_link = models.CharField(max_length=254)
+    additional_info = models.CharField(max_length=254, default="", blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    error = models.CharField(max_length=254, default="", blank=True)
+    srp_request_id = models.PositiveIntegerField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    claimed = models.DateTimeField(null=True, blank=True)
+    processed = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created']),
+        ]
+
+    def __str__(self):
+        return f'{self.user} SRP intake {self.pk} ({self.status})'
+
+
+class PveRotationSummary(models.Model):
+    """
+    Stored summary of an allianceauth-pve rotation.
+
+    allianceauth-pve is optional, so the rotation is referenced by id. The number of entries
+    and the last entry update are the state of the entries the summary was computed from,
+    when they don't match anymore the summary is out of date and it is rebuilt on the next write.
+    """
+
+    rotation_id = models.PositiveIntegerField(primary_key=True)
+    entry_count = models.PositiveIntegerField(default=0)
+    last_entry_update = models.DateTimeField(null=True, blank=True)
+    added_to_daily_totals = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f'Rotation {self.rotation_id} summary'
+
+
+class PveRotationUserSummary(models.Model):
+    """Total of the shares of a user in a rotation, before the taxes and the sales percentage"""
+
+    summary = models.ForeignKey(PveRotationSummary, on_delete=models.CASCADE, related_name='users')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    estimated_share = models.FloatField(default=0)
+    share_count = models.PositiveIntegerField(default=0)
+    helped_setups = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['summary', 'user'], name='aagql_unique_pve_rotation_user'),
+        ]
+
+    def __str__(self):
+        return f'{self.user} in rotation {self.summary_id}'
+
+
+class PveDailyTotal(models.Model):
+    """Totals of a user in the allianceauth-pve rotations closed in a day, summed by the running averages"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    day = models.DateField()
+    estimated_total = models.FloatField(default=0)
+    actual_total = models.FloatField(default=0)
+    helped_setups = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='aagql_unique_pve_user_day'),
+        ]
+
+    def __str__(self):
+        return f'{self.user} PvE totals on {self.day}'
+
+
+class CalendarFeed(models.Model):
+    """
+    Version of the iCalendar feed URL of a user.
+
+    The version is signed in the feed token, increasing it invalidates all the URLs given before.
+    Users without a row use version 0.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.user} calendar feed'
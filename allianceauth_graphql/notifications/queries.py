@@ -13,11 +13,11 @@ class Query:
 
     @login_required
     def resolve_notif_read_list(self, info):
-        return Notification.objects.filter(user=info.context.user, viewed=True).order_by("-timestamp")
+        return Notification.objects.select_related('user').filter(user=info.context.user, viewed=True).order_by("-timestamp")
 
     @login_required
     def resolve_notif_unread_list(self, info):
-        return Notification.objects.filter(user=info.context.user, viewed=False).order_by("-timestamp")
+        return Notification.objects.select_related('user').filter(user=info.context.user, viewed=False).order_by("-timestamp")
 
     def resolve_notif_unread_count(self, info, user_pk=None):
         if user_pk is None and not info.context.user.is_authenticated:
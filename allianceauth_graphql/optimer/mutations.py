@@ -1,10 +1,11 @@
 import graphene
 from graphene_django.forms.mutation import DjangoFormMutation
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
 from allianceauth.optimer.form import OpForm
 from allianceauth.optimer.models import OpTimer, OpTimerType
 
+from ..decorators import permission_required
 from .forms import EditOpForm
 from .types import OpTimerModelType
 
@@ -1,23 +1,65 @@
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
+from django.conf import settings
+from django.db.models import F
 from django.utils import timezone
 
 from allianceauth.optimer.models import OpTimer
 
-from .types import OpTimerModelType
+from ..decorators import permission_required
+from ..pagination import pagination_arguments, paginate
+from .types import OpTimerModelType, OpTimerSummaryType
+
+
+OPTIMER_DEFAULT_LIMIT = getattr(settings, 'GRAPHQL_OPTIMER_DEFAULT_LIMIT', 200)
+
+
+def optimers_window_arguments():
+    return {
+        'from_': graphene.DateTime(name='from'),
+        'to': graphene.DateTime(),
+        **pagination_arguments(default_limit=OPTIMER_DEFAULT_LIMIT),
+    }
+
+
+def optimers_window(queryset, from_=None, to=None):
+    if from_ is not None:
+        queryset = queryset.filter(start__gte=from_)
+    if to is not None:
+        queryset = queryset.filter(start__lt=to)
+    return queryset.order_by('start', 'id')
 
 
 class Query:
     optimer_past_timers = graphene.List(OpTimerModelType)
     optimer_future_timers = graphene.List(OpTimerModelType)
+    optimer_timers = graphene.List(OpTimerModelType, required=True, **optimers_window_arguments())
+    optimer_timer_summaries = graphene.List(OpTimerSummaryType, required=True, **optimers_window_arguments())
 
     @login_required
     @permission_required('auth.optimer_view')
     def resolve_optimer_past_timers(self, info):
-        return OpTimer.objects.filter(start__lt=timezone.now()).order_by('-start')
+        return OpTimer.objects.select_related('type', 'eve_character').filter(start__lt=timezone.now()).order_by('-start')
 
     @login_required
     @permission_required('auth.optimer_view')
     def resolve_optimer_future_timers(self, info):
-        return OpTimer.objects.filter(start__gte=timezone.now())
+        return OpTimer.objects.select_related('type', 'eve_character').filter(start__gte=timezone.now())
+
+    @login_required
+    @permission_required('auth.optimer_view')
+    def resolve_optimer_timers(self, info, offset, limit, from_=None, to=None):
+        timers = optimers_window(OpTimer.objects.select_related('type', 'eve_character'), from_, to)
+        return paginate(timers, offset, limit)
+
+    @login_required
+    @permission_required('auth.optimer_view')
+    def resolve_optimer_timer_summaries(self, info, offset, limit, from_=None, to=None):
+        timers = optimers_window(OpTimer.objects.all(), from_, to).values(
+            'id',
+            'operation_name',
+            'start',
+            type_name=F('type__type')
+        )
+        return paginate(timers, offset, limit)
@@ -1,3 +1,4 @@
+import graphene
 from graphene_django import DjangoObjectType
 
 from allianceauth.optimer.models import OpTimer, OpTimerType
@@ -12,3 +13,11 @@ class OpTimerTypeType(DjangoObjectType):
     class Meta:
         model = OpTimerType
         fields = ('id', "type", )
+
+
+class OpTimerSummaryType(graphene.ObjectType):
+    """Fields of an operation needed by the lists, read without loading the whole row"""
+    id = graphene.ID(required=True)
+    operation_name = graphene.String(required=True)
+    start = graphene.DateTime(required=True)
+    type_name = graphene.String()
@@ -0,0 +1,24 @@
+import graphene
+
+
+def pagination_arguments(default_limit=None):
+    """Arguments added to the list fields that can be paginated"""
+    return {
+        'offset': graphene.Int(default_value=0),
+        'limit': graphene.Int(default_value=default_limit),
+    }
+
+
+def paginate(queryset, offset=0, limit=None):
+    """
+    Slices the queryset, so that only the requested page is fetched from the database.
+
+    Without a limit all the rows from the offset on are returned.
+    """
+    if offset < 0 or (limit is not None and limit < 0):
+        raise Exception("Offset and limit must be positive")
+
+    if limit is None:
+        return queryset[offset:]
+
+    return queryset[offset:offset + limit]
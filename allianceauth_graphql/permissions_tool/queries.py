@@ -3,8 +3,9 @@ from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, F, Q
 
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
+from ..decorators import permission_required
 from .types import PermissionType, AppModelType
 
 
@@ -23,7 +24,9 @@ class Query:
     @permission_required('permissions_tool.audit_permissions')
     def resolve_perms_search(self, info, show_only_applied, app_label=None, model=None, search_string=None):
         perms = (
-            Permission.objects.all()
+            Permission.objects
+            .select_related('content_type')
+            .prefetch_related('user_set', 'group_set', 'state_set')
             .annotate(num_users=Count('user', distinct=True))
             .annotate(num_groups=Count('group', distinct=True))
             .annotate(num_users_in_groups=Count('group__user', distinct=True))
@@ -47,6 +47,12 @@ class PermissionType(DjangoObjectType):
             'group_set',
         )
 
+    def resolve_group_set(self, info):
+        return self.group_set.all()
+
+    def resolve_state_set(self, info):
+        return self.state_set.all()
+
 
 class AppModelType(graphene.ObjectType):
     app_label = graphene.String(required=True)
@@ -12,6 +12,11 @@ community_creations = [
     'allianceauth_pve',
 ]
 
+# modules combining the data of more apps, loaded only if all of them are installed
+combined_modules = {
+    'allianceauth_graphql.calendar': ('allianceauth.timerboard', 'allianceauth.optimer'),
+}
+
 
 def create_schema() -> graphene.Schema:
     mutations = []
@@ -34,6 +39,12 @@ def create_schema() -> graphene.Schema:
                 queries.append(module.Query)
                 mutations.append(module.Mutation)
 
+    for import_module, apps in combined_modules.items():
+        if all(app in settings.INSTALLED_APPS for app in apps):
+            module = importlib.import_module(import_module)
+            queries.append(module.Query)
+            mutations.append(module.Mutation)
+
     class Query(*queries, esi_query, graphene.ObjectType):
         pass
 
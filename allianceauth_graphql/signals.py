@@ -0,0 +1,13 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from esi.models import Token
+
+from .decorators import tokens_cache_key
+
+
+@receiver([post_save, post_delete], sender=Token)
+def invalidate_tokens_cache(sender, instance: Token, **kwargs):
+    if instance.user_id is not None:
+        cache.delete(tokens_cache_key(instance.user_id))
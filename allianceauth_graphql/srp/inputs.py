@@ -0,0 +1,13 @@
+import graphene
+
+
+class SrpAmountInput(graphene.InputObjectType):
+    request_id = graphene.ID(required=True)
+    amount = graphene.Float(required=True)
+
+
+class SrpAmountRuleInput(graphene.InputObjectType):
+    fleet_id = graphene.ID(required=True)
+    ship_name = graphene.String(required=False)
+    status = graphene.Field('allianceauth_graphql.srp.types.SrpRequestStatus', required=False)
+    amount = graphene.Float(required=True)
@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from allianceauth.srp.models import SrpUserRequest
+from allianceauth.srp.managers import SRPManager
+from allianceauth.srp.providers import esi
+
+from ..models import SrpKillmail
+
+
+TYPE_NAME_CACHE_TIMEOUT = getattr(settings, 'GRAPHQL_SRP_TYPE_NAME_CACHE_TIMEOUT', 24 * 60 * 60)
+
+
+def type_name_cache_key(type_id) -> str:
+    return f'allianceauth_graphql_srp_type_name_{type_id}'
+
+
+def get_type_name(type_id) -> str:
+    """Returns the name of the EVE type, it is fetched from ESI only if it isn't cached"""
+    return cache.get_or_set(
+        type_name_cache_key(type_id),
+        lambda: esi.client.Universe.get_universe_types_type_id(type_id=type_id).result()['name'],
+        TYPE_NAME_CACHE_TIMEOUT
+    )
+
+
+def get_killmail_id(killboard_link):
+    """Returns the killmail id of the killboard link, or None if it can't be a valid killmail id"""
+    killmail_id = SRPManager.get_kill_id(killboard_link=killboard_link)
+    if not killmail_id or len(killmail_id) > 18:
+        return None
+    return int(killmail_id)
+
+
+def get_killmail(killmail_id) -> SrpKillmail:
+    """
+    Returns the stored killmail, it is resolved from zKillboard and ESI only if it hasn't been already.
+
+    Raises ValueError if the killmail doesn't exist.
+    """
+    killmail = SrpKillmail.objects.filter(killmail_id=killmail_id).first() or SrpKillmail(killmail_id=killmail_id)
+    if not killmail.is_resolved:
+        (ship_type_id, ship_value, victim_id) = SRPManager.get_kill_data(killmail_id)
+        killmail.ship_type_id = ship_type_id
+        killmail.ship_value = ship_value
+        killmail.victim_id = victim_id
+        killmail.save()
+
+    return killmail
+
+
+def submit_srp_request(user, srp_fleet_main, killboard_link, additional_info):
+    """
+    Validates the killmail and creates the SRP request of the user.
+
+    Returns the new request and None, or None and the reason why the request was rejected.
+    """
+    killmail_id = get_killmail_id(killboard_link)
+    if killmail_id is None:
+        return None, "Invalid killmail"
+
+    # check if the killmail_id is already present
+    if SrpKillmail.objects.filter(killmail_id=killmail_id, srp_request_id__isnull=False).exists():
+        return None, "This killmail has already been submitted"
+
+    post_time = timezone.now()
+
+    srp_request = SrpUserRequest()
+    srp_request.killboard_link = killboard_link
+    srp_request.additional_info = additional_info
+    srp_request.character = user.profile.main_character
+    srp_request.srp_fleet_main = srp_fleet_main
+
+    try:
+        killmail = get_killmail(killmail_id)
+    except ValueError:
+        return None, "Invalid killmail"
+
+    if not user.character_ownerships.filter(character__character_id=str(killmail.victim_id)).exists():
+        return None, "The victim of the killmail is not one of your characters"
+
+    if not killmail.ship_name:
+        killmail.ship_name = get_type_name(killmail.ship_type_id)
+        killmail.save(update_fields=['ship_name'])
+
+    srp_request.srp_ship_name = killmail.ship_name
+    srp_request.kb_total_loss = killmail.ship_value
+    srp_request.post_time = post_time
+
+    with transaction.atomic():
+        # concurrent submissions of the same killmail wait for the lock
+        if SrpKillmail.objects.select_for_update().get(killmail_id=killmail_id).srp_request_id is not None:
+            return None, "This killmail has already been submitted"
+
+        # the killmail is linked to the request by the post_save signal
+        srp_request.save()
+
+    return srp_request, None
@@ -1,20 +1,26 @@
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 from graphene_django.forms.mutation import DjangoFormMutation
 
-from django.utils import timezone
+from django.conf import settings
+from django.db import transaction
 from django.contrib.humanize.templatetags.humanize import intcomma
 
 from allianceauth.srp.form import SrpFleetMainForm
 from allianceauth.srp.models import SrpFleetMain, SrpUserRequest
 from allianceauth.srp.views import random_string
-from allianceauth.srp.managers import SRPManager
-from allianceauth.srp.providers import esi
 from allianceauth.notifications import notify
 
-from ..decorators import permissions_required
-from .types import SrpFleetMainType, SrpUserRequestType
+from ..decorators import permissions_required, permission_required
+from ..models import SrpKillmail, SrpRequestIntake
+from .. import tasks
+from .types import SrpFleetMainType, SrpUserRequestType, SrpRequestIntakeType
 from .forms import GQLSrpFleetUserRequestForm
+from .inputs import SrpAmountInput, SrpAmountRuleInput
+from .killmails import get_killmail_id, submit_srp_request
+
+
+SRP_ASYNC_INTAKE = getattr(settings, 'GRAPHQL_SRP_ASYNC_INTAKE', False)
 
 
 class AddFleetMutation(DjangoFormMutation):
@@ -128,43 +134,41 @@ class SrpFleetUserRequestFormMutation(DjangoFormMutation):
 
     ok = graphene.Boolean()
     srp_request = graphene.Field(SrpUserRequestType)
+    intake = graphene.Field(SrpRequestIntakeType)
 
     @classmethod
     @login_required
     @permission_required('srp.access_srp')
     def perform_mutate(cls, form: GQLSrpFleetUserRequestForm, info):
         request_killboard_link = form.cleaned_data['killboard_link']
-        killmail_id = SRPManager.get_kill_id(killboard_link=request_killboard_link)
+        killmail_id = get_killmail_id(request_killboard_link)
+        if killmail_id is None:
+            return cls(ok=False)
 
         # check if the killmail_id is already present
-        if SrpUserRequest.objects.filter(killboard_link__icontains="/kill/" + killmail_id).exists():
+        if SrpKillmail.objects.filter(killmail_id=killmail_id, srp_request_id__isnull=False).exists():
             return cls(ok=False)
 
-        character = info.context.user.profile.main_character
         srp_fleet_main = SrpFleetMain.objects.get(fleet_srp_code=form.cleaned_data['fleet_srp_code'])
-        post_time = timezone.now()
-
-        srp_request = SrpUserRequest()
-        srp_request.killboard_link = request_killboard_link
-        srp_request.additional_info = form.cleaned_data['additional_info']
-        srp_request.character = character
-        srp_request.srp_fleet_main = srp_fleet_main
-
-        try:
-            srp_kill_link = SRPManager.get_kill_id(srp_request.killboard_link)
-            (ship_type_id, ship_value, victim_id) = SRPManager.get_kill_data(srp_kill_link)
-        except ValueError:
-            return cls(ok=False)
 
-        if info.context.user.character_ownerships.filter(character__character_id=str(victim_id)).exists():
-            item_type = esi.client.Universe.get_universe_types_type_id(type_id=ship_type_id).result()
-            srp_request.srp_ship_name = item_type['name']
-            srp_request.kb_total_loss = ship_value
-            srp_request.post_time = post_time
-            srp_request.save()
-            return cls(ok=True, srp_request=srp_request)
-        else:
-            return cls(ok=False)
+        if SRP_ASYNC_INTAKE:
+            intake = SrpRequestIntake.objects.create(
+                user=info.context.user,
+                srp_fleet_main_id=srp_fleet_main.pk,
+                killboard_link=request_killboard_link,
+                additional_info=form.cleaned_data['additional_info'],
+            )
+            transaction.on_commit(tasks.process_srp_intakes.delay)
+            return cls(ok=True, intake=intake)
+
+        srp_request, _ = submit_srp_request(
+            info.context.user,
+            srp_fleet_main,
+            request_killboard_link,
+            form.cleaned_data['additional_info']
+        )
+
+        return cls(ok=srp_request is not None, srp_request=srp_request)
 
 
 class SrpRequestRemoveMutation(graphene.Mutation):
@@ -259,6 +263,61 @@ class SrpUpdateAmountMutation(graphene.Mutation):
         return cls(ok=ok)
 
 
+def parse_id(value):
+    """Returns the integer value of an ID argument, or None if it isn't a valid database id"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SrpBulkUpdateAmountMutation(graphene.Mutation):
+    class Arguments:
+        amounts = graphene.List(graphene.NonNull(SrpAmountInput))
+        rule = SrpAmountRuleInput()
+
+    ok = graphene.Boolean()
+    updated = graphene.Int()
+    errors = graphene.List(graphene.String)
+
+    @classmethod
+    @login_required
+    @permission_required('auth.srp_management')
+    def mutate(cls, root, info, amounts=None, rule=None):
+        if (amounts is None) == (rule is None):
+            return cls(ok=False, updated=0, errors=["Either a list of amounts or a rule is required"])
+
+        if rule is not None and parse_id(rule.fleet_id) is None:
+            return cls(ok=False, updated=0, errors=[f"SRP fleet {rule.fleet_id} doesn't exist"])
+
+        errors = []
+
+        with transaction.atomic():
+            if rule is not None:
+                srp_requests = SrpUserRequest.objects.filter(srp_fleet_main_id=parse_id(rule.fleet_id))
+                if rule.ship_name:
+                    srp_requests = srp_requests.filter(srp_ship_name__iexact=rule.ship_name)
+                if rule.status:
+                    srp_requests = srp_requests.filter(srp_status=rule.status.value)
+
+                updated = srp_requests.update(srp_total_amount=rule.amount)
+            else:
+                request_ids = [parse_id(amount.request_id) for amount in amounts]
+                srp_requests = SrpUserRequest.objects.in_bulk([pk for pk in request_ids if pk is not None])
+                to_update = []
+                for amount, request_id in zip(amounts, request_ids):
+                    srp_request = srp_requests.get(request_id)
+                    if srp_request is None:
+                        errors.append(f"SRP request {amount.request_id} doesn't exist")
+                    else:
+                        srp_request.srp_total_amount = amount.amount
+                        to_update.append(srp_request)
+
+                updated = SrpUserRequest.objects.bulk_update(to_update, ['srp_total_amount'])
+
+        return cls(ok=len(errors) == 0, updated=updated, errors=errors)
+
+
 class SrpUpdateAARMutation(graphene.Mutation):
     class Arguments:
         fleet_id = graphene.ID(required=True)
@@ -288,4 +347,5 @@ class Mutation:
     srp_approve_requests = SrpRequestApproveMutation.Field()
     srp_reject_requests = SrpRequestRejectMutation.Field()
     srp_update_amount = SrpUpdateAmountMutation.Field()
+    srp_bulk_update_amount = SrpBulkUpdateAmountMutation.Field()
     srp_update_aar = SrpUpdateAARMutation.Field()
@@ -1,18 +1,99 @@
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
-from allianceauth.srp.models import SrpFleetMain
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
 
-from .types import SrpFleetMainType
+from allianceauth.srp.models import SrpFleetMain, SrpUserRequest
+
+from ..decorators import permission_required
+from ..models import SrpRequestIntake
+from ..pagination import pagination_arguments, paginate
+from .types import SrpFleetMainType, SrpRequestIntakeType, SrpFleetRequestsType, SrpRequestStatus, SrpRequestSortKey
 
 
 class Query:
     srp_get_fleets = graphene.List(SrpFleetMainType, all=graphene.Boolean(default_value=False))
+    srp_request_intake = graphene.Field(SrpRequestIntakeType, intake_id=graphene.Int(required=True))
+    srp_fleet_requests = graphene.Field(
+        SrpFleetRequestsType,
+        fleet_id=graphene.Int(required=True),
+        status=SrpRequestStatus(),
+        ship_name=graphene.String(),
+        character_name=graphene.String(),
+        min_loss=graphene.BigInt(),
+        max_loss=graphene.BigInt(),
+        sort=SrpRequestSortKey(default_value=SrpRequestSortKey.POST_TIME),
+        descending=graphene.Boolean(default_value=False),
+        **pagination_arguments()
+    )
 
     @login_required
     @permission_required('srp.access_srp')
     def resolve_srp_get_fleets(self, info, all):
-        res = SrpFleetMain.objects.all()
+        res = SrpFleetMainType.with_totals(
+            SrpFleetMain.objects.select_related('fleet_commander')
+        )
         if not all:
             res = res.filter(fleet_srp_status="")
         return res
+
+    @login_required
+    @permission_required('srp.access_srp')
+    def resolve_srp_request_intake(self, info, intake_id):
+        return SrpRequestIntake.objects.filter(user=info.context.user, id=intake_id).first()
+
+    @login_required
+    @permission_required('auth.srp_management')
+    def resolve_srp_fleet_requests(
+        self,
+        info,
+        fleet_id,
+        sort,
+        descending,
+        offset,
+        limit=None,
+        status=None,
+        ship_name=None,
+        character_name=None,
+        min_loss=None,
+        max_loss=None
+    ):
+        requests = SrpUserRequest.objects.filter(srp_fleet_main_id=fleet_id)
+
+        if ship_name:
+            requests = requests.filter(srp_ship_name__icontains=ship_name)
+        if character_name:
+            requests = requests.filter(character__character_name__icontains=character_name)
+        if min_loss is not None:
+            requests = requests.filter(kb_total_loss__gte=min_loss)
+        if max_loss is not None:
+            requests = requests.filter(kb_total_loss__lte=max_loss)
+
+        status_totals = list(
+            requests
+            .values('srp_status')
+            .annotate(
+                count=Count('pk'),
+                total_loss=Coalesce(Sum('kb_total_loss'), 0),
+                total_amount=Coalesce(Sum('srp_total_amount'), 0),
+            )
+            .order_by('srp_status')
+        )
+
+        if status:
+            status = status.value
+            requests = requests.filter(srp_status=status)
+
+        order = f'-{sort.value}' if descending else sort.value
+        requests = (
+            requests
+            .select_related('character', 'srp_fleet_main')
+            .order_by(order, '-pk' if descending else 'pk')
+        )
+
+        return {
+            'requests': paginate(requests, offset, limit),
+            'total_count': sum(t['count'] for t in status_totals if not status or t['srp_status'] == status),
+            'status_totals': status_totals,
+        }
@@ -0,0 +1,42 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from allianceauth.srp.models import SrpFleetMain, SrpUserRequest
+
+from ..models import SrpKillmail, SrpRequestIntake
+from .killmails import get_killmail_id
+
+
+@receiver(post_save, sender=SrpUserRequest)
+def register_srp_killmail(sender, instance: SrpUserRequest, created, **kwargs):
+    # requests created by the Alliance Auth views are registered too
+    if not created:
+        return
+
+    killmail_id = get_killmail_id(instance.killboard_link)
+    if killmail_id is None:
+        return
+
+    killmail, _ = SrpKillmail.objects.get_or_create(
+        killmail_id=killmail_id,
+        defaults={
+            'srp_request_id': instance.pk,
+            'ship_name': instance.srp_ship_name,
+            'ship_value': instance.kb_total_loss,
+        }
+    )
+    if killmail.srp_request_id is None:
+        killmail.srp_request_id = instance.pk
+        killmail.save(update_fields=['srp_request_id'])
+
+
+@receiver(post_delete, sender=SrpUserRequest)
+def unlink_srp_request(sender, instance: SrpUserRequest, **kwargs):
+    # the killmail can be requested again
+    SrpKillmail.objects.filter(srp_request_id=instance.pk).update(srp_request_id=None)
+    SrpRequestIntake.objects.filter(srp_request_id=instance.pk).update(srp_request_id=None)
+
+
+@receiver(post_delete, sender=SrpFleetMain)
+def delete_srp_fleet_intakes(sender, instance: SrpFleetMain, **kwargs):
+    SrpRequestIntake.objects.filter(srp_fleet_main_id=instance.pk).delete()
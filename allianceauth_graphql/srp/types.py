@@ -1,8 +1,13 @@
 import graphene
 from graphene_django import DjangoObjectType
 
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
 from allianceauth.srp.models import SrpFleetMain, SrpUserRequest
 
+from ..models import SrpRequestIntake
+
 
 class SrpFleetMainType(DjangoObjectType):
     total_cost = graphene.Int(required=True)
@@ -11,7 +16,88 @@ class SrpFleetMainType(DjangoObjectType):
     class Meta:
         model = SrpFleetMain
 
+    @staticmethod
+    def with_totals(queryset):
+        """Annotates the totals of the fleets, so that they are computed in the same query"""
+        return queryset.annotate(
+            srp_total_cost=Coalesce(Sum('srpuserrequest__srp_total_amount'), 0),
+            srp_pending_requests=Count('srpuserrequest', filter=Q(srpuserrequest__srp_status='Pending')),
+        )
+
+    def resolve_total_cost(self, info):
+        if hasattr(self, 'srp_total_cost'):
+            return self.srp_total_cost
+        return self.total_cost
+
+    def resolve_pending_requests(self, info):
+        if hasattr(self, 'srp_pending_requests'):
+            return self.srp_pending_requests
+        return self.pending_requests
+
 
 class SrpUserRequestType(DjangoObjectType):
     class Meta:
         model = SrpUserRequest
+
+
+class SrpRequestStatus(graphene.Enum):
+    PENDING = 'Pending'
+    APPROVED = 'Approved'
+    REJECTED = 'Rejected'
+
+
+class SrpRequestSortKey(graphene.Enum):
+    POST_TIME = 'post_time'
+    SHIP_NAME = 'srp_ship_name'
+    CHARACTER = 'character__character_name'
+    LOSS = 'kb_total_loss'
+    AMOUNT = 'srp_total_amount'
+    STATUS = 'srp_status'
+
+
+class SrpStatusTotalType(graphene.ObjectType):
+    status = graphene.Field(SrpRequestStatus, required=True)
+    count = graphene.Int(required=True)
+    total_loss = graphene.BigInt(required=True)
+    total_amount = graphene.BigInt(required=True)
+
+    def resolve_status(self, info):
+        return SrpRequestStatus.get(self['srp_status'])
+
+
+class SrpFleetRequestsType(graphene.ObjectType):
+    requests = graphene.List(SrpUserRequestType, required=True)
+    total_count = graphene.Int(required=True)
+    status_totals = graphene.List(
+        SrpStatusTotalType,
+        required=True,
+        description="Totals per status of the requests matching the filters other than the status"
+    )
+
+
+class SrpRequestIntakeStatus(graphene.Enum):
+    PENDING = SrpRequestIntake.Status.PENDING.value
+    PROCESSING = SrpRequestIntake.Status.PROCESSING.value
+    ACCEPTED = SrpRequestIntake.Status.ACCEPTED.value
+    REJECTED = SrpRequestIntake.Status.REJECTED.value
+
+
+class SrpRequestIntakeType(DjangoObjectType):
+    status = graphene.Field(SrpRequestIntakeStatus, required=True)
+    srp_fleet_main = graphene.Field(SrpFleetMainType)
+    srp_request = graphene.Field(SrpUserRequestType)
+
+    class Meta:
+        model = SrpRequestIntake
+        fields = ('id', 'killboard_link', 'additional_info', 'status', 'error', 'created', 'processed',)
+
+    def resolve_status(self, info):
+        return SrpRequestIntakeStatus.get(str(self.status))
+
+    def resolve_srp_fleet_main(self, info):
+        return SrpFleetMain.objects.filter(pk=self.srp_fleet_main_id).first()
+
+    def resolve_srp_request(self, info):
+        if self.srp_request_id is None:
+            return None
+        return SrpUserRequest.objects.filter(pk=self.srp_request_id).first()
@@ -0,0 +1,95 @@
+import datetime
+
+from celery import shared_task
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from allianceauth.services.hooks import get_extension_logger
+
+from .models import SrpRequestIntake
+
+
+logger = get_extension_logger(__name__)
+
+SRP_INTAKE_BATCH_SIZE = getattr(settings, 'GRAPHQL_SRP_INTAKE_BATCH_SIZE', 50)
+SRP_INTAKE_CLAIM_TIMEOUT = getattr(settings, 'GRAPHQL_SRP_INTAKE_CLAIM_TIMEOUT', 600)
+
+
+def claim_srp_intakes():
+    """
+    Marks a batch of SRP request intakes as processing and returns them.
+
+    The rows are locked only while they are claimed, so the validation doesn't hold any lock.
+    Intakes left processing for more than the claim timeout, by a worker that stopped, are claimed again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # only the pks are locked, MariaDB doesn't support locking the rows of a single table of a join
+        intake_ids = list(
+            SrpRequestIntake.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=SrpRequestIntake.Status.PENDING)
+                | Q(
+                    status=SrpRequestIntake.Status.PROCESSING,
+                    claimed__lt=now - datetime.timedelta(seconds=SRP_INTAKE_CLAIM_TIMEOUT)
+                )
+            )
+            .order_by('created', 'pk')
+            .values_list('pk', flat=True)[:SRP_INTAKE_BATCH_SIZE]
+        )
+        SrpRequestIntake.objects.filter(pk__in=intake_ids).update(
+            status=SrpRequestIntake.Status.PROCESSING,
+            claimed=now,
+        )
+
+    intakes = list(
+        SrpRequestIntake.objects
+        .select_related('user__profile__main_character')
+        .filter(pk__in=intake_ids)
+        .order_by('created', 'pk')
+    )
+
+    return intakes
+
+
+@shared_task
+def process_srp_intakes():
+    """
+    Validates the pending SRP request intakes, in batches, until none is left.
+
+    A killmail is resolved from zKillboard and ESI only once, the other submissions
+    of the same killmail are rejected as duplicates.
+    """
+    # Alliance Auth SRP is optional, so its models are imported only when the task runs
+    from allianceauth.srp.models import SrpFleetMain
+    from .srp.killmails import submit_srp_request
+
+    while True:
+        intakes = claim_srp_intakes()
+        if not intakes:
+            return
+
+        fleets = SrpFleetMain.objects.in_bulk({intake.srp_fleet_main_id for intake in intakes})
+        for intake in intakes:
+            try:
+                srp_request, error = submit_srp_request(
+                    intake.user,
+                    fleets[intake.srp_fleet_main_id],
+                    intake.killboard_link,
+                    intake.additional_info
+                )
+            except Exception:
+                logger.exception(f"Unhandled exception occurred while validating SRP intake {intake.pk}")
+                srp_request, error = None, "Unable to validate the killmail, please submit it again"
+
+            intake.srp_request_id = srp_request.pk if srp_request else None
+            intake.status = SrpRequestIntake.Status.ACCEPTED if srp_request else SrpRequestIntake.Status.REJECTED
+            intake.error = error or ""
+            intake.processed = timezone.now()
+            intake.save(update_fields=['srp_request_id', 'status', 'error', 'processed'])
+
+        logger.info(f"Processed {len(intakes)} SRP intakes")
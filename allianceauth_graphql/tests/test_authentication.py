@@ -1,13 +1,17 @@
 import json
 import re
 from urllib.parse import quote_plus
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from faker import Faker
 
-from django.test import override_settings, TestCase, modify_settings
+from django.test import override_settings, TestCase, modify_settings, RequestFactory
 from django.core import mail, signing
+from django.core.cache import cache
 from django.urls import reverse
 from graphene_django.utils.testing import GraphQLTestCase
+from graphql_jwt.exceptions import JSONWebTokenError
+from graphql_jwt.settings import jwt_settings
+from graphql_jwt.shortcuts import get_token
 
 from app_utils.testdata_factories import UserMainFactory, EveCharacterFactory, UserFactory
 from app_utils.testing import add_character_to_user, add_new_token, generate_invalid_pk, create_authgroup
@@ -17,6 +21,9 @@ from esi import app_settings
 from allianceauth.eveonline.autogroups.models import AutogroupsConfig
 
 from ..authentication.types import LoginStatus
+from ..authentication.backends import JSONWebTokenBackend, jwt_token_cache_key
+
+from .utils import QueryCountTestMixin
 
 
 MOCK_REGISTRATION_SALT = "testing"
@@ -426,7 +433,7 @@ class TestChangeMainCharacterMutation(GraphQLTestCase):
     def test_ok(self):
         add_character_to_user(self.user1, self.newchar)
 
-        self.client.force_login(self.user1, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user1, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -470,7 +477,7 @@ class TestChangeMainCharacterMutation(GraphQLTestCase):
         )
 
     def test_character_not_added(self):
-        self.client.force_login(self.user1, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user1, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -514,7 +521,7 @@ class TestChangeMainCharacterMutation(GraphQLTestCase):
     def test_character_not_owned(self):
         add_character_to_user(self.user2, self.newchar)
 
-        self.client.force_login(self.user1, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user1, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -568,7 +575,7 @@ class TestAddCharacterMutation(GraphQLTestCase):
     def test_ok(self, mock_create_from_code):
         mock_create_from_code.return_value = add_new_token(self.user, self.newchar)
 
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -615,7 +622,7 @@ class TestRefreshEsiTokenMutation(GraphQLTestCase):
     def test_ok(self, mock_refresh):
         mock_refresh.return_value = None
 
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         newtoken = add_new_token(
             self.user,
@@ -650,7 +657,7 @@ class TestRefreshEsiTokenMutation(GraphQLTestCase):
         self.assertTrue(mock_refresh.called)
 
     def test_token_not_exists(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -678,7 +685,7 @@ class TestRefreshEsiTokenMutation(GraphQLTestCase):
         )
 
     def test_token_not_belongs_to_user(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         newuser = UserFactory()
         newtoken = add_new_token(
@@ -715,7 +722,7 @@ class TestRefreshEsiTokenMutation(GraphQLTestCase):
     def test_exception(self, mock_refresh):
         mock_refresh.side_effect = Exception('Test')
 
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         newtoken = add_new_token(
             self.user,
@@ -758,7 +765,7 @@ class TestRemoveEsiTokenMutation(GraphQLTestCase):
         cls.token = cls.user.token_set.first()
 
     def test_ok(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -790,7 +797,7 @@ class TestRemoveEsiTokenMutation(GraphQLTestCase):
     def test_token_not_belongs_to_user(self):
         user2 = UserFactory()
 
-        self.client.force_login(user2, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(user2, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -820,7 +827,7 @@ class TestRemoveEsiTokenMutation(GraphQLTestCase):
         self.assertEqual(self.user.token_set.count(), 1)
 
     def test_token_not_exists(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -894,6 +901,81 @@ class TestVerifyEmailView(TestCase):
         self.assertFalse(self.user.is_active)
 
 
+class TestJSONWebTokenBackend(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserMainFactory()
+        cls.token = get_token(cls.user)
+
+    def setUp(self):
+        cache.delete(jwt_token_cache_key(self.token))
+        self.request = RequestFactory().post('/graphql/', HTTP_AUTHORIZATION=f'JWT {self.token}')
+        self.backend = JSONWebTokenBackend()
+
+    def test_no_token(self):
+        self.assertIsNone(self.backend.authenticate(RequestFactory().post('/graphql/')))
+
+    def test_invalid_token(self):
+        request = RequestFactory().post('/graphql/', HTTP_AUTHORIZATION='JWT invalid')
+
+        with self.assertRaises(JSONWebTokenError):
+            self.backend.authenticate(request)
+
+    def test_user_hydrated(self):
+        user = self.backend.authenticate(self.request)
+
+        self.assertEqual(user, self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.profile.main_character, self.user.profile.main_character)
+            self.assertEqual(user.profile.state, self.user.profile.state)
+
+    def test_user_pk_cached(self):
+        self.backend.authenticate(self.request)
+
+        with patch('allianceauth_graphql.authentication.backends.get_payload') as mock_get_payload:
+            with self.assertNumQueries(1):
+                user = self.backend.authenticate(self.request)
+                self.assertEqual(user.profile.main_character, self.user.profile.main_character)
+
+        mock_get_payload.assert_not_called()
+        self.assertEqual(cache.get(jwt_token_cache_key(self.token)), self.user.pk)
+
+    def test_configured_handler(self):
+        handler = Mock(return_value=None)
+
+        with patch.object(jwt_settings, 'JWT_GET_USER_BY_NATURAL_KEY_HANDLER', handler):
+            self.assertIsNone(self.backend.authenticate(self.request))
+
+        handler.assert_called_once_with(self.user.username)
+        self.assertIsNone(cache.get(jwt_token_cache_key(self.token)))
+
+    def test_invalidated_on_profile_change(self):
+        self.backend.authenticate(self.request)
+
+        new_main = EveCharacterFactory()
+        add_character_to_user(self.user, new_main)
+        self.user.profile.main_character = new_main
+        self.user.profile.save()
+
+        user = self.backend.authenticate(self.request)
+
+        self.assertEqual(user.profile.main_character, new_main)
+
+    def test_disabled_user(self):
+        self.backend.authenticate(self.request)
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(JSONWebTokenError):
+            self.backend.authenticate(self.request)
+
+        cache.delete(jwt_token_cache_key(self.token))
+
+        with self.assertRaises(JSONWebTokenError):
+            self.backend.authenticate(self.request)
+
+
 class TestQueries(GraphQLTestCase):
 
     @classmethod
@@ -918,7 +1000,7 @@ class TestQueries(GraphQLTestCase):
         self.assertRegex(login_url, rf"{re.escape(app_settings.ESI_OAUTH_LOGIN_URL)}\?response_type=code\&client_id=[0-9a-z]+\&redirect_uri={re.escape(quote_plus(app_settings.ESI_SSO_CALLBACK_URL))}\&scope={re.escape(quote_plus('test1 test2'))}\&state=[0-9a-zA-Z]+")
 
     def test_me(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -943,7 +1025,7 @@ class TestQueries(GraphQLTestCase):
 
     @modify_settings(INSTALLED_APPS={'remove': ['allianceauth.eveonline.autogroups']})
     def test_user_groups(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         group1 = create_authgroup()
         self.user.groups.add(group1)
@@ -972,7 +1054,7 @@ class TestQueries(GraphQLTestCase):
         )
 
     def test_user_groups_exclude_autogroups(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         group1 = create_authgroup()
         self.user.groups.add(group1)
@@ -1008,7 +1090,7 @@ class TestQueries(GraphQLTestCase):
         )
 
     def test_user_characters(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -1032,3 +1114,28 @@ class TestQueries(GraphQLTestCase):
                 }
             }
         )
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserMainFactory()
+
+    def setUp(self):
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
+
+    def test_user_groups(self):
+        self.assertQueryCountConstant(
+            '''
+            query q {
+                authenticationUserGroups {
+                    id
+                    authgroup {
+                        description
+                    }
+                }
+            }
+            ''',
+            lambda n: self.user.groups.add(*[create_authgroup() for _ in range(n)])
+        )
@@ -0,0 +1,408 @@
+import datetime
+import warnings
+from unittest.mock import patch
+from graphene_django.utils.testing import GraphQLTestCase
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from allianceauth.tests.auth_utils import AuthUtils
+from app_utils.testdata_factories import UserMainFactory, EveCorporationInfoFactory
+
+from allianceauth.optimer.models import OpTimer, OpTimerType
+from allianceauth.timerboard.models import Timer, TimerType
+
+from ..calendar.feeds import feed_token, regenerate_feed_token, touch_feeds
+from .utils import QueryCountTestMixin
+
+
+CALENDAR_EVENTS_QUERY = '''
+query($from: DateTime!, $to: DateTime!, $offset: Int, $limit: Int) {
+    calendarEvents(from: $from, to: $to, offset: $offset, limit: $limit) {
+        __typename
+        ... on StructureTimerType {
+            id
+            user {
+                username
+            }
+        }
+        ... on OpTimerModelType {
+            id
+            type {
+                type
+            }
+            eveCharacter {
+                characterName
+            }
+        }
+    }
+}
+'''
+
+
+def window_variables(offset=0, limit=None, naive=False):
+    now = timezone.localtime().replace(tzinfo=None) if naive else timezone.now()
+    return {
+        'from': (now - datetime.timedelta(days=1)).isoformat(),
+        'to': (now + datetime.timedelta(days=1)).isoformat(),
+        'offset': offset,
+        'limit': limit,
+    }
+
+
+class TestQueries(GraphQLTestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permissions_to_user_by_name(
+            ['auth.timer_view', 'auth.optimer_view'],
+            UserMainFactory(),
+            False
+        )
+        cls.corp = cls.user.profile.main_character.corporation
+        corp2 = EveCorporationInfoFactory()
+
+        now = timezone.now()
+
+        cls.timer_1 = Timer.objects.create(
+            timer_type=TimerType.UNSPECIFIED,
+            eve_time=now - datetime.timedelta(hours=3),
+            eve_corp=cls.corp,
+            corp_timer=True,
+        )
+        cls.op_2 = OpTimer.objects.create(start=now - datetime.timedelta(hours=2))
+        cls.timer_3 = Timer.objects.create(
+            timer_type=TimerType.UNSPECIFIED,
+            eve_time=now + datetime.timedelta(hours=1),
+            eve_corp=corp2,
+            corp_timer=False,
+        )
+        cls.op_4 = OpTimer.objects.create(start=now + datetime.timedelta(hours=2))
+
+        # outside the window
+        Timer.objects.create(
+            timer_type=TimerType.UNSPECIFIED,
+            eve_time=now + datetime.timedelta(days=2),
+            eve_corp=cls.corp,
+            corp_timer=False,
+        )
+        OpTimer.objects.create(start=now - datetime.timedelta(days=2))
+
+        # corp timer of another corporation
+        Timer.objects.create(
+            timer_type=TimerType.UNSPECIFIED,
+            eve_time=now,
+            eve_corp=corp2,
+            corp_timer=True,
+        )
+
+    def query_events(self, offset=0, limit=None, naive=False):
+        response = self.query(CALENDAR_EVENTS_QUERY, variables=window_variables(offset, limit, naive))
+        self.assertResponseNoErrors(response)
+        return [
+            (event['__typename'], event['id'])
+            for event in response.json()['data']['calendarEvents']
+        ]
+
+    def test_calendar_events(self):
+        self.client.force_login(self.user)
+
+        self.assertListEqual(
+            self.query_events(),
+            [
+                ('StructureTimerType', str(self.timer_1.pk)),
+                ('OpTimerModelType', str(self.op_2.pk)),
+                ('StructureTimerType', str(self.timer_3.pk)),
+                ('OpTimerModelType', str(self.op_4.pk)),
+            ]
+        )
+
+    def test_calendar_events_page(self):
+        self.client.force_login(self.user)
+
+        self.assertListEqual(
+            self.query_events(offset=1, limit=2),
+            [
+                ('OpTimerModelType', str(self.op_2.pk)),
+                ('StructureTimerType', str(self.timer_3.pk)),
+            ]
+        )
+
+    def test_calendar_events_naive_window(self):
+        self.client.force_login(self.user)
+
+        # a naive datetime in a filter emits a RuntimeWarning
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            events = self.query_events(naive=True)
+
+        self.assertListEqual(
+            events,
+            [
+                ('StructureTimerType', str(self.timer_1.pk)),
+                ('OpTimerModelType', str(self.op_2.pk)),
+                ('StructureTimerType', str(self.timer_3.pk)),
+                ('OpTimerModelType', str(self.op_4.pk)),
+            ]
+        )
+
+    def test_calendar_events_only_optimer(self):
+        user = AuthUtils.add_permission_to_user_by_name('auth.optimer_view', UserMainFactory(), False)
+        self.client.force_login(user)
+
+        self.assertListEqual(
+            self.query_events(),
+            [
+                ('OpTimerModelType', str(self.op_2.pk)),
+                ('OpTimerModelType', str(self.op_4.pk)),
+            ]
+        )
+
+    def test_calendar_events_no_permission(self):
+        self.client.force_login(UserMainFactory())
+
+        response = self.query(CALENDAR_EVENTS_QUERY, variables=window_variables())
+
+        self.assertResponseHasErrors(response)
+
+    def test_calendar_feed_url(self):
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query {
+                calendarFeedUrl
+            }
+            '''
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'calendarFeedUrl': 'http://testserver' + reverse(
+                        'allianceauth_graphql:calendar_feed',
+                        args=[feed_token(self.user)]
+                    )
+                }
+            }
+        )
+
+    def test_regenerate_feed_url(self):
+        self.client.force_login(self.user)
+        old_token = feed_token(self.user)
+
+        response = self.query(
+            '''
+            mutation {
+                calendarRegenerateFeedUrl {
+                    ok
+                    calendarFeedUrl
+                }
+            }
+            '''
+        )
+
+        new_token = feed_token(self.user)
+        self.assertNotEqual(new_token, old_token)
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'calendarRegenerateFeedUrl': {
+                        'ok': True,
+                        'calendarFeedUrl': 'http://testserver' + reverse(
+                            'allianceauth_graphql:calendar_feed',
+                            args=[new_token]
+                        ),
+                    }
+                }
+            }
+        )
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permissions_to_user_by_name(
+            ['auth.timer_view', 'auth.optimer_view'],
+            UserMainFactory(),
+            False
+        )
+        cls.corp = cls.user.profile.main_character.corporation
+        cls.op_type = OpTimerType.objects.create(type='CTA')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_events(self, n):
+        for _ in range(n):
+            Timer.objects.create(
+                timer_type=TimerType.UNSPECIFIED,
+                eve_time=timezone.now(),
+                eve_corp=self.corp,
+                user=UserMainFactory(),
+            )
+            OpTimer.objects.create(
+                start=timezone.now(),
+                type=self.op_type,
+                eve_character=UserMainFactory().profile.main_character,
+            )
+
+    def test_calendar_events(self):
+        self.assertQueryCountConstant(
+            CALENDAR_EVENTS_QUERY,
+            self.create_events,
+            variables=window_variables()
+        )
+
+
+class TestCalendarFeed(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permissions_to_user_by_name(
+            ['auth.timer_view', 'auth.optimer_view'],
+            UserMainFactory(),
+            False
+        )
+        cls.corp = cls.user.profile.main_character.corporation
+
+        cls.timer = Timer.objects.create(
+            timer_type=TimerType.UNSPECIFIED,
+            eve_time=timezone.now() + datetime.timedelta(days=1),
+            system='Jita',
+            structure='Keepstar',
+            objective='Hostile',
+            details='Armor, then hull; bring logi',
+            eve_corp=cls.corp,
+            corp_timer=True,
+        )
+        cls.op = OpTimer.objects.create(
+            start=timezone.now() + datetime.timedelta(days=2),
+            operation_name='Home defense',
+            system='Amarr',
+            doctrine='Muninn',
+            fc='Some FC',
+            duration='2h',
+        )
+        # older than the feed window
+        OpTimer.objects.create(start=timezone.now() - datetime.timedelta(days=30), operation_name='Old op')
+        # corp timer of another corporation
+        Timer.objects.create(
+            timer_type=TimerType.UNSPECIFIED,
+            eve_time=timezone.now() + datetime.timedelta(days=1),
+            eve_corp=EveCorporationInfoFactory(),
+            corp_timer=True,
+        )
+
+    def feed_url(self, user=None):
+        return reverse('allianceauth_graphql:calendar_feed', args=[feed_token(user or self.user)])
+
+    def test_feed(self):
+        response = self.client.get(self.feed_url())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        content = b''.join(response.streaming_content).decode()
+
+        self.assertTrue(content.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(content.endswith('END:VCALENDAR\r\n'))
+        self.assertEqual(content.count('BEGIN:VEVENT'), 2)
+        self.assertIn(f'UID:timer-{self.timer.pk}@testserver\r\n', content)
+        self.assertIn(f'UID:optimer-{self.op.pk}@testserver\r\n', content)
+        self.assertIn('DESCRIPTION:Armor\\, then hull\\; bring logi\r\n', content)
+        self.assertIn('SUMMARY:Home defense\r\n', content)
+        self.assertNotIn('Old op', content)
+
+    def test_feed_lines_folded(self):
+        OpTimer.objects.create(start=timezone.now(), operation_name='Very long operation name ' * 10)
+
+        response = self.client.get(self.feed_url())
+        content = b''.join(response.streaming_content)
+
+        for line in content.split(b'\r\n'):
+            self.assertLessEqual(len(line), 75)
+
+    def test_feed_only_optimer(self):
+        user = AuthUtils.add_permission_to_user_by_name('auth.optimer_view', UserMainFactory(), False)
+
+        response = self.client.get(self.feed_url(user))
+        content = b''.join(response.streaming_content).decode()
+
+        self.assertEqual(content.count('BEGIN:VEVENT'), 1)
+        self.assertIn(f'UID:optimer-{self.op.pk}@testserver\r\n', content)
+
+    def test_feed_no_permission(self):
+        response = self.client.get(self.feed_url(UserMainFactory()))
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_feed_invalid_token(self):
+        response = self.client.get(reverse('allianceauth_graphql:calendar_feed', args=['invalid']))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_feed_regenerated_token(self):
+        old_url = self.feed_url()
+        new_url = reverse('allianceauth_graphql:calendar_feed', args=[regenerate_feed_token(self.user)])
+
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        self.assertEqual(self.client.get(new_url).status_code, 200)
+
+    def test_feed_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.feed_url())
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_feed_not_modified(self):
+        response = self.client.get(self.feed_url())
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.feed_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        for query in ctx.captured_queries:
+            self.assertNotIn('timerboard_timer', query['sql'])
+            self.assertNotIn('optimer_optimer', query['sql'])
+
+        response = self.client.get(self.feed_url(), HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_feed_modified(self):
+        response = self.client.get(self.feed_url())
+        etag = response['ETag']
+
+        cache_value = timezone.now() + datetime.timedelta(seconds=5)
+        with patch('allianceauth_graphql.calendar.feeds.timezone.now', return_value=cache_value):
+            self.op.operation_name = 'Renamed'
+            self.op.save()
+
+        response = self.client.get(self.feed_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('SUMMARY:Renamed\r\n', b''.join(response.streaming_content).decode())
+
+    def test_feed_cache_cleared(self):
+        touch_feeds()
+        response = self.client.get(self.feed_url())
+        etag = response['ETag']
+
+        cache.clear()
+        with patch('allianceauth_graphql.calendar.feeds.timezone.now', return_value=timezone.now() + datetime.timedelta(seconds=5)):
+            response = self.client.get(self.feed_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
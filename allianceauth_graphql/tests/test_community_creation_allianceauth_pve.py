@@ -1,16 +1,26 @@
 import datetime
+from io import StringIO
 from graphene_django.utils.testing import GraphQLTestCase
 
+from django.core.management import call_command
+from django.db import connection
 from django.utils import timezone
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 
 from allianceauth.tests.auth_utils import AuthUtils
 from app_utils.testdata_factories import UserMainFactory, EveCharacterFactory, UserFactory
 from app_utils.testing import add_character_to_user, generate_invalid_pk
 
-from allianceauth_pve.models import Rotation, Entry, EntryCharacter, EntryRole, PveButton
+from allianceauth_pve.actions import running_averages as live_running_averages
+from allianceauth_pve.models import Rotation, Entry, EntryCharacter, EntryRole, PveButton, RoleSetup
 
 from ..community_creations.allianceauth_pve_integration.inputs import EntryInput
+from ..community_creations.allianceauth_pve_integration.summaries import (
+    add_closed_rotations_to_daily_totals, entries_states, is_up_to_date, load_summaries, running_averages, update_summaries,
+)
+from ..models import PveDailyTotal, PveRotationSummary
+from .utils import QueryCountTestMixin
 
 
 class TestQueries(GraphQLTestCase):
@@ -61,6 +71,9 @@ class TestQueries(GraphQLTestCase):
             role=role,
         )
 
+        # the test transaction is never committed, so the receivers don't add the closed rotation
+        add_closed_rotations_to_daily_totals()
+
     def test_pve_get_rotation(self):
         self.client.force_login(self.user)
 
@@ -938,3 +951,468 @@ class TestCloseRotation(GraphQLTestCase):
 
         self.rotation.refresh_from_db()
         self.assertTrue(self.rotation.is_closed)
+
+
+class TestRotationSummary(GraphQLTestCase):
+    maxDiff = None
+
+    ENTRY_MUTATION = '''
+        mutation($input: EntryInput!, $rotationId: Int!) {
+            pveCreateEntry(input: $input, rotationId: $rotationId) {
+                ok
+                entry {
+                    id
+                }
+            }
+        }
+    '''
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permissions_to_user_by_name(
+            [
+                'allianceauth_pve.access_pve',
+                'allianceauth_pve.manage_entries',
+            ],
+            UserMainFactory(),
+            False
+        )
+        cls.user2 = AuthUtils.add_permission_to_user_by_name('allianceauth_pve.access_pve', UserMainFactory(), False)
+
+        cls.rotation: Rotation = Rotation.objects.create(name='Rotation', tax_rate=10, actual_total=500)
+
+        entry = Entry.objects.create(rotation=cls.rotation, estimated_total=300, created_by=cls.user)
+        role = EntryRole.objects.create(entry=entry, name='Role', value=1)
+        EntryCharacter.objects.create(entry=entry, user=cls.user, user_character=cls.user.profile.main_character, role=role)
+
+        cls.input_data = {
+            'estimatedTotal': 1000,
+            'roles': [
+                {
+                    'name': 'Krab',
+                    'value': 2,
+                },
+                {
+                    'name': 'Salvager',
+                    'value': 1,
+                },
+            ],
+            'shares': [
+                {
+                    'characterId': cls.user.profile.main_character.pk,
+                    'userId': cls.user.pk,
+                    'siteCount': 2,
+                    'role': 'Krab',
+                },
+                {
+                    'characterId': cls.user2.profile.main_character.pk,
+                    'userId': cls.user2.pk,
+                    'siteCount': 1,
+                    'role': 'Salvager',
+                },
+            ]
+        }
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        update_summaries([self.rotation.pk])
+
+    def assertSummaryUpToDate(self):
+        summary = PveRotationSummary.objects.get(rotation_id=self.rotation.pk)
+        self.assertTrue(is_up_to_date(summary, entries_states([self.rotation.pk])[self.rotation.pk]))
+
+        self.rotation.refresh_from_db()
+        stored = load_summaries([self.rotation])[self.rotation.pk]
+        live = list(self.rotation.summary.order_by('-estimated_total', 'user'))
+
+        self.assertEqual(len(stored), len(live))
+        for stored_row, live_row in zip(stored, live):
+            self.assertEqual(stored_row['user'], live_row['user'])
+            self.assertEqual(stored_row['helped_setups'], live_row['helped_setups'])
+            self.assertAlmostEqual(stored_row['estimated_total'], live_row['estimated_total'])
+            self.assertAlmostEqual(stored_row['actual_total'], live_row['actual_total'])
+
+    def create_entry(self):
+        response = self.query(self.ENTRY_MUTATION, variables={'input': self.input_data, 'rotationId': self.rotation.pk})
+        self.assertResponseNoErrors(response)
+        return response.json()['data']['pveCreateEntry']['entry']['id']
+
+    def test_create_entry(self):
+        self.create_entry()
+
+        self.assertSummaryUpToDate()
+
+    def test_modify_entry(self):
+        entry_id = self.create_entry()
+        input_data = {
+            **self.input_data,
+            'shares': [
+                {
+                    'characterId': self.user2.profile.main_character.pk,
+                    'userId': self.user2.pk,
+                    'siteCount': 3,
+                    'role': 'Krab',
+                },
+            ]
+        }
+
+        response = self.query(
+            '''
+            mutation($input: EntryInput!, $entryId: Int!) {
+                pveModifyEntry(input: $input, entryId: $entryId) {
+                    ok
+                }
+            }
+            ''',
+            variables={'input': input_data, 'entryId': int(entry_id)}
+        )
+        self.assertResponseNoErrors(response)
+
+        self.assertSummaryUpToDate()
+
+    def test_delete_entry(self):
+        entry_id = self.create_entry()
+
+        response = self.query(
+            '''
+            mutation($entryId: Int!) {
+                pveDeleteEntry(entryId: $entryId) {
+                    ok
+                }
+            }
+            ''',
+            variables={'entryId': int(entry_id)}
+        )
+        self.assertResponseNoErrors(response)
+
+        self.assertSummaryUpToDate()
+        self.assertListEqual(
+            [row['user'] for row in load_summaries([self.rotation])[self.rotation.pk]],
+            [self.user.pk]
+        )
+
+    def test_computed_when_out_of_date(self):
+        Entry.objects.filter(rotation=self.rotation).delete()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.query(
+                '''
+                query($id: Int!) {
+                    pveGetRotation(id: $id) {
+                        summary {
+                            estimatedTotal
+                        }
+                    }
+                }
+                ''',
+                variables={'id': self.rotation.pk}
+            )
+
+        self.assertJSONEqual(response.content, {'data': {'pveGetRotation': {'summary': []}}})
+        for query in ctx.captured_queries:
+            self.assertFalse(query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE')))
+        self.assertEqual(PveRotationSummary.objects.get(rotation_id=self.rotation.pk).users.count(), 1)
+
+    def test_updated_on_entry_change(self):
+        entry = Entry.objects.get(rotation=self.rotation)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            entry.ratting_shares.update(site_count=3)
+            entry.save()
+
+        self.assertSummaryUpToDate()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            entry.delete()
+
+        self.assertSummaryUpToDate()
+        self.assertFalse(PveRotationSummary.objects.get(rotation_id=self.rotation.pk).users.exists())
+
+    def test_deleted_with_rotation(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rotation.delete()
+
+        self.assertFalse(PveRotationSummary.objects.filter(rotation_id=self.rotation.pk).exists())
+
+    def test_backfill_command(self):
+        PveRotationSummary.objects.all().delete()
+
+        call_command('graphql_pve_backfill', stdout=StringIO())
+
+        self.assertSummaryUpToDate()
+
+
+class TestRunningAverages(GraphQLTestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permissions_to_user_by_name(
+            [
+                'allianceauth_pve.access_pve',
+                'allianceauth_pve.manage_rotations',
+            ],
+            UserMainFactory(),
+            False
+        )
+        cls.user2 = UserMainFactory()
+
+        cls.rotation_1 = cls.create_rotation(datetime.datetime(2024, 3, 10, 12, tzinfo=datetime.timezone.utc), 800)
+        cls.rotation_2 = cls.create_rotation(datetime.datetime(2024, 3, 20, 18, tzinfo=datetime.timezone.utc), 0)
+        cls.rotation_3 = cls.create_rotation(datetime.datetime(2024, 3, 20, 6, tzinfo=datetime.timezone.utc), 1500)
+        cls.open_rotation = cls.create_rotation(None, 0)
+
+    @classmethod
+    def create_rotation(cls, closed_at, actual_total):
+        rotation = Rotation.objects.create(
+            name='Rotation',
+            tax_rate=10,
+            actual_total=actual_total,
+            is_closed=closed_at is not None,
+            closed_at=closed_at,
+        )
+        entry = Entry.objects.create(rotation=rotation, estimated_total=1000, created_by=cls.user)
+        role = EntryRole.objects.create(entry=entry, name='Role', value=1)
+        EntryCharacter.objects.create(entry=entry, user=cls.user, user_character=cls.user.profile.main_character, role=role, site_count=2)
+        EntryCharacter.objects.create(entry=entry, user=cls.user2, user_character=cls.user2.profile.main_character, role=role)
+        return rotation
+
+    def setUp(self):
+        # the test transaction is never committed, so the receivers don't add the closed rotations
+        add_closed_rotations_to_daily_totals()
+
+    def assertSameAverages(self, start_date, end_date=None):
+        expected = live_running_averages(self.user, start_date, end_date)
+        result = running_averages(self.user, start_date, end_date)
+
+        self.assertEqual(result.keys(), expected.keys())
+        for key, value in expected.items():
+            self.assertAlmostEqual(result[key], value)
+
+    def test_same_as_live(self):
+        self.assertSameAverages(datetime.date(2024, 1, 1))
+        self.assertSameAverages(datetime.date(2024, 3, 11))
+        self.assertSameAverages(datetime.date(2024, 3, 1), datetime.date(2024, 3, 15))
+        self.assertSameAverages(datetime.date(2024, 3, 1), datetime.date(2024, 3, 21))
+        self.assertSameAverages(datetime.date(2024, 4, 1))
+
+    def test_query_reads_daily_totals(self):
+        self.client.force_login(self.user)
+        query = '''
+            query($startDate: Date!) {
+                pveCharRunningAverages(startDate: $startDate) {
+                    estimatedTotal
+                }
+            }
+        '''
+
+        response = self.query(query, variables={'startDate': '2024-03-15'})
+        self.assertResponseNoErrors(response)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.query(query, variables={'startDate': '2024-03-15'})
+
+        self.assertJSONEqual(response.content, {'data': {'pveCharRunningAverages': {'estimatedTotal': 1200.0}}})
+        for query in ctx.captured_queries:
+            self.assertNotIn('allianceauth_pve_entrycharacter', query['sql'])
+
+    def test_close_rotation(self):
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            mutation($input: RotationCloseInput!) {
+                pveCloseRotation(input: $input) {
+                    ok
+                }
+            }
+            ''',
+            variables={'input': {'rotationId': self.open_rotation.pk, 'salesValue': 900}}
+        )
+        self.assertResponseNoErrors(response)
+
+        self.assertTrue(PveRotationSummary.objects.get(rotation_id=self.open_rotation.pk).added_to_daily_totals)
+        self.assertTrue(PveDailyTotal.objects.filter(user=self.user, day=timezone.localdate()).exists())
+        self.assertSameAverages(datetime.date(2024, 1, 1))
+
+    def test_rotation_closed_outside_mutations(self):
+        self.open_rotation.is_closed = True
+        self.open_rotation.closed_at = timezone.now()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.open_rotation.save()
+
+        self.assertTrue(PveRotationSummary.objects.get(rotation_id=self.open_rotation.pk).added_to_daily_totals)
+        self.assertSameAverages(datetime.date(2024, 1, 1))
+
+    def test_end_date_included(self):
+        result = running_averages(self.user, datetime.date(2024, 3, 1), datetime.date(2024, 3, 20))
+        expected = live_running_averages(self.user, datetime.date(2024, 3, 1), datetime.date(2024, 3, 21))
+
+        self.assertAlmostEqual(result['estimated_total'], expected['estimated_total'])
+        self.assertAlmostEqual(result['actual_total'], expected['actual_total'])
+
+    def test_rotations_missing_from_daily_totals(self):
+        PveDailyTotal.objects.all().delete()
+        PveRotationSummary.objects.update(added_to_daily_totals=False)
+
+        self.assertSameAverages(datetime.date(2024, 1, 1))
+        self.assertSameAverages(datetime.date(2024, 3, 1), datetime.date(2024, 3, 15))
+        self.assertFalse(PveDailyTotal.objects.exists())
+
+        call_command('graphql_pve_backfill', stdout=StringIO())
+
+        self.assertSameAverages(datetime.date(2024, 1, 1))
+        self.assertTrue(PveDailyTotal.objects.exists())
+
+    def test_delete_rotation(self):
+        self.rotation_3.delete()
+
+        self.assertSameAverages(datetime.date(2024, 1, 1))
+        self.assertSameAverages(datetime.date(2024, 3, 15))
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permissions_to_user_by_name(
+            [
+                'allianceauth_pve.access_pve',
+                'allianceauth_pve.manage_rotations',
+            ],
+            UserMainFactory(),
+            False
+        )
+        cls.button = PveButton.objects.create(text='Button', amount=100)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_rotations(self, n, is_closed=False):
+        for _ in range(n):
+            rotation = Rotation.objects.create(
+                name='Rotation',
+                is_closed=is_closed,
+                closed_at=timezone.now() if is_closed else None,
+            )
+            rotation.entry_buttons.add(self.button)
+            rotation.roles_setups.add(RoleSetup.objects.create(name=f'Setup {RoleSetup.objects.count()}'))
+
+            user = UserMainFactory()
+            entry = Entry.objects.create(rotation=rotation, estimated_total=100, created_by=user)
+            role = EntryRole.objects.create(entry=entry, name='Role', value=1)
+            EntryCharacter.objects.create(entry=entry, user=user, user_character=user.profile.main_character, role=role)
+
+    def test_pve_active_rotations(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                pveActiveRotations {
+                    id
+                    entries {
+                        id
+                    }
+                    entryButtons {
+                        text
+                    }
+                    rolesSetups {
+                        name
+                    }
+                }
+            }
+            ''',
+            self.create_rotations
+        )
+
+    def test_pve_closed_rotations(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                pveClosedRotations {
+                    id
+                    entries {
+                        id
+                    }
+                    entryButtons {
+                        text
+                    }
+                    rolesSetups {
+                        name
+                    }
+                }
+            }
+            ''',
+            lambda n: self.create_rotations(n, is_closed=True)
+        )
+
+    def test_pve_closed_rotations_summary(self):
+        def create_rotations(n):
+            self.create_rotations(n, is_closed=True)
+            update_summaries(Rotation.objects.values_list('pk', flat=True))
+
+        self.assertQueryCountConstant(
+            '''
+            query {
+                pveClosedRotations {
+                    id
+                    summary {
+                        mainCharacter {
+                            characterName
+                        }
+                        estimatedTotal
+                        actualTotal
+                        helpedSetups
+                    }
+                }
+            }
+            ''',
+            create_rotations
+        )
+
+    def test_pve_rotation_summary(self):
+        rotation = Rotation.objects.create(name='Rotation')
+
+        def create_shares(n):
+            for _ in range(n):
+                user = UserMainFactory()
+                entry = Entry.objects.create(rotation=rotation, estimated_total=100, created_by=user)
+                role = EntryRole.objects.create(entry=entry, name='Role', value=1)
+                EntryCharacter.objects.create(entry=entry, user=user, user_character=user.profile.main_character, role=role)
+
+        self.assertQueryCountConstant(
+            '''
+            query($id: Int!) {
+                pveGetRotation(id: $id) {
+                    summary {
+                        mainCharacter {
+                            characterName
+                        }
+                        estimatedTotal
+                    }
+                }
+            }
+            ''',
+            create_shares,
+            variables={'id': rotation.pk}
+        )
+
+    def test_pve_roles_setups(self):
+        def create_setups(n):
+            for _ in range(n):
+                setup = RoleSetup.objects.create(name=f'Setup {RoleSetup.objects.count()}')
+                setup.roles.create(name='Role', value=1)
+
+        self.assertQueryCountConstant(
+            '''
+            query {
+                pveRolesSetups {
+                    name
+                    roles {
+                        name
+                    }
+                }
+            }
+            ''',
+            create_setups
+        )
@@ -10,6 +10,8 @@ from app_utils.esi_testing import EsiClientStub, EsiEndpoint
 
 from allianceauth.corputils.models import CorpStats, CorpMember
 
+from .utils import QueryCountTestMixin
+
 
 class TestQueriesAndTypes(GraphQLTestCase):
     maxDiff = None
@@ -59,7 +61,7 @@ class TestQueriesAndTypes(GraphQLTestCase):
         )
 
     def test_get_corpstats(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -89,7 +91,7 @@ class TestQueriesAndTypes(GraphQLTestCase):
         )
 
     def test_get_corpstats_corp_ok(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -118,7 +120,7 @@ class TestQueriesAndTypes(GraphQLTestCase):
         )
 
     def test_get_corpstats_corp_not_ok(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -143,7 +145,7 @@ class TestQueriesAndTypes(GraphQLTestCase):
         )
 
     def test_search_corpstats(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -170,7 +172,7 @@ class TestQueriesAndTypes(GraphQLTestCase):
         )
 
     def test_character_field_ok(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -203,7 +205,7 @@ class TestQueriesAndTypes(GraphQLTestCase):
         )
 
     def test_character_field_not_ok(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         max_char_id = CorpMember.objects.aggregate(m=Max('character_id'))['m']
 
@@ -242,7 +244,7 @@ class TestQueriesAndTypes(GraphQLTestCase):
         )
 
     def test_registered_type(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -274,7 +276,7 @@ class TestQueriesAndTypes(GraphQLTestCase):
         )
 
     def test_unregistered_type(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -308,7 +310,7 @@ class TestQueriesAndTypes(GraphQLTestCase):
         )
 
     def test_mains_type(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -359,7 +361,7 @@ class TestMutations(GraphQLTestCase):
     def test_add_corp_stats_mutation_ok(self, mock_update):
         mock_update.return_value = None
 
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -388,7 +390,7 @@ class TestMutations(GraphQLTestCase):
     def test_add_corp_stats_mutation_wrong_user(self):
         user2 = UserMainFactory()
 
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -429,7 +431,7 @@ class TestMutations(GraphQLTestCase):
             False
         )
 
-        self.client.force_login(user2, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(user2, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -479,7 +481,7 @@ class TestMutations(GraphQLTestCase):
 
         mock_esi_client.return_value = EsiClientStub.create_from_endpoints([mock_endpoint])
 
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         self.user.profile.main_character.delete()
 
@@ -532,7 +534,7 @@ class TestMutations(GraphQLTestCase):
 
         corp.delete()
 
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -562,7 +564,7 @@ class TestMutations(GraphQLTestCase):
     def test_update_corpstats_ok(self, mock_update):
         mock_update.return_value = None
 
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         corp = self.user.profile.main_character.corporation
 
@@ -594,3 +596,60 @@ class TestMutations(GraphQLTestCase):
         )
 
         self.assertTrue(mock_update.called)
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('corputils.view_corp_corpstats', UserMainFactory(), False)
+        cls.user.is_superuser = True
+        cls.user.save()
+
+    def setUp(self):
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
+
+    def create_corpstats(self, n):
+        for _ in range(n):
+            user = UserMainFactory()
+            corpstats = CorpStats.objects.create(
+                token=user.token_set.first(),
+                corp=user.profile.main_character.corporation
+            )
+            CorpMember.objects.create(
+                character_id=user.profile.main_character.character_id,
+                character_name=user.profile.main_character.character_name,
+                corpstats=corpstats
+            )
+
+    def test_get_all_corpstats(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                corputilsGetAllCorpstats {
+                    corp {
+                        corporationName
+                    }
+                    members {
+                        characterName
+                    }
+                }
+            }
+            ''',
+            self.create_corpstats
+        )
+
+    def test_search_corpstats(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                corputilsSearchCorpstats(searchString: "") {
+                    characterName
+                    corpstats {
+                        lastUpdate
+                    }
+                }
+            }
+            ''',
+            self.create_corpstats
+        )
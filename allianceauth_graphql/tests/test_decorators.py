@@ -0,0 +1,118 @@
+from unittest.mock import Mock
+
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory
+
+from allianceauth.tests.test_auth_utils import AuthUtils
+from app_utils.testdata_factories import UserMainFactory
+
+from ..decorators import RequestPermissionCache, get_permission_cache, get_valid_token_pks, tokens_cache_key
+
+
+class TestRequestPermissionCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('auth.timer_view', UserMainFactory(), False)
+        cls.user2 = UserMainFactory()
+
+        AuthUtils.add_permissions_to_groups(
+            [AuthUtils.get_permission_by_name('auth.optimer_view')],
+            [cls.user.groups.create(name='Test group')]
+        )
+        AuthUtils.add_permissions_to_state(
+            [AuthUtils.get_permission_by_name('auth.srp_management')],
+            [cls.user.profile.state]
+        )
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+
+    def test_loads_user_group_and_state_perms(self):
+        cache = RequestPermissionCache(self.user)
+
+        self.assertTrue(cache.has_perm('auth.timer_view'))
+        self.assertTrue(cache.has_perm('auth.optimer_view'))
+        self.assertTrue(cache.has_perm('auth.srp_management'))
+        self.assertFalse(cache.has_perm('auth.timer_management'))
+
+    def test_perm_checks_without_queries(self):
+        cache = RequestPermissionCache(self.user)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(cache.has_perms(('auth.timer_view', 'auth.optimer_view')))
+            self.assertFalse(cache.has_perms(('auth.timer_view', 'auth.timer_management')))
+            self.assertTrue(cache.has_any_perm(('auth.timer_management', 'auth.srp_management')))
+
+        self.assertEqual(cache.checks_avoided, 6)
+
+    def test_checks_avoided_short_circuit(self):
+        cache = RequestPermissionCache(self.user)
+
+        self.assertFalse(cache.has_perms(('auth.timer_management', 'auth.timer_view')))
+        self.assertTrue(cache.has_any_perm(('auth.timer_view', 'auth.timer_management')))
+
+        self.assertEqual(cache.checks_avoided, 2)
+
+    def test_superuser(self):
+        superuser = AuthUtils.create_user('superuser')
+        superuser.is_superuser = True
+        superuser.save()
+
+        cache = RequestPermissionCache(superuser)
+
+        self.assertTrue(cache.has_perm('auth.timer_management'))
+
+    def test_test_func_evaluated_once(self):
+        test_func = Mock(return_value=True)
+        cache = RequestPermissionCache(self.user)
+
+        self.assertTrue(cache.passes_test(test_func))
+        self.assertTrue(cache.passes_test(test_func))
+        self.assertTrue(cache.passes_test(test_func))
+
+        test_func.assert_called_once_with(self.user)
+        self.assertEqual(cache.checks_avoided, 2)
+
+    def test_get_permission_cache_same_request(self):
+        cache = get_permission_cache(self.request)
+
+        self.assertIs(get_permission_cache(self.request), cache)
+
+    def test_get_permission_cache_user_changed(self):
+        cache = get_permission_cache(self.request)
+        self.request.user = self.user2
+
+        new_cache = get_permission_cache(self.request)
+
+        self.assertIsNot(new_cache, cache)
+        self.assertFalse(new_cache.has_perm('auth.timer_view'))
+
+
+class TestValidTokensCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.scopes = ['esi-location.read_location.v1', 'esi-location.read_online.v1']
+        cls.user = UserMainFactory(main_character__scopes=cls.scopes)
+        cls.token = cls.user.token_set.first()
+
+    def setUp(self):
+        cache.delete(tokens_cache_key(self.user.pk))
+
+    def test_valid_tokens(self):
+        self.assertListEqual(get_valid_token_pks(self.user, self.scopes), [self.token.pk])
+        self.assertListEqual(get_valid_token_pks(self.user, 'esi-location.read_location.v1'), [self.token.pk])
+        self.assertListEqual(get_valid_token_pks(self.user, 'esi-universe.read_structures.v1'), [])
+
+    def test_cached(self):
+        get_valid_token_pks(self.user, self.scopes)
+
+        with self.assertNumQueries(0):
+            self.assertListEqual(get_valid_token_pks(self.user, list(reversed(self.scopes))), [self.token.pk])
+
+    def test_invalidated_on_token_delete(self):
+        get_valid_token_pks(self.user, self.scopes)
+
+        self.token.delete()
+
+        self.assertListEqual(get_valid_token_pks(self.user, self.scopes), [])
@@ -1,6 +1,9 @@
 from graphene_django.utils.testing import GraphQLTestCase
 
 from app_utils.testdata_factories import UserMainFactory
+from app_utils.testing import add_new_token
+
+from .utils import QueryCountTestMixin
 
 
 class TestAll(GraphQLTestCase):
@@ -10,7 +13,7 @@ class TestAll(GraphQLTestCase):
         cls.user = UserMainFactory()
 
     def test_user_tokens(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -44,3 +47,33 @@ class TestAll(GraphQLTestCase):
                 }
             }
         )
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserMainFactory()
+
+    def test_user_tokens(self):
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
+
+        self.assertQueryCountConstant(
+            '''
+            query q {
+                esiUserTokens {
+                    id
+                    user {
+                        username
+                    }
+                    scopes {
+                        name
+                    }
+                }
+            }
+            ''',
+            lambda n: [
+                add_new_token(self.user, self.user.profile.main_character, ['esi-location.read_location.v1'])
+                for _ in range(n)
+            ]
+        )
@@ -10,7 +10,7 @@ class TestTypes(GraphQLTestCase):
         cls.user = UserMainFactory()
 
     def test_zkill_link(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -15,6 +15,8 @@ from allianceauth.fleetactivitytracking.models import Fatlink, Fat
 from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
 from esi.models import Token
 
+from .utils import QueryCountTestMixin
+
 
 class TestQueries(GraphQLTestCase):
     maxDiff = None
@@ -895,3 +897,72 @@ class TestOtherMutations(GraphQLTestCase):
         )
 
         self.assertEqual(Fatlink.objects.count(), 0)
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('auth.fleetactivitytracking', UserMainFactory(), False)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_fats(self, n):
+        for _ in range(n):
+            fatlink = Fatlink.objects.create(
+                creator=self.user,
+                fatdatetime=timezone.now(),
+                fleet='Test Fatlink',
+                hash=f'testhash{Fatlink.objects.count()}',
+                duration=60,
+            )
+            Fat.objects.create(
+                character=self.user.profile.main_character,
+                fatlink=fatlink,
+                shiptype='Test Ship',
+                system='Test System',
+                station='Test Station',
+                user=self.user,
+            )
+
+    def test_recent_fats(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                fatRecentFat(num: 10) {
+                    id
+                    character {
+                        characterName
+                    }
+                    fatlink {
+                        fleet
+                    }
+                    user {
+                        username
+                    }
+                }
+            }
+            ''',
+            self.create_fats
+        )
+
+    def test_fatlinks(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                fatGetFatlinks(num: 10) {
+                    id
+                    creator {
+                        username
+                        profile {
+                            mainCharacter {
+                                characterName
+                            }
+                        }
+                    }
+                }
+            }
+            ''',
+            self.create_fats
+        )
@@ -1,3 +1,5 @@
+import datetime
+
 from graphene_django.utils.testing import GraphQLTestCase
 from unittest.mock import patch
 
@@ -5,13 +7,16 @@ from django.contrib.auth.models import Group
 from django.test import override_settings
 
 from allianceauth.tests.test_auth_utils import AuthUtils
-from app_utils.testdata_factories import UserFactory
-from app_utils.testing import generate_invalid_pk
+from app_utils.testdata_factories import UserFactory, UserMainFactory
+from app_utils.testing import generate_invalid_pk, create_authgroup
 
 from allianceauth.groupmanagement.models import GroupRequest, RequestLog
+from allianceauth.notifications.models import Notification
 
+from ..groupmanagement.mutations import max_notifications_per_user
 from ..groupmanagement.types import GroupRequestLogType, GroupRequestLogActionType, GroupRequestAddStatus, GroupRequestLeaveStatus
 from ..authentication.types import GroupStatusEnum
+from .utils import QueryCountTestMixin
 
 
 class TestQueries(GraphQLTestCase):
@@ -227,6 +232,91 @@ class TestQueries(GraphQLTestCase):
         self.assertIn('acceptRequests', res['data']['groupmanagementManageRequests'])
         self.assertEqual(res['data']['groupmanagementManageRequests']['acceptRequests'], [])
 
+    def test_group_management_paginated_and_counts(self):
+        GroupRequest.objects.create(
+            user=self.user2,
+            group=self.group1,
+            leave_request=False,
+        )
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query {
+                groupmanagementManageRequests {
+                    leaveRequests(limit: 1) {
+                        user {
+                            id
+                        }
+                    }
+                    acceptRequests(offset: 1, limit: 1) {
+                        user {
+                            id
+                        }
+                    }
+                    groupCounts {
+                        group {
+                            id
+                        }
+                        acceptRequests
+                        leaveRequests
+                    }
+                    pendingLeaves: groupCounts {
+                        leaveRequests
+                    }
+                }
+            }
+            '''
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementManageRequests": {
+                        "leaveRequests": [
+                            {
+                                "user": {
+                                    "id": str(self.user3.id),
+                                }
+                            }
+                        ],
+                        "acceptRequests": [
+                            {
+                                "user": {
+                                    "id": str(self.user2.id),
+                                }
+                            }
+                        ],
+                        "groupCounts": [
+                            {
+                                "group": {
+                                    "id": str(self.group1.id),
+                                },
+                                "acceptRequests": 2,
+                                "leaveRequests": 0,
+                            },
+                            {
+                                "group": {
+                                    "id": str(self.group2.id),
+                                },
+                                "acceptRequests": 0,
+                                "leaveRequests": 1,
+                            },
+                        ],
+                        "pendingLeaves": [
+                            {
+                                "leaveRequests": 0,
+                            },
+                            {
+                                "leaveRequests": 1,
+                            },
+                        ]
+                    }
+                }
+            }
+        )
+
     def test_group_membership_has_perms(self):
         self.client.force_login(self.user)
 
@@ -331,6 +421,96 @@ class TestQueries(GraphQLTestCase):
             ]
         )
 
+    def test_group_membership_list_paginated(self):
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query($groupId: Int!) {
+                groupmanagementGroupMemberships(groupId: $groupId, offset: 1, limit: 1) {
+                    group {
+                        numMembers
+                    }
+                    members {
+                        user {
+                            id
+                        }
+                        isLeader
+                    }
+                }
+            }
+            ''',
+            variables={
+                "groupId": self.group2.id,
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementGroupMemberships": {
+                        "group": {
+                            "numMembers": 2
+                        },
+                        "members": [
+                            {
+                                "user": {
+                                    "id": str(self.user3.id),
+                                },
+                                "isLeader": False,
+                            }
+                        ]
+                    }
+                }
+            }
+        )
+
+    def test_group_membership_list_aliased(self):
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query($groupId: Int!) {
+                groupmanagementGroupMemberships(groupId: $groupId, limit: 1) {
+                    members {
+                        isLeader
+                    }
+                    users: members {
+                        user {
+                            id
+                        }
+                    }
+                }
+            }
+            ''',
+            variables={
+                "groupId": self.group2.id,
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementGroupMemberships": {
+                        "members": [
+                            {
+                                "isLeader": True,
+                            }
+                        ],
+                        "users": [
+                            {
+                                "user": {
+                                    "id": str(self.user2.id),
+                                },
+                            }
+                        ]
+                    }
+                }
+            }
+        )
+
     def test_group_membership_list_permission_denied(self):
         self.client.force_login(self.user2)
 
@@ -485,6 +665,49 @@ class TestQueries(GraphQLTestCase):
             ]
         )
 
+    def test_group_membership_audit_paginated(self):
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query($groupId: Int!) {
+                groupmanagementGroupMembershipAudit(groupId: $groupId, offset: 1, limit: 1) {
+                    entries {
+                        id
+                        requestType
+                        action
+                        requestor {
+                            id
+                        }
+                    }
+                }
+            }
+            ''',
+            variables={
+                "groupId": self.group1.id,
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementGroupMembershipAudit": {
+                        "entries": [
+                            {
+                                "id": str(self.log2.id),
+                                "requestType": GroupRequestLogType.LEAVE.name,
+                                "action": GroupRequestLogActionType.ACCEPT.name,
+                                "requestor": {
+                                    "id": str(self.user2.id),
+                                }
+                            }
+                        ]
+                    }
+                }
+            }
+        )
+
     def test_group_membership_audit_permission_denied(self):
         self.client.force_login(self.user2)
 
@@ -1183,6 +1406,143 @@ class TestGroupMembershipRemove(GraphQLTestCase):
         )
 
 
+class TestGroupMembershipBulkRemove(GraphQLTestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+        cls.group = create_authgroup(internal=False, open=False, hidden=False, public=True)
+        cls.group.authgroup.group_leaders.add(cls.user)
+
+        cls.alliance_member = UserMainFactory()
+        cls.other_member = UserMainFactory()
+        cls.no_main_member = UserFactory()
+
+        cls.alliance_member.profile.main_character.alliance_id = 1001
+        cls.alliance_member.profile.main_character.save()
+        cls.other_member.profile.main_character.alliance_id = 1002
+        cls.other_member.profile.main_character.save()
+
+        for member in (cls.alliance_member, cls.other_member, cls.no_main_member):
+            member.groups.add(cls.group)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def mutate(self, **variables):
+        return self.query(
+            '''
+            mutation($groupId: Int!, $userIds: [Int!], $mainNotInAllianceId: Int) {
+                groupmanagementRemoveMembers(groupId: $groupId, userIds: $userIds, mainNotInAllianceId: $mainNotInAllianceId) {
+                    ok
+                    error
+                    removed
+                }
+            }
+            ''',
+            variables={
+                "groupId": self.group.id,
+                **variables,
+            }
+        )
+
+    def test_user_ids(self):
+        response = self.mutate(userIds=[self.alliance_member.id, self.other_member.id, self.user.id])
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementRemoveMembers": {
+                        "ok": True,
+                        "error": None,
+                        "removed": [self.alliance_member.id, self.other_member.id],
+                    }
+                }
+            }
+        )
+
+        self.assertCountEqual(self.group.user_set.all(), [self.no_main_member])
+        self.assertEqual(RequestLog.objects.filter(group=self.group, request_type=None).count(), 2)
+
+    def test_main_not_in_alliance(self):
+        response = self.mutate(mainNotInAllianceId=1001)
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementRemoveMembers": {
+                        "ok": True,
+                        "error": None,
+                        "removed": [self.other_member.id, self.no_main_member.id],
+                    }
+                }
+            }
+        )
+
+        self.assertCountEqual(self.group.user_set.all(), [self.alliance_member])
+        self.assertEqual(RequestLog.objects.count(), 2)
+
+    def test_no_filter(self):
+        response = self.mutate()
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementRemoveMembers": {
+                        "ok": False,
+                        "error": "A list of users or a filter is required",
+                        "removed": [],
+                    }
+                }
+            }
+        )
+
+        self.assertEqual(self.group.user_set.count(), 3)
+
+    def test_cannot_manage(self):
+        self.client.force_login(self.alliance_member)
+        create_authgroup(internal=False).authgroup.group_leaders.add(self.alliance_member)
+
+        response = self.mutate(userIds=[self.other_member.id])
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementRemoveMembers": {
+                        "ok": False,
+                        "error": "Permission denied",
+                        "removed": [],
+                    }
+                }
+            }
+        )
+
+        self.assertEqual(self.group.user_set.count(), 3)
+        self.assertEqual(RequestLog.objects.count(), 0)
+
+    def test_group_not_exists(self):
+        response = self.mutate(userIds=[self.other_member.id], groupId=generate_invalid_pk(Group))
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementRemoveMembers": {
+                        "ok": False,
+                        "error": "Group does not exist",
+                        "removed": [],
+                    }
+                }
+            }
+        )
+
+
 class TestGroupMembershipAcceptAndRejectRequestMutations(GraphQLTestCase):
     maxDiff = None
 
@@ -1781,3 +2141,339 @@ class TestGroupLeaveAcceptAndRejectRequestMutation(GraphQLTestCase):
         # self.assertIn(self.group, self.user2.groups.all())
         # self.assertEqual(RequestLog.objects.count(), 0)
         # self.assertEqual(GroupRequest.objects.count(), 1)
+
+
+class TestGroupRequestsBulkMutations(QueryCountTestMixin, GraphQLTestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+        cls.group = create_authgroup(internal=False, open=False, hidden=False, public=True)
+        cls.group.authgroup.group_leaders.add(cls.user)
+
+        cls.other_group = create_authgroup(internal=False, open=False, hidden=False, public=True)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_requests(self, n, leave_request, group=None):
+        group = group or self.group
+        requests = []
+        for _ in range(n):
+            user = UserFactory()
+            if leave_request:
+                user.groups.add(group)
+            requests.append(GroupRequest.objects.create(group=group, user=user, leave_request=leave_request))
+        return requests
+
+    def mutate(self, name, group_request_ids):
+        return self.query(
+            '''
+            mutation($groupRequestIds: [Int!]!) {
+                %s(groupRequestIds: $groupRequestIds) {
+                    ok
+                    processed
+                    errors
+                }
+            }
+            ''' % name,
+            variables={
+                "groupRequestIds": group_request_ids,
+            }
+        )
+
+    def test_accept_join_ok(self):
+        requests = self.create_requests(3, False)
+        invalid_pk = generate_invalid_pk(GroupRequest)
+
+        response = self.mutate('groupmanagementAcceptJoinRequests', [r.pk for r in requests] + [invalid_pk])
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementAcceptJoinRequests": {
+                        "ok": False,
+                        "processed": [r.pk for r in requests],
+                        "errors": [f"Group request {invalid_pk} doesn't exist"],
+                    }
+                }
+            }
+        )
+
+        self.assertEqual(self.group.user_set.count(), 3)
+        self.assertEqual(RequestLog.objects.filter(group=self.group, request_type=False, action=True).count(), 3)
+        self.assertEqual(Notification.objects.filter(title="Group Application Accepted").count(), 3)
+        self.assertFalse(GroupRequest.objects.exists())
+
+    def test_accept_join_queries_constant(self):
+        queries = self.count_queries(
+            '''
+            mutation($groupRequestIds: [Int!]!) {
+                groupmanagementAcceptJoinRequests(groupRequestIds: $groupRequestIds) {
+                    ok
+                }
+            }
+            ''',
+            variables={"groupRequestIds": [r.pk for r in self.create_requests(3, False)]}
+        )
+
+        self.assertEqual(
+            self.count_queries(
+                '''
+                mutation($groupRequestIds: [Int!]!) {
+                    groupmanagementAcceptJoinRequests(groupRequestIds: $groupRequestIds) {
+                        ok
+                    }
+                }
+                ''',
+                variables={"groupRequestIds": [r.pk for r in self.create_requests(6, False)]}
+            ),
+            queries
+        )
+
+    @override_settings(NOTIFICATIONS_MAX_PER_USER=2)
+    def test_accept_join_prunes_notifications(self):
+        group_request = self.create_requests(1, False)[0]
+        for days, title in ((2, "Old"), (1, "Newer")):
+            notification = Notification.objects.create(user=group_request.user, title=title, message=title)
+            Notification.objects.filter(pk=notification.pk).update(
+                timestamp=notification.timestamp - datetime.timedelta(days=days)
+            )
+        other_request = self.create_requests(1, False)[0]
+        Notification.objects.create(user=other_request.user, title="Other", message="Other")
+
+        response = self.mutate('groupmanagementAcceptJoinRequests', [group_request.pk, other_request.pk])
+
+        self.assertTrue(response.json()['data']['groupmanagementAcceptJoinRequests']['ok'])
+        self.assertQuerysetEqual(
+            Notification.objects.filter(user=group_request.user).order_by('timestamp'),
+            ["Newer", "Group Application Accepted"],
+            transform=lambda notification: notification.title
+        )
+        self.assertEqual(Notification.objects.filter(user=other_request.user).count(), 2)
+
+    def test_max_notifications_per_user(self):
+        with override_settings(NOTIFICATIONS_MAX_PER_USER='5'):
+            self.assertEqual(max_notifications_per_user(), 5)
+
+        for value in ('invalid', -1, None):
+            with override_settings(NOTIFICATIONS_MAX_PER_USER=value):
+                self.assertEqual(max_notifications_per_user(), Notification.NOTIFICATIONS_MAX_PER_USER_DEFAULT)
+
+    def test_reject_join_cannot_manage(self):
+        requests = self.create_requests(2, False)
+        denied = self.create_requests(1, False, group=self.other_group)
+
+        response = self.mutate('groupmanagementRejectJoinRequests', [r.pk for r in requests + denied])
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementRejectJoinRequests": {
+                        "ok": False,
+                        "processed": [r.pk for r in requests],
+                        "errors": [f"Permission denied for group request {denied[0].pk}"],
+                    }
+                }
+            }
+        )
+
+        self.assertEqual(self.group.user_set.count(), 0)
+        self.assertEqual(RequestLog.objects.filter(action=False).count(), 2)
+        self.assertEqual(Notification.objects.filter(title="Group Application Rejected").count(), 2)
+        self.assertCountEqual(GroupRequest.objects.all(), denied)
+
+    def test_accept_leave_ok(self):
+        requests = self.create_requests(2, True)
+        join_request = self.create_requests(1, False)[0]
+
+        response = self.mutate('groupmanagementAcceptLeaveRequests', [r.pk for r in requests] + [join_request.pk])
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementAcceptLeaveRequests": {
+                        "ok": False,
+                        "processed": [r.pk for r in requests],
+                        "errors": [f"Group request {join_request.pk} doesn't exist"],
+                    }
+                }
+            }
+        )
+
+        self.assertEqual(self.group.user_set.count(), 0)
+        self.assertEqual(RequestLog.objects.filter(request_type=True, action=True).count(), 2)
+        self.assertEqual(Notification.objects.filter(title="Group Leave Request Accepted").count(), 2)
+
+    def test_reject_leave_ok(self):
+        requests = self.create_requests(2, True)
+
+        response = self.mutate('groupmanagementRejectLeaveRequests', [r.pk for r in requests])
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "data": {
+                    "groupmanagementRejectLeaveRequests": {
+                        "ok": True,
+                        "processed": [r.pk for r in requests],
+                        "errors": [],
+                    }
+                }
+            }
+        )
+
+        self.assertEqual(self.group.user_set.count(), 2)
+        self.assertEqual(RequestLog.objects.filter(request_type=True, action=False).count(), 2)
+        self.assertEqual(Notification.objects.filter(title="Group Leave Request Rejected").count(), 2)
+        self.assertFalse(GroupRequest.objects.exists())
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('auth.group_management', UserMainFactory(), False)
+        cls.group = create_authgroup(internal=False, hidden=False, public=True)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_groups(self, n):
+        for _ in range(n):
+            create_authgroup(internal=False, hidden=False, public=True)
+
+    def create_members(self, n):
+        for _ in range(n):
+            user = UserMainFactory()
+            user.groups.add(self.group)
+            self.group.authgroup.group_leaders.add(user)
+
+    def test_user_joinable_groups(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                groupmanagementUserJoinableGroups {
+                    id
+                    status
+                    authgroup {
+                        description
+                    }
+                }
+            }
+            ''',
+            self.create_groups
+        )
+
+    def test_groups(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                groupmanagementGroups {
+                    id
+                    numMembers
+                    authgroup {
+                        description
+                    }
+                }
+            }
+            ''',
+            self.create_groups
+        )
+
+    def test_manage_requests(self):
+        def create_requests(n):
+            for i in range(n):
+                GroupRequest.objects.create(user=UserMainFactory(), group=self.group, leave_request=bool(i % 2))
+
+        self.assertQueryCountConstant(
+            '''
+            query {
+                groupmanagementManageRequests {
+                    acceptRequests {
+                        id
+                        user {
+                            profile {
+                                mainCharacter {
+                                    characterName
+                                }
+                            }
+                        }
+                        group {
+                            name
+                        }
+                    }
+                    leaveRequests {
+                        id
+                        user {
+                            profile {
+                                mainCharacter {
+                                    characterName
+                                }
+                            }
+                        }
+                        group {
+                            name
+                        }
+                    }
+                }
+            }
+            ''',
+            create_requests
+        )
+
+    def test_group_memberships(self):
+        self.assertQueryCountConstant(
+            '''
+            query($groupId: Int!) {
+                groupmanagementGroupMemberships(groupId: $groupId) {
+                    members {
+                        user {
+                            username
+                            profile {
+                                mainCharacter {
+                                    characterName
+                                }
+                            }
+                        }
+                        isLeader
+                    }
+                }
+            }
+            ''',
+            self.create_members,
+            variables={'groupId': self.group.pk}
+        )
+
+    def test_group_membership_audit(self):
+        def create_logs(n):
+            for _ in range(n):
+                RequestLog.objects.create(
+                    request_type=False,
+                    group=self.group,
+                    request_info=f'{UserMainFactory().username}:{self.group.name}',
+                    action=True,
+                    request_actor=self.user,
+                )
+
+        self.assertQueryCountConstant(
+            '''
+            query($groupId: Int!) {
+                groupmanagementGroupMembershipAudit(groupId: $groupId) {
+                    entries {
+                        id
+                        requestor {
+                            username
+                        }
+                    }
+                }
+            }
+            ''',
+            create_logs,
+            variables={'groupId': self.group.pk}
+        )
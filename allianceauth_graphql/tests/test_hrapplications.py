@@ -1,12 +1,19 @@
 from graphene_django.utils.testing import GraphQLTestCase
 
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from allianceauth.tests.auth_utils import AuthUtils
 from app_utils.testdata_factories import UserMainFactory, EveCorporationInfoFactory, EveCharacterFactory
 
 from allianceauth.hrapplications.models import Application, ApplicationForm, ApplicationQuestion, ApplicationComment
 from allianceauth.notifications.models import Notification
 
+from ..hrapplications.catalogue import FORM_CATALOGUE_CACHE_KEY
+from ..hrapplications.reviewers import FORM_CORPORATIONS_CACHE_KEY
 from ..hrapplications.types import ApplicationStatus
+from .utils import QueryCountTestMixin
 
 
 class TestQueriesAndTypes(GraphQLTestCase):
@@ -1063,3 +1070,337 @@ class TestAdminMarkInProgressApplication(GraphQLTestCase):
         )
 
         self.assertEqual(Notification.objects.count(), 0)
+
+
+class TestReviewableCorpIds(GraphQLTestCase):
+    maxDiff = None
+
+    QUERY = '''
+        query {
+            hrCorpApplications {
+                id
+            }
+            hrFinishedCorpApplications {
+                id
+            }
+        }
+    '''
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('auth.human_resources', UserMainFactory(), False)
+        cls.corp = cls.user.profile.main_character.corporation
+
+        cls.application = Application.objects.create(
+            form=ApplicationForm.objects.create(corp=EveCorporationInfoFactory()),
+            user=UserMainFactory()
+        )
+
+    def setUp(self):
+        cache.delete(FORM_CORPORATIONS_CACHE_KEY)
+        self.client.force_login(self.user)
+
+    def form_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.query(self.QUERY)
+
+        self.assertResponseNoErrors(response)
+        form_queries = [
+            query for query in ctx.captured_queries
+            if 'FROM "hrapplications_applicationform"' in query['sql'].replace('`', '"')
+        ]
+        return response.json()['data'], form_queries
+
+    def test_computed_once(self):
+        data, queries = self.form_queries()
+
+        self.assertDictEqual(data, {'hrCorpApplications': [], 'hrFinishedCorpApplications': []})
+        self.assertEqual(len(queries), 1)
+
+        _, queries = self.form_queries()
+
+        self.assertEqual(len(queries), 0)
+
+    def test_invalidated_on_form_change(self):
+        user = UserMainFactory()
+        self.form_queries()
+
+        application = Application.objects.create(
+            form=ApplicationForm.objects.create(corp=self.corp),
+            user=user
+        )
+
+        data, queries = self.form_queries()
+
+        self.assertDictEqual(
+            data,
+            {
+                'hrCorpApplications': [
+                    {
+                        'id': str(application.pk),
+                    }
+                ],
+                'hrFinishedCorpApplications': [],
+            }
+        )
+        self.assertEqual(len(queries), 1)
+
+        application.form.delete()
+
+        data, _ = self.form_queries()
+
+        self.assertDictEqual(data, {'hrCorpApplications': [], 'hrFinishedCorpApplications': []})
+
+
+class TestFormCatalogue(GraphQLTestCase):
+    maxDiff = None
+
+    QUERY = '''
+        query {
+            hrListAvailableForms {
+                id
+                corp {
+                    corporationName
+                }
+                questions {
+                    title
+                    choices {
+                        choiceText
+                    }
+                }
+            }
+        }
+    '''
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserMainFactory()
+
+        cls.question = ApplicationQuestion.objects.create(title="Question 1")
+        cls.choice = cls.question.choices.create(choice_text="Choice 1")
+
+        cls.form = ApplicationForm.objects.create(corp=EveCorporationInfoFactory(corporation_name="Corp 1"))
+        cls.form.questions.add(cls.question)
+
+        cls.applied_form = ApplicationForm.objects.create(corp=EveCorporationInfoFactory())
+        Application.objects.create(form=cls.applied_form, user=cls.user)
+
+    def setUp(self):
+        cache.delete(FORM_CATALOGUE_CACHE_KEY)
+        self.client.force_login(self.user)
+
+    def list_forms(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.query(self.QUERY)
+
+        self.assertResponseNoErrors(response)
+        catalogue_queries = [
+            query for query in ctx.captured_queries
+            if 'hrapplications_applicationquestion' in query['sql']
+        ]
+        return response.json()['data']['hrListAvailableForms'], catalogue_queries
+
+    def test_cached(self):
+        expected = [
+            {
+                'id': str(self.form.pk),
+                'corp': {
+                    'corporationName': 'Corp 1',
+                },
+                'questions': [
+                    {
+                        'title': 'Question 1',
+                        'choices': [
+                            {
+                                'choiceText': 'Choice 1',
+                            },
+                        ],
+                    },
+                ],
+            },
+        ]
+
+        forms, queries = self.list_forms()
+
+        self.assertListEqual(forms, expected)
+        self.assertGreater(len(queries), 0)
+
+        forms, queries = self.list_forms()
+
+        self.assertListEqual(forms, expected)
+        self.assertEqual(len(queries), 0)
+
+    def test_invalidated_on_question_change(self):
+        self.list_forms()
+
+        self.question.title = "New title"
+        self.question.save()
+
+        forms, _ = self.list_forms()
+
+        self.assertEqual(forms[0]['questions'][0]['title'], "New title")
+
+    def test_invalidated_on_choice_change(self):
+        self.list_forms()
+
+        self.question.choices.create(choice_text="Choice 2")
+
+        forms, _ = self.list_forms()
+
+        self.assertListEqual(
+            forms[0]['questions'][0]['choices'],
+            [
+                {
+                    'choiceText': 'Choice 1',
+                },
+                {
+                    'choiceText': 'Choice 2',
+                },
+            ]
+        )
+
+    def test_invalidated_on_form_questions_change(self):
+        self.list_forms()
+
+        self.form.questions.remove(self.question)
+
+        forms, _ = self.list_forms()
+
+        self.assertListEqual(forms[0]['questions'], [])
+
+    def test_invalidated_on_form_corporation_change(self):
+        self.list_forms()
+
+        self.form.corp.corporation_name = "New name"
+        self.form.corp.save()
+
+        forms, _ = self.list_forms()
+
+        self.assertEqual(forms[0]['corp']['corporationName'], "New name")
+
+    def test_not_invalidated_on_other_corporation_change(self):
+        self.list_forms()
+
+        EveCorporationInfoFactory().save()
+
+        _, queries = self.list_forms()
+
+        self.assertEqual(len(queries), 0)
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    APPLICATION_FIELDS = '''
+        id
+        user {
+            profile {
+                mainCharacter {
+                    characterName
+                }
+            }
+        }
+        form {
+            corp {
+                corporationName
+            }
+        }
+        responses {
+            question {
+                title
+            }
+            answer
+        }
+    '''
+
+    ADMIN_APPLICATION_FIELDS = APPLICATION_FIELDS + '''
+        reviewer {
+            username
+        }
+        reviewerCharacter {
+            characterName
+        }
+        comments {
+            text
+            user {
+                username
+            }
+        }
+    '''
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('auth.human_resources', UserMainFactory(), False)
+        cls.user.is_superuser = True
+        cls.user.save()
+
+        cls.question = ApplicationQuestion.objects.create(title="Question 1")
+        cls.question.choices.create(choice_text="Choice 1")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_forms(self, n):
+        for _ in range(n):
+            form = ApplicationForm.objects.create(corp=EveCorporationInfoFactory())
+            form.questions.add(self.question)
+
+    def create_applications(self, n, user=None, approved=None):
+        for _ in range(n):
+            form = ApplicationForm.objects.create(corp=EveCorporationInfoFactory())
+            form.questions.add(self.question)
+
+            application = Application.objects.create(
+                user=user or UserMainFactory(),
+                form=form,
+                approved=approved,
+                reviewer=self.user if approved is not None else None,
+                reviewer_character=self.user.profile.main_character if approved is not None else None,
+            )
+            application.responses.create(question=self.question, answer="Answer")
+            ApplicationComment.objects.create(application=application, user=self.user, text="Comment")
+
+    def test_hr_list_available_forms(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                hrListAvailableForms {
+                    id
+                    corp {
+                        corporationName
+                    }
+                    questions {
+                        title
+                        choices {
+                            choiceText
+                        }
+                    }
+                }
+            }
+            ''',
+            self.create_forms
+        )
+
+    def test_hr_corp_applications(self):
+        self.assertQueryCountConstant(
+            'query { hrCorpApplications { %s } }' % self.ADMIN_APPLICATION_FIELDS,
+            self.create_applications
+        )
+
+    def test_hr_finished_corp_applications(self):
+        self.assertQueryCountConstant(
+            'query { hrFinishedCorpApplications { %s } }' % self.ADMIN_APPLICATION_FIELDS,
+            lambda n: self.create_applications(n, approved=True)
+        )
+
+    def test_hr_personal_applications(self):
+        self.assertQueryCountConstant(
+            'query { hrPersonalApplications { %s } }' % self.APPLICATION_FIELDS,
+            lambda n: self.create_applications(n, user=self.user)
+        )
+
+    def test_hr_search_application(self):
+        self.assertQueryCountConstant(
+            'query($search: String!) { hrSearchApplication(searchString: $search) { %s } }' % self.ADMIN_APPLICATION_FIELDS,
+            self.create_applications,
+            variables={'search': 'a'}
+        )
@@ -0,0 +1,36 @@
+from django.db import connection
+from django.test import TransactionTestCase
+
+from ..indexes import check_indexes, create_missing_indexes, missing_indexes
+
+
+class TestOptionalIndexes(TransactionTestCase):
+
+    def drop_index(self, table, name):
+        with connection.schema_editor() as schema_editor:
+            schema_editor.execute(
+                schema_editor.sql_delete_index % {
+                    'name': schema_editor.quote_name(name),
+                    'table': schema_editor.quote_name(table),
+                }
+            )
+
+    def test_created_by_migrations(self):
+        self.assertListEqual(missing_indexes(connection), [])
+        self.assertListEqual(check_indexes(None, databases=['default']), [])
+
+    def test_created_again_after_migrate(self):
+        self.drop_index('srp_srpuserrequest', 'aagql_srpreq_fleet_time')
+
+        self.assertListEqual(
+            missing_indexes(connection),
+            [('srp_srpuserrequest', 'aagql_srpreq_fleet_time', ('srp_fleet_main_id', 'post_time'))]
+        )
+        self.assertListEqual(
+            [warning.id for warning in check_indexes(None, databases=['default'])],
+            ['allianceauth_graphql.W001']
+        )
+
+        create_missing_indexes(sender=None, using='default')
+
+        self.assertListEqual(missing_indexes(connection), [])
@@ -5,6 +5,8 @@ from allianceauth.notifications.models import Notification
 
 from app_utils.testdata_factories import UserFactory
 
+from .utils import QueryCountTestMixin
+
 
 class TestQueries(GraphQLTestCase):
     maxDiff = None
@@ -25,7 +27,7 @@ class TestQueries(GraphQLTestCase):
         cls.notif1.save()
 
     def test_notif_read_list(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -51,7 +53,7 @@ class TestQueries(GraphQLTestCase):
         )
 
     def test_notif_unread_list(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -96,7 +98,7 @@ class TestQueries(GraphQLTestCase):
         )
 
     def test_notif_unread_count_login(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -151,7 +153,7 @@ class TestMutations(GraphQLTestCase):
         cls.notif2: Notification = Notification.objects.get(title="Test notif 2")
 
     def test_mark_read_mutation_ok(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -182,7 +184,7 @@ class TestMutations(GraphQLTestCase):
         )
 
     def test_mark_read_mutation_not_ok(self):
-        self.client.force_login(self.user2, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user2, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -212,7 +214,7 @@ class TestMutations(GraphQLTestCase):
         )
 
     def test_delete_mutation_ok(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -243,7 +245,7 @@ class TestMutations(GraphQLTestCase):
         )
 
     def test_delete_mutation_not_ok(self):
-        self.client.force_login(self.user2, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user2, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -274,7 +276,7 @@ class TestMutations(GraphQLTestCase):
         )
 
     def test_all_read(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -311,7 +313,7 @@ class TestMutations(GraphQLTestCase):
         )
 
     def test_delete_all_read(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         self.notif1.viewed = True
         self.notif1.save()
@@ -348,3 +350,43 @@ class TestMutations(GraphQLTestCase):
             .filter(pk=self.notif2.pk)
             .exists()
         )
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def setUp(self):
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
+
+    def test_notif_read_list(self):
+        self.assertQueryCountConstant(
+            '''
+            query q {
+                notifReadList {
+                    id
+                    user {
+                        username
+                    }
+                }
+            }
+            ''',
+            lambda n: [Notification.objects.create(user=self.user, title='Read', message='Read', viewed=True) for _ in range(n)]
+        )
+
+    def test_notif_unread_list(self):
+        self.assertQueryCountConstant(
+            '''
+            query q {
+                notifUnreadList {
+                    id
+                    user {
+                        username
+                    }
+                }
+            }
+            ''',
+            lambda n: [Notification.objects.create(user=self.user, title='Unread', message='Unread') for _ in range(n)]
+        )
@@ -7,6 +7,8 @@ from app_utils.testdata_factories import UserFactory, UserMainFactory
 
 from allianceauth.optimer.models import OpTimer, OpTimerType
 
+from .utils import QueryCountTestMixin
+
 
 class TestQueries(GraphQLTestCase):
     maxDiff = None
@@ -70,6 +72,80 @@ class TestQueries(GraphQLTestCase):
             }
         )
 
+    def test_optimer_timers(self):
+        other_future = OpTimer.objects.create(start=timezone.now() + datetime.timedelta(days=2))
+        OpTimer.objects.create(start=timezone.now() + datetime.timedelta(days=10))
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query($from: DateTime, $to: DateTime) {
+                optimerTimers(from: $from, to: $to, offset: 1, limit: 2) {
+                    id
+                }
+            }
+            ''',
+            variables={
+                'from': (timezone.now() - datetime.timedelta(days=5)).isoformat(),
+                'to': (timezone.now() + datetime.timedelta(days=5)).isoformat(),
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'optimerTimers': [
+                        {
+                            'id': str(self.timer_future.pk)
+                        },
+                        {
+                            'id': str(other_future.pk)
+                        },
+                    ]
+                }
+            }
+        )
+
+    def test_optimer_timer_summaries(self):
+        optimer_type = OpTimerType.objects.create(type='CTA')
+        self.timer_future.operation_name = 'Home defense'
+        self.timer_future.type = optimer_type
+        self.timer_future.save()
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query($from: DateTime) {
+                optimerTimerSummaries(from: $from) {
+                    id
+                    operationName
+                    start
+                    typeName
+                }
+            }
+            ''',
+            variables={
+                'from': timezone.now().isoformat(),
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'optimerTimerSummaries': [
+                        {
+                            'id': str(self.timer_future.pk),
+                            'operationName': 'Home defense',
+                            'start': self.timer_future.start.isoformat(),
+                            'typeName': 'CTA',
+                        },
+                    ]
+                }
+            }
+        )
+
 
 class TestOpFormMutation(GraphQLTestCase):
     maxDiff = None
@@ -473,3 +549,76 @@ class TestOpFormEditMutation(GraphQLTestCase):
 
         self.assertEqual(OpTimer.objects.count(), 1)
         self.assertEqual(OpTimerType.objects.count(), 1)
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('auth.optimer_view', UserFactory(), False)
+        cls.optimer_type = OpTimerType.objects.create(type='CTA')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_timers(self, n, delta):
+        for _ in range(n):
+            OpTimer.objects.create(
+                start=timezone.now() + delta,
+                type=self.optimer_type,
+                eve_character=UserMainFactory().profile.main_character,
+            )
+
+    def test_optimer_past_timers(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                optimerPastTimers {
+                    id
+                    type {
+                        type
+                    }
+                    eveCharacter {
+                        characterName
+                    }
+                }
+            }
+            ''',
+            lambda n: self.create_timers(n, -datetime.timedelta(days=1))
+        )
+
+    def test_optimer_future_timers(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                optimerFutureTimers {
+                    id
+                    type {
+                        type
+                    }
+                    eveCharacter {
+                        characterName
+                    }
+                }
+            }
+            ''',
+            lambda n: self.create_timers(n, datetime.timedelta(days=1))
+        )
+
+    def test_optimer_timers(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                optimerTimers {
+                    id
+                    type {
+                        type
+                    }
+                    eveCharacter {
+                        characterName
+                    }
+                }
+            }
+            ''',
+            lambda n: self.create_timers(n, datetime.timedelta(days=1))
+        )
@@ -1,11 +1,14 @@
 import json
 from graphene_django.utils.testing import GraphQLTestCase
 
+from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 
 from app_utils.testdata_factories import UserFactory
 from allianceauth.tests.test_auth_utils import AuthUtils
 
+from .utils import QueryCountTestMixin
+
 
 class TestQueries(GraphQLTestCase):
 
@@ -28,7 +31,7 @@ class TestQueries(GraphQLTestCase):
         )
 
     def test_show_only_applied_true(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -65,7 +68,7 @@ class TestQueries(GraphQLTestCase):
         self.assertCountEqual([(r['contentType']['appLabel'], r['codename']) for r in results], self.perms)
 
     def test_app_label_not_only_applied(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -113,7 +116,7 @@ class TestQueries(GraphQLTestCase):
         self.assertCountEqual([(r['contentType']['appLabel'], r['codename']) for r in results], perms)
 
     def test_model(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -158,7 +161,7 @@ class TestQueries(GraphQLTestCase):
         self.assertCountEqual([(r['contentType']['appLabel'], r['codename']) for r in results], perms)
 
     def test_search_string(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -202,7 +205,7 @@ class TestQueries(GraphQLTestCase):
         self.assertCountEqual([(r['contentType']['appLabel'], r['codename']) for r in results], perms)
 
     def test_perms_list_app_models(self):
-        self.client.force_login(self.user, "graphql_jwt.backends.JSONWebTokenBackend")
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
 
         response = self.query(
             '''
@@ -224,3 +227,48 @@ class TestQueries(GraphQLTestCase):
         results = data['data']['permsListAppModels']
 
         self.assertEqual(len(results), ContentType.objects.count())
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('permissions_tool.audit_permissions', UserFactory(), False)
+        cls.group = Group.objects.create(name='Test Group')
+        cls.content_type = ContentType.objects.get_for_model(Group)
+
+    def create_permissions(self, n):
+        for _ in range(n):
+            perm = Permission.objects.create(
+                content_type=self.content_type,
+                codename=f'nplusone_{Permission.objects.count()}',
+                name='N+1 permission',
+            )
+            perm.user_set.add(UserFactory())
+            perm.group_set.add(self.group)
+
+    def test_perms_search(self):
+        self.client.force_login(self.user, "allianceauth_graphql.authentication.backends.JSONWebTokenBackend")
+
+        self.assertQueryCountConstant(
+            '''
+            query {
+                permsSearch(showOnlyApplied: false, searchString: "nplusone") {
+                    codename
+                    contentType {
+                        appLabel
+                    }
+                    userSet {
+                        username
+                    }
+                    groupSet {
+                        name
+                    }
+                    stateSet {
+                        name
+                    }
+                }
+            }
+            ''',
+            self.create_permissions
+        )
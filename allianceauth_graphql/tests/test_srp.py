@@ -2,6 +2,8 @@ import datetime
 from graphene_django.utils.testing import GraphQLTestCase
 from unittest.mock import patch
 
+from django.core.cache import cache
+from django.db import connection
 from django.utils import timezone
 from django.db.models import Min
 
@@ -14,6 +16,11 @@ from allianceauth.srp.models import SrpFleetMain, SrpUserRequest
 from allianceauth.eveonline.models import EveCharacter
 from allianceauth.notifications.models import Notification
 
+from ..models import SrpKillmail, SrpRequestIntake
+from ..tasks import claim_srp_intakes, process_srp_intakes
+from ..srp.killmails import type_name_cache_key
+from .utils import QueryCountTestMixin
+
 
 class TestQueries(GraphQLTestCase):
     maxDiff = None
@@ -94,6 +101,161 @@ class TestQueries(GraphQLTestCase):
             }
         )
 
+    def test_srp_get_fleets_totals(self):
+        character = UserMainFactory().profile.main_character
+        for status, amount in (('Pending', 1000), ('Pending', 2000), ('Approved', 500)):
+            self.open_fleet.srpuserrequest_set.create(
+                srp_status=status,
+                srp_total_amount=amount,
+                character=character,
+            )
+
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query {
+                srpGetFleets(all: true) {
+                    id
+                    totalCost
+                    pendingRequests
+                }
+            }
+            '''
+        )
+
+        res = response.json()
+
+        self.assertCountEqual(
+            res['data']['srpGetFleets'],
+            [
+                {
+                    'id': str(self.open_fleet.pk),
+                    'totalCost': 3500,
+                    'pendingRequests': 2,
+                },
+                {
+                    'id': str(self.completed_fleet.pk),
+                    'totalCost': 0,
+                    'pendingRequests': 0,
+                },
+            ]
+        )
+
+
+
+class TestSrpFleetRequestsQuery(GraphQLTestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('auth.srp_management', UserMainFactory(), False)
+
+        cls.fleet = SrpFleetMain.objects.create(
+            fleet_name='Test Fleet',
+            fleet_time=timezone.now() - datetime.timedelta(hours=1),
+        )
+
+        cls.character = cls.user.profile.main_character
+        cls.requests = [
+            cls.fleet.srpuserrequest_set.create(
+                srp_ship_name=ship_name,
+                srp_status=status,
+                kb_total_loss=loss,
+                srp_total_amount=amount,
+                character=cls.character,
+                killboard_link=f'https://zkillboard.com/kill/{i}/',
+            )
+            for i, (ship_name, status, loss, amount) in enumerate([
+                ('Muninn', 'Pending', 250_000_000, 0),
+                ('Muninn', 'Approved', 260_000_000, 250_000_000),
+                ('Scimitar', 'Pending', 3_000_000_000, 0),
+                ('Sabre', 'Rejected', 80_000_000, 0),
+            ])
+        ]
+
+        SrpFleetMain.objects.create(
+            fleet_name='Other Fleet',
+            fleet_time=timezone.now(),
+        ).srpuserrequest_set.create(srp_ship_name='Muninn', character=cls.character)
+
+    def query_requests(self, **variables):
+        return self.query(
+            '''
+            query(
+                $fleetId: Int!, $status: SrpRequestStatus, $shipName: String, $minLoss: BigInt,
+                $sort: SrpRequestSortKey, $descending: Boolean, $offset: Int, $limit: Int
+            ) {
+                srpFleetRequests(
+                    fleetId: $fleetId, status: $status, shipName: $shipName, minLoss: $minLoss,
+                    sort: $sort, descending: $descending, offset: $offset, limit: $limit
+                ) {
+                    requests {
+                        id
+                    }
+                    totalCount
+                    statusTotals {
+                        status
+                        count
+                        totalLoss
+                        totalAmount
+                    }
+                }
+            }
+            ''',
+            variables={'fleetId': self.fleet.pk, **variables}
+        )
+
+    def test_filters(self):
+        self.client.force_login(self.user)
+
+        response = self.query_requests(shipName='muninn', status='PENDING')
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'srpFleetRequests': {
+                        'requests': [
+                            {'id': str(self.requests[0].pk)},
+                        ],
+                        'totalCount': 1,
+                        'statusTotals': [
+                            {
+                                'status': 'APPROVED',
+                                'count': 1,
+                                'totalLoss': 260_000_000,
+                                'totalAmount': 250_000_000,
+                            },
+                            {
+                                'status': 'PENDING',
+                                'count': 1,
+                                'totalLoss': 250_000_000,
+                                'totalAmount': 0,
+                            },
+                        ]
+                    }
+                }
+            }
+        )
+
+    def test_sort_and_paginate(self):
+        self.client.force_login(self.user)
+
+        response = self.query_requests(sort='LOSS', descending=True, offset=1, limit=2, minLoss=100_000_000)
+
+        res = response.json()['data']['srpFleetRequests']
+
+        self.assertEqual(res['requests'], [{'id': str(self.requests[1].pk)}, {'id': str(self.requests[0].pk)}])
+        self.assertEqual(res['totalCount'], 3)
+
+    def test_no_perms(self):
+        self.client.force_login(UserMainFactory())
+
+        response = self.query_requests()
+
+        self.assertIsNone(response.json()['data']['srpFleetRequests'])
+
 
 class TestAddFleetMutation(GraphQLTestCase):
     maxDiff = None
@@ -393,8 +555,11 @@ class TestSrpFleetUserRequestFormMutation(GraphQLTestCase):
             'killboardLink': 'https://zkillboard.com/kill/1234567890/',
         }
 
+    def setUp(self):
+        cache.delete(type_name_cache_key(11567))
+
     @patch('allianceauth.srp.managers.SRPManager.get_kill_data')
-    @patch('allianceauth_graphql.srp.mutations.esi')
+    @patch('allianceauth_graphql.srp.killmails.esi')
     def test_ok(self, mock_esi, mock_get_kill_data):
         self.client.force_login(self.user)
 
@@ -450,6 +615,40 @@ class TestSrpFleetUserRequestFormMutation(GraphQLTestCase):
 
         self.assertEqual(SrpUserRequest.objects.count(), 1)
 
+        killmail = SrpKillmail.objects.get(killmail_id=1234567890)
+        self.assertEqual(killmail.srp_request_id, SrpUserRequest.objects.get().pk)
+        self.assertEqual(killmail.ship_name, 'Avatar')
+        self.assertEqual(killmail.victim_id, self.user.profile.main_character.character_id)
+
+    @patch('allianceauth.srp.managers.SRPManager.get_kill_data')
+    @patch('allianceauth_graphql.srp.killmails.esi')
+    def test_resubmission_uses_stored_killmail(self, mock_esi, mock_get_kill_data):
+        self.client.force_login(self.user)
+
+        mock_esi.client = EsiClientStub.create_from_endpoints([
+            EsiEndpoint('Universe', 'get_universe_types_type_id', 'type_id', data={'11567': {'name': 'Avatar'}}),
+        ])
+        mock_get_kill_data.return_value = (11567, 64_840_457_150.95, self.user.profile.main_character.character_id)
+
+        query = '''
+            mutation($input: SrpFleetUserRequestFormMutationInput!) {
+                srpRequest(input: $input) {
+                    ok
+                }
+            }
+        '''
+
+        self.assertJSONEqual(self.query(query, input_data=self.form_data).content, {'data': {'srpRequest': {'ok': True}}})
+        self.assertJSONEqual(self.query(query, input_data=self.form_data).content, {'data': {'srpRequest': {'ok': False}}})
+
+        SrpUserRequest.objects.all().delete()
+        mock_esi.client = None
+
+        self.assertJSONEqual(self.query(query, input_data=self.form_data).content, {'data': {'srpRequest': {'ok': True}}})
+
+        mock_get_kill_data.assert_called_once()
+        self.assertEqual(SrpUserRequest.objects.get().srp_ship_name, 'Avatar')
+
     @patch('allianceauth.srp.managers.SRPManager.get_kill_data')
     def test_value_error(self, mock_get_kill_data):
         self.client.force_login(self.user)
@@ -487,6 +686,28 @@ class TestSrpFleetUserRequestFormMutation(GraphQLTestCase):
 
         self.assertEqual(SrpUserRequest.objects.count(), 0)
 
+    @patch('allianceauth.srp.managers.SRPManager.get_kill_data')
+    def test_invalid_killmail_id(self, mock_get_kill_data):
+        self.client.force_login(self.user)
+
+        query = '''
+            mutation($input: SrpFleetUserRequestFormMutationInput!) {
+                srpRequest(input: $input) {
+                    ok
+                }
+            }
+        '''
+
+        response = self.query(
+            query,
+            input_data={**self.form_data, 'killboardLink': 'https://zkillboard.com/kill/12345678901234567890/'}
+        )
+
+        self.assertJSONEqual(response.content, {'data': {'srpRequest': {'ok': False}}})
+
+        mock_get_kill_data.assert_not_called()
+        self.assertEqual(SrpUserRequest.objects.count(), 0)
+
     @patch('allianceauth.srp.managers.SRPManager.get_kill_data')
     def test_missing_character(self, mock_get_kill_data):
         self.client.force_login(self.user)
@@ -571,6 +792,235 @@ class TestSrpFleetUserRequestFormMutation(GraphQLTestCase):
         self.assertEqual(SrpUserRequest.objects.count(), 1)
 
 
+@patch('allianceauth_graphql.srp.killmails.esi')
+@patch('allianceauth.srp.managers.SRPManager.get_kill_data')
+class TestSrpRequestIntake(GraphQLTestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('srp.access_srp', UserMainFactory(), False)
+
+        cls.fleet = SrpFleetMain.objects.create(
+            fleet_name='Test Fleet',
+            fleet_doctrine='Test Doctrine',
+            fleet_time=timezone.now() - datetime.timedelta(hours=1),
+            fleet_srp_code='TEST',
+            fleet_srp_status='',
+        )
+
+        cls.killboard_link = 'https://zkillboard.com/kill/1234567890/'
+
+    def setUp(self):
+        cache.delete(type_name_cache_key(11567))
+
+    def setup_mocks(self, mock_get_kill_data, mock_esi):
+        mock_esi.client = EsiClientStub.create_from_endpoints([
+            EsiEndpoint('Universe', 'get_universe_types_type_id', 'type_id', data={'11567': {'name': 'Avatar'}}),
+        ])
+        mock_get_kill_data.return_value = (11567, 64_840_457_150.95, self.user.profile.main_character.character_id)
+
+    @patch('allianceauth_graphql.srp.mutations.SRP_ASYNC_INTAKE', True)
+    def test_queued_and_polled(self, mock_get_kill_data, mock_esi):
+        self.setup_mocks(mock_get_kill_data, mock_esi)
+        self.client.force_login(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.query(
+                '''
+                mutation($input: SrpFleetUserRequestFormMutationInput!) {
+                    srpRequest(input: $input) {
+                        ok
+                        srpRequest {
+                            id
+                        }
+                        intake {
+                            status
+                        }
+                    }
+                }
+                ''',
+                input_data={
+                    'fleetSrpCode': 'TEST',
+                    'killboardLink': self.killboard_link,
+                }
+            )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'srpRequest': {
+                        'ok': True,
+                        'srpRequest': None,
+                        'intake': {
+                            'status': 'PENDING',
+                        }
+                    }
+                }
+            }
+        )
+
+        intake = SrpRequestIntake.objects.get()
+
+        response = self.query(
+            '''
+            query($intakeId: Int!) {
+                srpRequestIntake(intakeId: $intakeId) {
+                    status
+                    error
+                    srpRequest {
+                        srpShipName
+                    }
+                }
+            }
+            ''',
+            variables={'intakeId': intake.pk}
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'srpRequestIntake': {
+                        'status': 'ACCEPTED',
+                        'error': '',
+                        'srpRequest': {
+                            'srpShipName': 'Avatar',
+                        }
+                    }
+                }
+            }
+        )
+
+    def test_batch_duplicates(self, mock_get_kill_data, mock_esi):
+        self.setup_mocks(mock_get_kill_data, mock_esi)
+
+        first, second = [
+            SrpRequestIntake.objects.create(user=self.user, srp_fleet_main_id=self.fleet.pk, killboard_link=self.killboard_link)
+            for _ in range(2)
+        ]
+
+        process_srp_intakes()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+
+        self.assertEqual(first.status, SrpRequestIntake.Status.ACCEPTED)
+        self.assertEqual(first.srp_request_id, SrpUserRequest.objects.get().pk)
+        self.assertEqual(second.status, SrpRequestIntake.Status.REJECTED)
+        self.assertEqual(second.error, "This killmail has already been submitted")
+        self.assertIsNotNone(second.processed)
+        mock_get_kill_data.assert_called_once()
+
+    def test_claimed_before_validation(self, mock_get_kill_data, mock_esi):
+        self.setup_mocks(mock_get_kill_data, mock_esi)
+        kill_data = mock_get_kill_data.return_value
+
+        intake = SrpRequestIntake.objects.create(user=self.user, srp_fleet_main_id=self.fleet.pk, killboard_link=self.killboard_link)
+
+        def get_kill_data(killmail_id):
+            intake.refresh_from_db()
+            self.assertEqual(intake.status, SrpRequestIntake.Status.PROCESSING)
+            self.assertIsNotNone(intake.claimed)
+            return kill_data
+
+        mock_get_kill_data.side_effect = get_kill_data
+
+        process_srp_intakes()
+
+        intake.refresh_from_db()
+        self.assertEqual(intake.status, SrpRequestIntake.Status.ACCEPTED)
+        mock_get_kill_data.assert_called_once()
+
+    def test_claim_without_select_for_update_of(self, mock_get_kill_data, mock_esi):
+        self.setup_mocks(mock_get_kill_data, mock_esi)
+
+        intake = SrpRequestIntake.objects.create(user=self.user, srp_fleet_main_id=self.fleet.pk, killboard_link=self.killboard_link)
+
+        # like MariaDB, which locks rows with SKIP LOCKED but without OF
+        with patch.multiple(
+            connection.features,
+            has_select_for_update=True,
+            has_select_for_update_skip_locked=True,
+            has_select_for_update_of=False,
+        ), patch.object(connection.ops, 'for_update_sql', return_value=''):
+            claimed = claim_srp_intakes()
+
+        self.assertListEqual(claimed, [intake])
+        self.assertEqual(claimed[0].status, SrpRequestIntake.Status.PROCESSING)
+
+    def test_stale_claims(self, mock_get_kill_data, mock_esi):
+        mock_get_kill_data.side_effect = ValueError('Test')
+
+        stale, claimed = [
+            SrpRequestIntake.objects.create(
+                user=self.user,
+                srp_fleet_main_id=self.fleet.pk,
+                killboard_link=self.killboard_link,
+                status=SrpRequestIntake.Status.PROCESSING,
+                claimed=timezone.now() - datetime.timedelta(minutes=minutes),
+            )
+            for minutes in (15, 1)
+        ]
+
+        process_srp_intakes()
+
+        stale.refresh_from_db()
+        claimed.refresh_from_db()
+        self.assertEqual(stale.status, SrpRequestIntake.Status.REJECTED)
+        self.assertEqual(claimed.status, SrpRequestIntake.Status.PROCESSING)
+
+    def test_invalid_killmail(self, mock_get_kill_data, mock_esi):
+        mock_get_kill_data.side_effect = ValueError('Test')
+
+        intake = SrpRequestIntake.objects.create(user=self.user, srp_fleet_main_id=self.fleet.pk, killboard_link=self.killboard_link)
+
+        process_srp_intakes()
+
+        intake.refresh_from_db()
+        self.assertEqual(intake.status, SrpRequestIntake.Status.REJECTED)
+        self.assertEqual(intake.error, "Invalid killmail")
+        self.assertFalse(SrpUserRequest.objects.exists())
+
+    def test_unlinked_when_request_deleted(self, mock_get_kill_data, mock_esi):
+        self.setup_mocks(mock_get_kill_data, mock_esi)
+
+        intake = SrpRequestIntake.objects.create(user=self.user, srp_fleet_main_id=self.fleet.pk, killboard_link=self.killboard_link)
+
+        process_srp_intakes()
+
+        SrpUserRequest.objects.get().delete()
+
+        intake.refresh_from_db()
+        self.assertIsNone(intake.srp_request_id)
+        self.assertIsNone(SrpKillmail.objects.get(killmail_id=1234567890).srp_request_id)
+
+    def test_deleted_with_fleet(self, mock_get_kill_data, mock_esi):
+        SrpRequestIntake.objects.create(user=self.user, srp_fleet_main_id=self.fleet.pk, killboard_link=self.killboard_link)
+
+        self.fleet.delete()
+
+        self.assertFalse(SrpRequestIntake.objects.exists())
+
+    def test_other_user_intake(self, mock_get_kill_data, mock_esi):
+        intake = SrpRequestIntake.objects.create(user=UserMainFactory(), srp_fleet_main_id=self.fleet.pk, killboard_link=self.killboard_link)
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query($intakeId: Int!) {
+                srpRequestIntake(intakeId: $intakeId) {
+                    status
+                }
+            }
+            ''',
+            variables={'intakeId': intake.pk}
+        )
+
+        self.assertJSONEqual(response.content, {'data': {'srpRequestIntake': None}})
+
+
 class TestSrpRequestRemoveMutation(GraphQLTestCase):
     maxDiff = None
 
@@ -809,6 +1259,133 @@ class TestSrpUpdateAmountMutation(GraphQLTestCase):
         self.assertEqual(self.request.srp_total_amount, 64_840_457_150)
 
 
+class TestSrpBulkUpdateAmountMutation(GraphQLTestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('auth.srp_management', UserMainFactory(), False)
+
+        cls.fleet = SrpFleetMain.objects.create(
+            fleet_name='Test Fleet',
+            fleet_time=timezone.now() - datetime.timedelta(hours=1),
+        )
+
+        cls.muninn, cls.muninn_approved, cls.sabre = [
+            cls.fleet.srpuserrequest_set.create(
+                srp_ship_name=ship_name,
+                srp_status=status,
+                character=cls.user.profile.main_character,
+            )
+            for ship_name, status in [('Muninn', 'Pending'), ('Muninn', 'Approved'), ('Sabre', 'Pending')]
+        ]
+
+    def mutate(self, **variables):
+        return self.query(
+            '''
+            mutation($amounts: [SrpAmountInput!], $rule: SrpAmountRuleInput) {
+                srpBulkUpdateAmount(amounts: $amounts, rule: $rule) {
+                    ok
+                    updated
+                    errors
+                }
+            }
+            ''',
+            variables=variables
+        )
+
+    def test_amounts(self):
+        self.client.force_login(self.user)
+        invalid_pk = generate_invalid_pk(SrpUserRequest)
+
+        response = self.mutate(amounts=[
+            {'requestId': self.muninn.pk, 'amount': 250_000_000},
+            {'requestId': self.sabre.pk, 'amount': 80_000_000.5},
+            {'requestId': invalid_pk, 'amount': 1},
+            {'requestId': 'U3JwVXNlclJlcXVlc3Q6MQ==', 'amount': 1},
+        ])
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'srpBulkUpdateAmount': {
+                        'ok': False,
+                        'updated': 2,
+                        'errors': [
+                            f"SRP request {invalid_pk} doesn't exist",
+                            "SRP request U3JwVXNlclJlcXVlc3Q6MQ== doesn't exist",
+                        ],
+                    }
+                }
+            }
+        )
+
+        self.assertCountEqual(
+            SrpUserRequest.objects.values_list('pk', 'srp_total_amount'),
+            [(self.muninn.pk, 250_000_000), (self.muninn_approved.pk, 0), (self.sabre.pk, 80_000_000)]
+        )
+
+    def test_rule(self):
+        self.client.force_login(self.user)
+
+        response = self.mutate(rule={'fleetId': self.fleet.pk, 'shipName': 'muninn', 'status': 'PENDING', 'amount': 250_000_000})
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'srpBulkUpdateAmount': {
+                        'ok': True,
+                        'updated': 1,
+                        'errors': [],
+                    }
+                }
+            }
+        )
+
+        self.assertCountEqual(
+            SrpUserRequest.objects.values_list('pk', 'srp_total_amount'),
+            [(self.muninn.pk, 250_000_000), (self.muninn_approved.pk, 0), (self.sabre.pk, 0)]
+        )
+
+    def test_rule_invalid_fleet(self):
+        self.client.force_login(self.user)
+
+        response = self.mutate(rule={'fleetId': 'fleet', 'amount': 250_000_000})
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'srpBulkUpdateAmount': {
+                        'ok': False,
+                        'updated': 0,
+                        'errors': ["SRP fleet fleet doesn't exist"],
+                    }
+                }
+            }
+        )
+
+    def test_amounts_and_rule(self):
+        self.client.force_login(self.user)
+
+        response = self.mutate()
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'srpBulkUpdateAmount': {
+                        'ok': False,
+                        'updated': 0,
+                        'errors': ["Either a list of amounts or a rule is required"],
+                    }
+                }
+            }
+        )
+
+
 class TestSrpUpdateAARMutation(GraphQLTestCase):
     maxDiff = None
 
@@ -855,3 +1432,41 @@ class TestSrpUpdateAARMutation(GraphQLTestCase):
         self.fleet.refresh_from_db()
 
         self.assertEqual(self.fleet.fleet_srp_aar_link, 'Test AAR')
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('srp.access_srp', UserMainFactory(), False)
+
+    def create_fleets(self, n):
+        for _ in range(n):
+            fleet = SrpFleetMain.objects.create(
+                fleet_name='Test Fleet',
+                fleet_time=timezone.now(),
+                fleet_commander=self.user.profile.main_character,
+            )
+            fleet.srpuserrequest_set.create(
+                srp_total_amount=1000,
+                character=self.user.profile.main_character,
+            )
+
+    def test_srp_get_fleets(self):
+        self.client.force_login(self.user)
+
+        self.assertQueryCountConstant(
+            '''
+            query {
+                srpGetFleets {
+                    id
+                    totalCost
+                    pendingRequests
+                    fleetCommander {
+                        characterName
+                    }
+                }
+            }
+            ''',
+            self.create_fleets
+        )
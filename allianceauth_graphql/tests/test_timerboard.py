@@ -9,6 +9,7 @@ from app_utils.testdata_factories import UserMainFactory, EveCorporationInfoFact
 from allianceauth.timerboard.models import Timer, TimerType
 
 from ..timerboard.types import TimerStructureChoices, TimerTypeChoices, TimerObjectiveChoices
+from .utils import QueryCountTestMixin
 
 
 class TestQueries(GraphQLTestCase):
@@ -121,6 +122,159 @@ class TestQueries(GraphQLTestCase):
             ]
         )
 
+    def test_tmr_future_timers_window(self):
+        far_timer = Timer.objects.create(
+            timer_type=TimerType.UNSPECIFIED,
+            eve_time=timezone.now() + datetime.timedelta(days=10),
+            eve_corp=self.corp2,
+            corp_timer=False,
+        )
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query($from: DateTime, $limit: Int) {
+                tmrFutureTimers(from: $from, limit: $limit) {
+                    id
+                }
+            }
+            ''',
+            variables={
+                'from': (timezone.now() + datetime.timedelta(hours=12)).isoformat(),
+                'limit': 2,
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'tmrFutureTimers': [
+                        {
+                            'id': str(self.corp_future_timer.pk),
+                        },
+                        {
+                            'id': str(self.future_timer.pk),
+                        },
+                    ]
+                }
+            }
+        )
+
+        response = self.query(
+            '''
+            query($to: DateTime) {
+                tmrFutureTimers(offset: 1, to: $to) {
+                    id
+                }
+            }
+            ''',
+            variables={
+                'to': (timezone.now() + datetime.timedelta(days=30)).isoformat(),
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'tmrFutureTimers': [
+                        {
+                            'id': str(self.future_timer.pk),
+                        },
+                        {
+                            'id': str(far_timer.pk),
+                        },
+                    ]
+                }
+            }
+        )
+
+    def test_tmr_timers_naive_window(self):
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query($from: DateTime, $to: DateTime) {
+                tmrFutureTimers(from: $from) {
+                    id
+                }
+                tmrPastTimers(to: $to) {
+                    id
+                }
+            }
+            ''',
+            variables={
+                'from': timezone.localtime().replace(tzinfo=None).isoformat(),
+                'to': (timezone.localtime() + datetime.timedelta(days=1)).replace(tzinfo=None).isoformat(),
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'tmrFutureTimers': [
+                        {
+                            'id': str(self.corp_future_timer.pk),
+                        },
+                        {
+                            'id': str(self.future_timer.pk),
+                        },
+                    ],
+                    'tmrPastTimers': [
+                        {
+                            'id': str(self.past_timer.pk),
+                        },
+                        {
+                            'id': str(self.corp_past_timer.pk),
+                        },
+                    ],
+                }
+            }
+        )
+
+    def test_tmr_past_timers_most_recent_first(self):
+        old_timer = Timer.objects.create(
+            timer_type=TimerType.UNSPECIFIED,
+            eve_time=timezone.now() - datetime.timedelta(days=10),
+            eve_corp=self.corp,
+            corp_timer=False,
+        )
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            query($from: DateTime) {
+                tmrPastTimers(from: $from) {
+                    id
+                }
+            }
+            ''',
+            variables={
+                'from': (timezone.now() - datetime.timedelta(days=30)).isoformat(),
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'tmrPastTimers': [
+                        {
+                            'id': str(self.past_timer.pk),
+                        },
+                        {
+                            'id': str(self.corp_past_timer.pk),
+                        },
+                        {
+                            'id': str(old_timer.pk),
+                        },
+                    ]
+                }
+            }
+        )
+
 
 class TestMutations(GraphQLTestCase):
     maxDiff = None
@@ -589,3 +743,216 @@ class TestMutations(GraphQLTestCase):
         )
 
         self.assertEqual(Timer.objects.count(), 0)
+
+    def test_import_timers(self):
+        time = timezone.now() + datetime.timedelta(days=7)
+        absolute_input = self.input_data.copy()
+        absolute_input.update({'absoluteTime': time.isoformat(), 'details': 'absolute'})
+        absolute_input.pop('daysLeft')
+
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            mutation($timers: [TimerInput!], $notifications: String) {
+                tmrImportTimers(timers: $timers, notifications: $notifications) {
+                    ok
+                    errors
+                    timers {
+                        id
+                        details
+                        system
+                        structure
+                        timerType
+                        eveTime
+                    }
+                }
+            }
+            ''',
+            variables={
+                'timers': [self.input_data, absolute_input],
+                'notifications': (
+                    'The Astrahus "Home" in Jita has lost its shields and will come out of reinforcement at 2030.05.01 12:34:56\n'
+                    '\n'
+                    'Keepstar in 1DQ1-A anchoring 2030.05.02 18:00\n'
+                ),
+            }
+        )
+
+        self.assertResponseNoErrors(response)
+        result = response.json()['data']['tmrImportTimers']
+        self.assertTrue(result['ok'])
+        self.assertListEqual(result['errors'], [])
+        self.assertEqual(len(result['timers']), 4)
+        self.assertEqual(result['timers'][1]['eveTime'], time.isoformat())
+        self.assertListEqual(
+            [timer.pop('id') for timer in result['timers']],
+            [str(pk) for pk in Timer.objects.order_by('-pk').values_list('pk', flat=True)[:4]][::-1]
+        )
+        self.assertDictEqual(
+            result['timers'][2],
+            {
+                'details': 'The Astrahus "Home" in Jita has lost its shields and will come out of reinforcement at 2030.05.01 12:34:56',
+                'system': 'Jita',
+                'structure': TimerStructureChoices.Astrahus.name,
+                'timerType': TimerTypeChoices.ARMOR.name,
+                'eveTime': '2030-05-01T12:34:56+00:00',
+            }
+        )
+        self.assertEqual(result['timers'][3]['timerType'], TimerTypeChoices.ANCHORING.name)
+
+        self.assertEqual(Timer.objects.count(), 5)
+        timer = Timer.objects.get(details='absolute')
+        self.assertEqual(timer.structure, 'Keepstar')
+        self.assertEqual(timer.timer_type, TimerType.FINAL)
+        self.assertEqual(timer.eve_corp, self.user.profile.main_character.corporation)
+        self.assertEqual(timer.user, self.user)
+
+    def test_import_timers_errors(self):
+        wrong_input = self.input_data.copy()
+        wrong_input['hoursLeft'] = 30
+
+        self.client.force_login(self.user)
+
+        response = self.query(
+            '''
+            mutation($timers: [TimerInput!], $notifications: String) {
+                tmrImportTimers(timers: $timers, notifications: $notifications) {
+                    ok
+                    errors
+                    timers {
+                        id
+                    }
+                }
+            }
+            ''',
+            variables={
+                'timers': [self.input_data, wrong_input],
+                'notifications': 'Keepstar in 1DQ1-A anchoring 2030.05.02 18:00\nSomething in Jita',
+            }
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                'data': {
+                    'tmrImportTimers': {
+                        'ok': False,
+                        'errors': [
+                            'Timer 1: Hours left must be between 0 and 23',
+                            'Notification line 2: unknown structure type',
+                        ],
+                        'timers': [],
+                    }
+                }
+            }
+        )
+
+        self.assertEqual(Timer.objects.count(), 1)
+
+    def import_notifications(self, notifications, **variables):
+        response = self.query(
+            '''
+            mutation($notifications: String, $objective: TimerObjectiveChoices) {
+                tmrImportTimers(notifications: $notifications, notificationsObjective: $objective) {
+                    ok
+                    errors
+                    timers {
+                        structure
+                        objective
+                    }
+                }
+            }
+            ''',
+            variables={'notifications': notifications, **variables}
+        )
+        self.assertResponseNoErrors(response)
+        return response.json()['data']['tmrImportTimers']
+
+    def test_import_timers_notifications_objective(self):
+        self.client.force_login(self.user)
+
+        result = self.import_notifications('Keepstar in 1DQ1-A anchoring 2030.05.02 18:00')
+        self.assertEqual(result['timers'], [{'structure': 'Keepstar', 'objective': 'Friendly'}])
+
+        result = self.import_notifications('Keepstar in 1DQ1-A anchoring 2030.05.02 18:00', objective='Hostile')
+        self.assertEqual(result['timers'], [{'structure': 'Keepstar', 'objective': 'Hostile'}])
+
+        self.assertEqual(Timer.objects.filter(objective='Hostile').count(), 1)
+
+    def test_import_timers_structure_names(self):
+        self.client.force_login(self.user)
+
+        result = self.import_notifications(
+            'The Athanor near the Pharolux Cyno Beacon in Jita has lost its shields at 2030.05.01 12:34\n'
+            'pos[m] in Jita anchoring 2030.05.02 18:00'
+        )
+        self.assertTrue(result['ok'])
+        self.assertListEqual(
+            [timer['structure'] for timer in result['timers']],
+            [TimerStructureChoices.Pharolux_Cyno_Beacon.name, TimerStructureChoices.POS_M.name]
+        )
+
+        result = self.import_notifications(
+            'Another Astrahusian structure in Jita anchoring 2030.05.02 18:00'
+        )
+        self.assertFalse(result['ok'])
+        self.assertListEqual(result['errors'], ['Notification line 1: unknown structure type'])
+
+    def test_import_timers_nothing_parsed(self):
+        self.client.force_login(self.user)
+
+        result = self.import_notifications('\n  \n')
+
+        self.assertDictEqual(result, {'ok': False, 'errors': ['No timers to import'], 'timers': []})
+        self.assertEqual(Timer.objects.count(), 1)
+
+
+class TestQueryCounts(QueryCountTestMixin, GraphQLTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.add_permission_to_user_by_name('auth.timer_view', UserMainFactory(), False)
+        cls.corp = cls.user.profile.main_character.corporation
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_timers(self, n, delta):
+        for _ in range(n):
+            Timer.objects.create(
+                timer_type=TimerType.UNSPECIFIED,
+                eve_time=timezone.now() + delta,
+                eve_corp=self.corp,
+                user=UserMainFactory(),
+            )
+
+    def test_future_timers(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                tmrFutureTimers {
+                    id
+                    user {
+                        username
+                    }
+                }
+            }
+            ''',
+            lambda n: self.create_timers(n, datetime.timedelta(days=1))
+        )
+
+    def test_past_timers(self):
+        self.assertQueryCountConstant(
+            '''
+            query {
+                tmrPastTimers {
+                    id
+                    user {
+                        username
+                    }
+                }
+            }
+            ''',
+            lambda n: self.create_timers(n, -datetime.timedelta(days=1))
+        )
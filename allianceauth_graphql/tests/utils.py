@@ -0,0 +1,40 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountTestMixin:
+    """
+    Mixin for GraphQLTestCase that detects N+1 queries in the nested resolvers.
+
+    `assertQueryCountConstant` runs the GraphQL query with N and 2N rows
+    and fails if the number of SQL queries grows with the rows.
+    """
+
+    def count_queries(self, query, **kwargs) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.query(query, **kwargs)
+
+        self.assertResponseNoErrors(response)
+        return len(ctx.captured_queries)
+
+    def assertQueryCountConstant(self, query, create_rows, n=3, **kwargs):
+        """
+        Checks that `query` runs the same number of SQL queries with N and 2N rows.
+
+        `create_rows` is called with N twice and has to create N new rows returned by the query.
+        The other keyword arguments are passed to `self.query`.
+        """
+        # fills the caches used by every request, like the content types
+        self.query(query, **kwargs)
+
+        create_rows(n)
+        queries_n = self.count_queries(query, **kwargs)
+
+        create_rows(n)
+        queries_2n = self.count_queries(query, **kwargs)
+
+        self.assertEqual(
+            queries_2n,
+            queries_n,
+            f"The number of queries grows with the rows: {queries_n} with {n} rows, {queries_2n} with {2 * n} rows"
+        )
@@ -1,14 +1,42 @@
 import datetime
 
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
+from django.db import transaction
 from django.utils import timezone
 
 from allianceauth.timerboard.models import Timer
 
+from ..decorators import permission_required
 from .inputs import TimerInput
-from .types import StructureTimerType
+from .notifications import parse_notifications
+from .types import StructureTimerType, TimerObjectiveChoices
+
+
+def timer_eve_time(input: TimerInput) -> datetime.datetime:
+    """
+    Returns the EVE time of the timer, from the time left or the absolute time.
+
+    Raises ValueError if the time left is invalid or missing.
+    """
+    if input.days_left or input.hours_left or input.minutes_left:
+        if input.days_left and input.days_left < 0:
+            raise ValueError("Days left must be positive")
+        if input.hours_left and (input.hours_left < 0 or input.hours_left > 23):
+            raise ValueError("Hours left must be between 0 and 23")
+        if input.minutes_left and (input.minutes_left < 0 or input.minutes_left > 59):
+            raise ValueError("Minutes left must be between 0 and 59")
+
+        return timezone.now() + datetime.timedelta(
+            days=input.days_left or 0,
+            hours=input.hours_left or 0,
+            minutes=input.minutes_left or 0
+        )
+    elif input.absolute_time:
+        return input.absolute_time
+    else:
+        raise ValueError("Either the time left or the absolute time is required")
 
 
 class AddTimerMutation(graphene.Mutation):
@@ -35,22 +63,9 @@ class AddTimerMutation(graphene.Mutation):
         timer.timer_type = input.timer_type
         timer.objective = input.objective
 
-        if input.days_left or input.hours_left or input.minutes_left:
-            if input.days_left and input.days_left < 0:
-                return cls(ok=False)
-            if input.hours_left and (input.hours_left < 0 or input.hours_left > 23):
-                return cls(ok=False)
-            if input.minutes_left and (input.minutes_left < 0 or input.minutes_left > 59):
-                return cls(ok=False)
-
-            timer.eve_time = timezone.now() + datetime.timedelta(
-                days=input.days_left,
-                hours=input.hours_left,
-                minutes=input.minutes_left
-            )
-        elif input.absolute_time:
-            timer.eve_time = input.absolute_time
-        else:
+        try:
+            timer.eve_time = timer_eve_time(input)
+        except ValueError:
             return cls(ok=False)
 
         timer.important = input.important
@@ -126,7 +141,77 @@ class DeleteTimerMutation(graphene.Mutation):
         return cls(ok=True)
 
 
+class ImportTimersMutation(graphene.Mutation):
+    class Arguments:
+        timers = graphene.List(graphene.NonNull(TimerInput))
+        notifications = graphene.String(description="Structure notifications pasted from the game, one per line")
+        notifications_objective = TimerObjectiveChoices(
+            default_value=TimerObjectiveChoices.Friendly,
+            description="Objective of the timers of the notifications"
+        )
+
+    ok = graphene.Boolean()
+    timers = graphene.List(StructureTimerType)
+    errors = graphene.List(graphene.String)
+
+    @classmethod
+    @login_required
+    @permission_required('auth.timer_management')
+    def mutate(cls, root, info, notifications_objective, timers=None, notifications=None):
+        user = info.context.user
+        char = user.profile.main_character
+        corp = char.corporation
+
+        new_timers = []
+        errors = []
+
+        for index, input in enumerate(timers or []):
+            try:
+                eve_time = timer_eve_time(input)
+            except ValueError as e:
+                errors.append(f"Timer {index}: {e}")
+            else:
+                new_timers.append(
+                    Timer(
+                        details=input.details,
+                        system=input.system,
+                        planet_moon=input.planet_moon,
+                        structure=input.structure.value,
+                        timer_type=input.timer_type.value,
+                        objective=input.objective.value,
+                        eve_time=eve_time,
+                        important=input.important,
+                        corp_timer=input.corp_timer,
+                    )
+                )
+
+        for line, data, error in parse_notifications(notifications or ''):
+            if error is not None:
+                errors.append(f"Notification line {line}: {error}")
+            else:
+                new_timers.append(Timer(objective=notifications_objective.value, **data))
+
+        if not new_timers and not errors:
+            errors.append("No timers to import")
+
+        if errors:
+            return cls(ok=False, timers=[], errors=errors)
+
+        for timer in new_timers:
+            timer.user = user
+            timer.eve_character = char
+            timer.eve_corp = corp
+
+        # saved one by one, bulk_create doesn't set the pks on every database backend
+        with transaction.atomic():
+            for timer in new_timers:
+                timer.save()
+
+        return cls(ok=True, timers=new_timers, errors=[])
+
+
 class Mutation:
     tmr_add_timer = AddTimerMutation.Field()
     tmr_edit_timer = EditTimerMutation.Field()
     tmr_delete_timer = DeleteTimerMutation.Field()
+    tmr_import_timers = ImportTimersMutation.Field()
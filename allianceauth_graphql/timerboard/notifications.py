@@ -0,0 +1,90 @@
+import datetime
+import re
+
+from allianceauth.timerboard.models import TimerType
+
+from .types import TimerStructureChoices
+
+
+EVE_TIME_RE = re.compile(r'(?P<time>\d{4}\.\d{2}\.\d{2} \d{2}:\d{2}(?::\d{2})?)')
+SYSTEM_RE = re.compile(r'\bin (?P<system>[\w-]+)')
+
+# names of the structures by lower case, "Other" isn't a structure name used by the notifications
+STRUCTURES = {
+    choice.value.lower(): choice.value
+    for choice in TimerStructureChoices
+    if choice != TimerStructureChoices.Other
+}
+
+# whole names only, so that a structure name inside another word doesn't match
+STRUCTURE_RE = re.compile(
+    r'(?<!\w)(?:%s)(?!\w)' % '|'.join(re.escape(name) for name in sorted(STRUCTURES, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+# the timer following the event described by the notification
+TIMER_TYPES = [
+    ('unanchor', TimerType.UNANCHORING),
+    ('anchor', TimerType.ANCHORING),
+    ('lost its shield', TimerType.ARMOR),
+    ('lost its armor', TimerType.HULL),
+    ('lost its hull', TimerType.FINAL),
+]
+
+
+def parse_eve_time(value) -> datetime.datetime:
+    time_format = '%Y.%m.%d %H:%M:%S' if value.count(':') == 2 else '%Y.%m.%d %H:%M'
+    return datetime.datetime.strptime(value, time_format).replace(tzinfo=datetime.timezone.utc)
+
+
+def parse_structure(line):
+    """Returns the longest structure name in the line, or None"""
+    names = STRUCTURE_RE.findall(line)
+    return STRUCTURES[max(names, key=len).lower()] if names else None
+
+
+def parse_notification_line(line) -> dict:
+    """
+    Parses a line of a structure notification pasted from the game.
+
+    The line has to contain the structure type, the system after "in" and the EVE time
+    the structure comes out of reinforcement, like:
+    `The Astrahus "Home" in Jita has lost its shields and will come out of reinforcement at 2024.05.01 12:34:56`
+
+    Raises ValueError if one of them is missing.
+    """
+    structure = parse_structure(line)
+    if structure is None:
+        raise ValueError("unknown structure type")
+
+    system = SYSTEM_RE.search(line)
+    if system is None:
+        raise ValueError("missing system")
+
+    eve_time = EVE_TIME_RE.search(line)
+    if eve_time is None:
+        raise ValueError("missing EVE time")
+
+    timer_type = next(
+        (timer_type for keyword, timer_type in TIMER_TYPES if keyword in line.lower()),
+        TimerType.UNSPECIFIED
+    )
+
+    return {
+        'details': line[:254],
+        'system': system.group('system'),
+        'structure': structure,
+        'timer_type': timer_type,
+        'eve_time': parse_eve_time(eve_time.group('time')),
+    }
+
+
+def parse_notifications(text):
+    """Yields the line number and the parsed timer or the error of every non empty line"""
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if line:
+            try:
+                yield number, parse_notification_line(line), None
+            except ValueError as e:
+                yield number, None, str(e)
@@ -1,38 +1,78 @@
 import graphene
-from graphql_jwt.decorators import login_required, permission_required
+from graphql_jwt.decorators import login_required
 
-from django.db.models import Q
+from django.conf import settings
 from django.utils import timezone
 
 from allianceauth.timerboard.models import Timer
 
+from ..decorators import permission_required
+from ..pagination import pagination_arguments, paginate
 from .types import StructureTimerType
 
 
+TIMERS_DEFAULT_LIMIT = getattr(settings, 'GRAPHQL_TIMERS_DEFAULT_LIMIT', 200)
+
+
+def timers_window_arguments():
+    return {
+        'from_': graphene.DateTime(name='from'),
+        'to': graphene.DateTime(),
+        **pagination_arguments(default_limit=TIMERS_DEFAULT_LIMIT),
+    }
+
+
+def aware(value):
+    """Interprets a date without offset in the current time zone, like the DateTimeFields do"""
+    if value is not None and timezone.is_naive(value):
+        return timezone.make_aware(value)
+    return value
+
+
+def visible_timers(user, from_=None, to=None):
+    """
+    Timers the user can see in the window, without ordering.
+
+    The public and the corp timers are selected by two queries combined with UNION ALL,
+    so that each of them can use its own index on the time instead of scanning for the OR.
+    """
+    timers = Timer.objects.select_related('user').order_by()
+    if from_ is not None:
+        timers = timers.filter(eve_time__gte=from_)
+    if to is not None:
+        timers = timers.filter(eve_time__lt=to)
+
+    public_timers = timers.filter(corp_timer=False)
+    corp_timers = timers.filter(
+        corp_timer=True,
+        eve_corp__corporation_id=user.profile.main_character.corporation_id
+    )
+
+    return public_timers.union(corp_timers, all=True)
+
+
 class Query:
-    tmr_future_timers = graphene.List(StructureTimerType, required=True)
-    tmr_past_timers = graphene.List(StructureTimerType, required=True)
+    tmr_future_timers = graphene.List(StructureTimerType, required=True, **timers_window_arguments())
+    tmr_past_timers = graphene.List(StructureTimerType, required=True, **timers_window_arguments())
 
     @login_required
     @permission_required('auth.timer_view')
-    def resolve_tmr_future_timers(self, info):
-        return Timer.objects.filter(
-            (
-                Q(corp_timer=True) &
-                Q(eve_corp=info.context.user.profile.main_character.corporation)
-            ) |
-            Q(corp_timer=False),
-            eve_time__gte=timezone.now()
+    def resolve_tmr_future_timers(self, info, offset, limit, from_=None, to=None):
+        now = timezone.now()
+        timers = visible_timers(
+            info.context.user,
+            from_=now if from_ is None else max(aware(from_), now),
+            to=aware(to)
         )
+        return paginate(timers.order_by('eve_time', 'id'), offset, limit)
 
     @login_required
     @permission_required('auth.timer_view')
-    def resolve_tmr_past_timers(self, info):
-        return Timer.objects.filter(
-            (
-                Q(corp_timer=True) &
-                Q(eve_corp=info.context.user.profile.main_character.corporation)
-            ) |
-            Q(corp_timer=False),
-            eve_time__lt=timezone.now()
+    def resolve_tmr_past_timers(self, info, offset, limit, from_=None, to=None):
+        now = timezone.now()
+        timers = visible_timers(
+            info.context.user,
+            from_=aware(from_),
+            to=now if to is None else min(aware(to), now)
         )
+        return paginate(timers.order_by('-eve_time', '-id'), offset, limit)
@@ -1,3 +1,4 @@
+from django.apps import apps
 from django.urls import path
 from django.conf import settings
 from graphene_django.views import GraphQLView
@@ -12,3 +13,8 @@ urlpatterns = [
     path("", csrf_exempt(GraphQLView.as_view(graphiql=getattr(settings, 'SHOW_GRAPHIQL', True), schema=schema)), name='graphql'),
     path('verify/', verify_email, name='verify_email')
 ]
+
+if apps.is_installed('allianceauth.timerboard') and apps.is_installed('allianceauth.optimer'):
+    from .calendar.views import calendar_feed
+
+    urlpatterns.append(path('calendar/<str:token>.ics', calendar_feed, name='calendar_feed'))
@@ -0,0 +1,428 @@
+"""
+Representative queries run by the benchmarks.
+
+Every entry has a unique name, the module it exercises, the GraphQL document
+and a function returning the variables from the references of the generated data.
+"""
+import datetime
+
+from django.utils import timezone
+
+
+USER_FRAGMENT = """
+fragment BenchmarkUser on UserType {
+    id
+    username
+    profile {
+        mainCharacter {
+            characterName
+            corporationName
+            allianceName
+        }
+        state {
+            name
+        }
+    }
+}
+"""
+
+
+def no_variables(refs):
+    return {}
+
+
+def calendar_window(refs):
+    now = timezone.now()
+    return {
+        'from': (now - datetime.timedelta(days=7)).isoformat(),
+        'to': (now + datetime.timedelta(days=7)).isoformat(),
+    }
+
+
+CATALOGUE = [
+    {
+        'name': 'authentication.me',
+        'module': 'authentication',
+        'query': """
+            query {
+                me {
+                    ...BenchmarkUser
+                }
+            }
+        """ + USER_FRAGMENT,
+        'variables': no_variables,
+    },
+    {
+        'name': 'authentication.user_characters',
+        'module': 'authentication',
+        'query': """
+            query {
+                authenticationUserCharacters {
+                    characterName
+                    corporation {
+                        corporationName
+                    }
+                    alliance {
+                        allianceName
+                    }
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'fleetactivitytracking.fatlinks',
+        'module': 'fleetactivitytracking',
+        'query': """
+            query {
+                fatGetFatlinks(num: 100) {
+                    fleet
+                    fatdatetime
+                    creator {
+                        username
+                    }
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'fleetactivitytracking.corp_monthly_stats',
+        'module': 'fleetactivitytracking',
+        'query': """
+            query ($corpId: Int!, $year: Int!, $month: Int!) {
+                fatCorpMonthlyStats(corpId: $corpId, year: $year, month: $month) {
+                    user {
+                        username
+                    }
+                    numChars
+                    numFats
+                }
+            }
+        """,
+        'variables': lambda refs: {'corpId': refs['corp_id'], 'year': refs['year'], 'month': refs['month']},
+    },
+    {
+        'name': 'fleetactivitytracking.general_monthly_stats',
+        'module': 'fleetactivitytracking',
+        'query': """
+            query ($year: Int!, $month: Int!) {
+                fatGeneralMonthlyStats(year: $year, month: $month) {
+                    corporation {
+                        corporationName
+                    }
+                    numFats
+                    avgFats
+                }
+            }
+        """,
+        'variables': lambda refs: {'year': refs['year'], 'month': refs['month']},
+    },
+    {
+        'name': 'groupmanagement.groups',
+        'module': 'groupmanagement',
+        'query': """
+            query {
+                groupmanagementGroups {
+                    id
+                    name
+                    numMembers
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'groupmanagement.manage_requests',
+        'module': 'groupmanagement',
+        'query': """
+            query {
+                groupmanagementManageRequests {
+                    acceptRequests {
+                        id
+                        user {
+                            ...BenchmarkUser
+                        }
+                        group {
+                            name
+                        }
+                    }
+                    leaveRequests {
+                        id
+                        user {
+                            ...BenchmarkUser
+                        }
+                        group {
+                            name
+                        }
+                    }
+                    autoLeave
+                }
+            }
+        """ + USER_FRAGMENT,
+        'variables': no_variables,
+    },
+    {
+        'name': 'groupmanagement.group_memberships',
+        'module': 'groupmanagement',
+        'query': """
+            query ($groupId: Int!) {
+                groupmanagementGroupMemberships(groupId: $groupId) {
+                    group {
+                        name
+                    }
+                    members {
+                        user {
+                            ...BenchmarkUser
+                        }
+                        isLeader
+                    }
+                }
+            }
+        """ + USER_FRAGMENT,
+        'variables': lambda refs: {'groupId': refs['group_id']},
+    },
+    {
+        'name': 'groupmanagement.group_membership_audit',
+        'module': 'groupmanagement',
+        'query': """
+            query ($groupId: Int!) {
+                groupmanagementGroupMembershipAudit(groupId: $groupId) {
+                    group {
+                        name
+                    }
+                    entries {
+                        id
+                        date
+                        requestType
+                        action
+                        requestor {
+                            ...BenchmarkUser
+                        }
+                    }
+                }
+            }
+        """ + USER_FRAGMENT,
+        'variables': lambda refs: {'groupId': refs['group_id']},
+    },
+    {
+        'name': 'hrapplications.corp_applications',
+        'module': 'hrapplications',
+        'query': """
+            query {
+                hrCorpApplications {
+                    id
+                    status
+                    created
+                    user {
+                        ...BenchmarkUser
+                    }
+                    form {
+                        corp {
+                            corporationName
+                        }
+                    }
+                    responses {
+                        question {
+                            title
+                        }
+                        answer
+                    }
+                    comments {
+                        text
+                    }
+                }
+            }
+        """ + USER_FRAGMENT,
+        'variables': no_variables,
+    },
+    {
+        'name': 'hrapplications.available_forms',
+        'module': 'hrapplications',
+        'query': """
+            query {
+                hrListAvailableForms {
+                    id
+                    corp {
+                        corporationName
+                    }
+                    questions {
+                        title
+                        helpText
+                        multiSelect
+                        choices {
+                            choiceText
+                        }
+                    }
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'notifications.unread_list',
+        'module': 'notifications',
+        'query': """
+            query {
+                notifUnreadList {
+                    id
+                    title
+                    message
+                    timestamp
+                }
+                notifUnreadCount
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'optimer.future_timers',
+        'module': 'optimer',
+        'query': """
+            query {
+                optimerFutureTimers {
+                    operationName
+                    start
+                    system
+                    type {
+                        type
+                    }
+                    eveCharacter {
+                        characterName
+                    }
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'optimer.timer_summaries',
+        'module': 'optimer',
+        'query': """
+            query {
+                optimerTimerSummaries {
+                    id
+                    operationName
+                    start
+                    typeName
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'srp.fleets',
+        'module': 'srp',
+        'query': """
+            query {
+                srpGetFleets(all: true) {
+                    id
+                    fleetName
+                    fleetTime
+                    totalCost
+                    pendingRequests
+                    fleetCommander {
+                        characterName
+                    }
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'timerboard.future_timers',
+        'module': 'timerboard',
+        'query': """
+            query {
+                tmrFutureTimers {
+                    id
+                    details
+                    system
+                    structure
+                    eveTime
+                    corpTimer
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'timerboard.past_timers',
+        'module': 'timerboard',
+        'query': """
+            query {
+                tmrPastTimers {
+                    id
+                    details
+                    system
+                    structure
+                    eveTime
+                    corpTimer
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'calendar.events',
+        'module': 'calendar',
+        'query': """
+            query($from: DateTime!, $to: DateTime!) {
+                calendarEvents(from: $from, to: $to) {
+                    ... on StructureTimerType {
+                        id
+                        system
+                        structure
+                        eveTime
+                    }
+                    ... on OpTimerModelType {
+                        id
+                        operationName
+                        start
+                        type {
+                            type
+                        }
+                    }
+                }
+            }
+        """,
+        'variables': calendar_window,
+    },
+    {
+        'name': 'pve.active_rotations',
+        'module': 'allianceauth_pve',
+        'query': """
+            query {
+                pveActiveRotations {
+                    id
+                    name
+                    estimatedTotal
+                    salesPercentage
+                    summary {
+                        mainCharacter {
+                            characterName
+                        }
+                        helpedSetups
+                        estimatedTotal
+                        actualTotal
+                    }
+                }
+            }
+        """,
+        'variables': no_variables,
+    },
+    {
+        'name': 'pve.char_running_averages',
+        'module': 'allianceauth_pve',
+        'query': """
+            query ($startDate: Date!) {
+                pveCharRunningAverages(startDate: $startDate) {
+                    helpedSetups
+                    estimatedTotal
+                    actualTotal
+                }
+            }
+        """,
+        'variables': lambda refs: {'startDate': refs['start_date'].isoformat()},
+    },
+]
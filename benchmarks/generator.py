@@ -0,0 +1,363 @@
+"""
+Synthetic alliance data for the benchmarks.
+
+All the rows are inserted with `bulk_create`, so the model signals are not fired
+and the generated data doesn't depend on ESI or on any external service.
+"""
+
+import random
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from allianceauth.authentication.models import CharacterOwnership, State, UserProfile, get_guest_state
+from allianceauth.eveonline.models import EveAllianceInfo, EveCharacter, EveCorporationInfo
+from allianceauth.fleetactivitytracking.models import Fat, Fatlink
+from allianceauth.groupmanagement.models import GroupRequest, RequestLog
+from allianceauth.hrapplications.models import (
+    Application, ApplicationChoice, ApplicationComment, ApplicationForm, ApplicationQuestion, ApplicationResponse,
+)
+from allianceauth.notifications.models import Notification
+from allianceauth.optimer.models import OpTimer, OpTimerType
+from allianceauth.srp.models import SrpFleetMain, SrpUserRequest
+from allianceauth.timerboard.models import Timer
+
+from allianceauth_pve.models import Entry, EntryCharacter, EntryRole, Rotation
+
+
+DEFAULT_SIZES = {
+    'alliances': 5,
+    'corporations': 50,
+    'users': 2000,
+    'characters_per_user': 10,
+    'groups': 30,
+    'group_members': 200,
+    'group_requests': 1000,
+    'request_logs': 5000,
+    'fatlinks': 500,
+    'fats_per_fatlink': 40,
+    'srp_fleets': 200,
+    'srp_requests_per_fleet': 25,
+    'notifications_per_user': 10,
+    'timers': 5000,
+    'optimers': 2000,
+    'application_forms': 10,
+    'questions_per_form': 5,
+    'applications': 1000,
+    'rotations': 10,
+    'entries_per_rotation': 50,
+    'shares_per_entry': 10,
+}
+
+SHIPS = ('Rifter', 'Caracal', 'Hurricane', 'Drake', 'Megathron', 'Guardian', 'Scimitar', 'Sabre', 'Loki', 'Nightmare')
+SYSTEMS = ('1DQ1-A', 'T5ZI-S', 'Jita', 'Amarr', 'Y-2ANO', 'O-EIMK', 'K-6K16', 'GE-8JV')
+STRUCTURES = ('POCO', 'I-HUB', 'TCU', 'Astrahus', 'Fortizar', 'Keepstar', 'Raitaru', 'Azbel', 'Athanor', 'Tatara')
+
+BATCH_SIZE = 1000
+
+
+def scaled_sizes(scale=1.0, **overrides) -> dict:
+    """Returns the default totals multiplied by `scale`, the per-object sizes and the `overrides` are kept as they are"""
+    sizes = {
+        name: value if '_per_' in name else max(1, int(value * scale))
+        for name, value in DEFAULT_SIZES.items()
+    }
+    sizes.update(overrides)
+    return sizes
+
+
+def _bulk_create(model, objs):
+    return model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+
+
+@transaction.atomic
+def generate(sizes: dict = None, seed: int = 42) -> dict:
+    """
+    Fills the database with the synthetic data.
+
+    Returns the references used by the benchmark queries (benchmark user, ids, dates).
+    """
+    sizes = {**DEFAULT_SIZES, **(sizes or {})}
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    alliances = _bulk_create(EveAllianceInfo, [
+        EveAllianceInfo(
+            alliance_id=99000000 + i,
+            alliance_name=f'Alliance {i}',
+            alliance_ticker=f'A{i}',
+            executor_corp_id=98000000 + i,
+        )
+        for i in range(sizes['alliances'])
+    ])
+
+    corporations = _bulk_create(EveCorporationInfo, [
+        EveCorporationInfo(
+            corporation_id=98000000 + i,
+            corporation_name=f'Corporation {i}',
+            corporation_ticker=f'C{i}',
+            member_count=sizes['users'] // sizes['corporations'],
+            alliance=alliances[i % len(alliances)],
+        )
+        for i in range(sizes['corporations'])
+    ])
+
+    characters = []
+    for i in range(sizes['users'] * sizes['characters_per_user']):
+        corp = corporations[i % len(corporations)]
+        alliance = alliances[corp.corporation_id % len(alliances)]
+        characters.append(EveCharacter(
+            character_id=90000000 + i,
+            character_name=f'Character {i}',
+            corporation_id=corp.corporation_id,
+            corporation_name=corp.corporation_name,
+            corporation_ticker=corp.corporation_ticker,
+            alliance_id=alliance.alliance_id,
+            alliance_name=alliance.alliance_name,
+            alliance_ticker=alliance.alliance_ticker,
+        ))
+    characters = _bulk_create(EveCharacter, characters)
+
+    guest_state = get_guest_state()
+    member_state, _ = State.objects.get_or_create(name='Member', defaults={'priority': 100})
+    member_state.member_alliances.add(*alliances)
+
+    users = _bulk_create(User, [
+        User(username=f'user_{i}', password='!', email=f'user_{i}@example.com')
+        for i in range(sizes['users'])
+    ])
+    users_characters = [
+        characters[i * sizes['characters_per_user']:(i + 1) * sizes['characters_per_user']]
+        for i in range(len(users))
+    ]
+
+    _bulk_create(UserProfile, [
+        UserProfile(
+            user=user,
+            main_character=user_characters[0],
+            state=member_state if i % 10 else guest_state,
+        )
+        for i, (user, user_characters) in enumerate(zip(users, users_characters))
+    ])
+    _bulk_create(CharacterOwnership, [
+        CharacterOwnership(user=user, character=character, owner_hash=f'hash{character.character_id}')
+        for user, user_characters in zip(users, users_characters)
+        for character in user_characters
+    ])
+
+    benchmark_user = users[0]
+    benchmark_user.is_superuser = True
+    benchmark_user.is_staff = True
+    benchmark_user.save()
+
+    groups = []
+    for i in range(sizes['groups']):
+        group = Group.objects.create(name=f'Group {i}')
+        group.authgroup.internal = False
+        group.authgroup.hidden = False
+        group.authgroup.open = i % 3 == 0
+        group.authgroup.save()
+        group.authgroup.group_leaders.add(*rng.sample(users, 3))
+        groups.append(group)
+
+    memberships = []
+    for group in groups:
+        for user in rng.sample(users, min(sizes['group_members'], len(users))):
+            memberships.append(User.groups.through(user=user, group=group))
+    _bulk_create(User.groups.through, memberships)
+
+    requests_keys = set()
+    group_requests = []
+    for _ in range(sizes['group_requests']):
+        user = rng.choice(users)
+        group = rng.choice(groups)
+        if (user.pk, group.pk) not in requests_keys:
+            requests_keys.add((user.pk, group.pk))
+            group_requests.append(GroupRequest(user=user, group=group, leave_request=rng.random() < 0.3))
+    _bulk_create(GroupRequest, group_requests)
+
+    request_logs = []
+    for _ in range(sizes['request_logs']):
+        user_index = rng.randrange(len(users))
+        request_logs.append(RequestLog(
+            request_type=rng.choice((None, True, False)),
+            group=rng.choice(groups),
+            request_info=f'{users[user_index].username}:{users_characters[user_index][0].character_name}',
+            action=rng.random() < 0.8,
+            request_actor=benchmark_user,
+        ))
+    _bulk_create(RequestLog, request_logs)
+
+    fatlinks = _bulk_create(Fatlink, [
+        Fatlink(
+            fatdatetime=now - timedelta(hours=rng.randrange(24 * 365)),
+            duration=rng.randrange(30, 240),
+            fleet=f'Fleet {i}',
+            hash=f'fatlink{i}',
+            creator=rng.choice(users),
+        )
+        for i in range(sizes['fatlinks'])
+    ])
+    fats = []
+    for fatlink in fatlinks:
+        for user_index in rng.sample(range(len(users)), min(sizes['fats_per_fatlink'], len(users))):
+            fats.append(Fat(
+                character=rng.choice(users_characters[user_index]),
+                fatlink=fatlink,
+                system=rng.choice(SYSTEMS),
+                shiptype=rng.choice(SHIPS),
+                station='No Station',
+                user=users[user_index],
+            ))
+    _bulk_create(Fat, fats)
+
+    srp_fleets = _bulk_create(SrpFleetMain, [
+        SrpFleetMain(
+            fleet_name=f'SRP Fleet {i}',
+            fleet_doctrine='Doctrine',
+            fleet_time=now - timedelta(hours=rng.randrange(24 * 90)),
+            fleet_srp_code=f'srp{i}',
+            fleet_srp_status='' if i % 4 else 'Completed',
+            fleet_commander=rng.choice(characters),
+        )
+        for i in range(sizes['srp_fleets'])
+    ])
+    srp_requests = []
+    for fleet in srp_fleets:
+        for _ in range(sizes['srp_requests_per_fleet']):
+            loss = rng.randrange(1_000_000, 50_000_000)
+            srp_requests.append(SrpUserRequest(
+                killboard_link=f'https://zkillboard.com/kill/{len(srp_requests) + 1}/',
+                srp_status=rng.choice(('Pending', 'Approved', 'Rejected')),
+                srp_total_amount=loss,
+                kb_total_loss=loss,
+                srp_ship_name=rng.choice(SHIPS),
+                character=rng.choice(characters),
+                srp_fleet_main=fleet,
+            ))
+    _bulk_create(SrpUserRequest, srp_requests)
+
+    _bulk_create(Notification, [
+        Notification(
+            user=user,
+            title=f'Notification {i}',
+            message='Benchmark notification',
+            viewed=rng.random() < 0.5,
+        )
+        for user in users
+        for i in range(sizes['notifications_per_user'])
+    ])
+
+    _bulk_create(Timer, [
+        Timer(
+            details=f'Timer {i}',
+            system=rng.choice(SYSTEMS),
+            structure=rng.choice(STRUCTURES),
+            objective=rng.choice(('Friendly', 'Hostile', 'Neutral')),
+            eve_time=now + timedelta(minutes=rng.randrange(-60 * 24 * 365, 60 * 24 * 365)),
+            eve_character=rng.choice(characters),
+            eve_corp=rng.choice(corporations),
+            corp_timer=rng.random() < 0.3,
+            user=rng.choice(users),
+        )
+        for i in range(sizes['timers'])
+    ])
+
+    optimer_types = _bulk_create(OpTimerType, [OpTimerType(type=name) for name in ('CTA', 'Stratop', 'Roam', 'Mining')])
+    _bulk_create(OpTimer, [
+        OpTimer(
+            doctrine='Doctrine',
+            system=rng.choice(SYSTEMS),
+            start=now + timedelta(minutes=rng.randrange(-60 * 24 * 365, 60 * 24 * 365)),
+            duration='1h',
+            operation_name=f'Operation {i}',
+            fc='FC',
+            eve_character=rng.choice(characters),
+            type=rng.choice(optimer_types),
+        )
+        for i in range(sizes['optimers'])
+    ])
+
+    forms = []
+    questions = []
+    for corp in corporations[:sizes['application_forms']]:
+        form = ApplicationForm.objects.create(corp=corp)
+        form_questions = _bulk_create(ApplicationQuestion, [
+            ApplicationQuestion(title=f'Question {i}', help_text='Help', multi_select=i % 2 == 0)
+            for i in range(sizes['questions_per_form'])
+        ])
+        form.questions.add(*form_questions)
+        forms.append(form)
+        questions.append(form_questions)
+    _bulk_create(ApplicationChoice, [
+        ApplicationChoice(question=question, choice_text=f'Choice {i}')
+        for form_questions in questions
+        for question in form_questions
+        for i in range(3)
+    ])
+
+    applications_keys = set()
+    applications = []
+    for _ in range(sizes['applications']):
+        form_index = rng.randrange(len(forms))
+        user = rng.choice(users[1:])
+        if (form_index, user.pk) not in applications_keys:
+            applications_keys.add((form_index, user.pk))
+            applications.append(Application(
+                form=forms[form_index],
+                user=user,
+                approved=rng.choice((None, None, True, False)),
+            ))
+    applications = _bulk_create(Application, applications)
+    _bulk_create(ApplicationResponse, [
+        ApplicationResponse(question=question, application=application, answer='Answer')
+        for application in applications
+        for question in questions[forms.index(application.form)]
+    ])
+    _bulk_create(ApplicationComment, [
+        ApplicationComment(application=application, user=benchmark_user, text='Comment')
+        for application in applications[::3]
+    ])
+
+    rotations = _bulk_create(Rotation, [
+        Rotation(name=f'Rotation {i}', is_closed=i > 1, closed_at=now if i > 1 else None, actual_total=rng.randrange(10**9))
+        for i in range(sizes['rotations'])
+    ])
+    entries = _bulk_create(Entry, [
+        Entry(rotation=rotation, estimated_total=rng.randrange(10**7), created_by=benchmark_user)
+        for rotation in rotations
+        for _ in range(sizes['entries_per_rotation'])
+    ])
+    roles = _bulk_create(EntryRole, [
+        EntryRole(entry=entry, name=name, value=value)
+        for entry in entries
+        for name, value in (('Krab', 1), ('Logi', 2))
+    ])
+    shares = []
+    for entry_index, entry in enumerate(entries):
+        for user_index in [0] + rng.sample(range(1, len(users)), min(sizes['shares_per_entry'], len(users)) - 1):
+            shares.append(EntryCharacter(
+                entry=entry,
+                user=users[user_index],
+                user_character=users_characters[user_index][0],
+                role=roles[entry_index * 2 + rng.randrange(2)],
+                site_count=rng.randrange(1, 5),
+                helped_setup=rng.random() < 0.2,
+            ))
+    _bulk_create(EntryCharacter, shares)
+    # the signals didn't store the rotation summaries and daily totals, like on an install before the backfill
+    call_command('graphql_pve_backfill', stdout=StringIO())
+
+    return {
+        'user': benchmark_user,
+        'corp_id': corporations[0].corporation_id,
+        'group_id': groups[0].pk,
+        'rotation_id': rotations[0].pk,
+        'year': now.year,
+        'month': now.month,
+        'start_date': (now - timedelta(days=365)).date(),
+    }
@@ -0,0 +1,185 @@
+"""
+Runs the benchmark catalogue against a synthetic dataset on an in-memory SQLite database.
+
+For every query it reports the median wall time, the number of SQL queries and the peak
+memory allocated while executing it, then compares the results with the stored baseline.
+
+Usage, from the repository root:
+
+    python -m benchmarks.run [--scale 0.1] [--size timers=100000] [--only srp] [--update-baseline]
+
+The command exits with status 1 when a query regresses compared to the baseline.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+
+# wall time and memory depend on the machine, the query count doesn't
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.25
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the GraphQL schema on synthetic data.")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiplier applied to the default data sizes.")
+    parser.add_argument('--size', action='append', default=[], metavar='NAME=VALUE', help="Overrides a single data size.")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of timed runs of each query.")
+    parser.add_argument('--only', action='append', default=[], metavar='MODULE', help="Runs only the queries of the module.")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help="Path of the baseline file.")
+    parser.add_argument('--update-baseline', action='store_true', help="Stores the results as the new baseline.")
+    parser.add_argument('--json', type=Path, help="Writes the results to this file.")
+    return parser.parse_args(argv)
+
+
+def setup_database():
+    from django.db import connection
+
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+
+
+def new_request(user):
+    from django.test import RequestFactory
+
+    request = RequestFactory().post('/graphql')
+    request.user = user
+    return request
+
+
+def execute(schema, entry, refs):
+    result = schema.execute(
+        entry['query'],
+        variable_values=entry['variables'](refs),
+        context_value=new_request(refs['user']),
+    )
+    if result.errors:
+        raise RuntimeError(f"{entry['name']} failed: {result.errors[0]}")
+    return result
+
+
+def measure(schema, entry, refs, repeat):
+    from django.db import connection, reset_queries
+    from django.test.utils import CaptureQueriesContext
+
+    # warm up graphql validation caches and the ORM before timing
+    execute(schema, entry, refs)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        execute(schema, entry, refs)
+        timings.append(time.perf_counter() - start)
+
+    # the queries log is bounded, a full log would hide the captured queries
+    reset_queries()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as ctx:
+            execute(schema, entry, refs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'module': entry['module'],
+        'time_ms': round(statistics.median(timings) * 1000, 2),
+        'queries': len(ctx.captured_queries),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline):
+    """Returns the list of the regressions of the results compared to the baseline"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+
+        if result['queries'] > reference['queries']:
+            regressions.append(f"{name}: {result['queries']} queries, baseline {reference['queries']}")
+        if result['time_ms'] > reference['time_ms'] * (1 + TIME_TOLERANCE):
+            regressions.append(f"{name}: {result['time_ms']} ms, baseline {reference['time_ms']} ms")
+        if result['peak_kib'] > reference['peak_kib'] * (1 + MEMORY_TOLERANCE):
+            regressions.append(f"{name}: {result['peak_kib']} KiB, baseline {reference['peak_kib']} KiB")
+
+    return regressions
+
+
+def print_report(results, baseline):
+    print(f"{'query':<45} {'time ms':>10} {'queries':>8} {'peak KiB':>10}   baseline")
+    for name, result in results.items():
+        reference = baseline.get(name)
+        reference_str = (
+            f"{reference['time_ms']} ms, {reference['queries']} queries, {reference['peak_kib']} KiB"
+            if reference else "-"
+        )
+        print(f"{name:<45} {result['time_ms']:>10} {result['queries']:>8} {result['peak_kib']:>10}   {reference_str}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+
+    from allianceauth_graphql.schema import schema
+
+    from .catalogue import CATALOGUE
+    from .generator import generate, scaled_sizes
+
+    overrides = {}
+    for size in args.size:
+        name, value = size.split('=')
+        overrides[name] = int(value)
+    sizes = scaled_sizes(args.scale, **overrides)
+
+    setup_database()
+    start = time.perf_counter()
+    refs = generate(sizes)
+    print(f"Generated data in {time.perf_counter() - start:.1f} s: {sizes}")
+
+    results = {
+        entry['name']: measure(schema, entry, refs, args.repeat)
+        for entry in CATALOGUE
+        if not args.only or entry['module'] in args.only
+    }
+
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    # timings of different datasets are not comparable
+    baseline = stored.get('results', {}) if stored.get('sizes') == sizes else {}
+
+    print_report(results, baseline)
+
+    if args.json:
+        args.json.write_text(json.dumps({'sizes': sizes, 'results': results}, indent=4) + '\n')
+
+    if args.update_baseline:
+        if stored.get('sizes') == sizes:
+            results = {**stored['results'], **results}
+        args.baseline.write_text(json.dumps({'sizes': sizes, 'results': results}, indent=4, sort_keys=True) + '\n')
+        print(f"Baseline stored in {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
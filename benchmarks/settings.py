@@ -0,0 +1,49 @@
+# flake8: noqa
+"""
+Settings for running the benchmarks on SQLite without any external service.
+
+The cache keeps the redis backend required by AllianceAuth but ignores the connection errors,
+so every benchmark runs with a cold cache when no redis server is available.
+"""
+
+from django.db.backends.signals import connection_created
+
+from testauth.settings import *
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{os.environ.get('AA_REDIS', 'localhost:6379')}/1",
+        "OPTIONS": {
+            "SOCKET_CONNECT_TIMEOUT": 0.1,
+            "SOCKET_TIMEOUT": 0.1,
+        },
+    }
+}
+
+DJANGO_REDIS_IGNORE_EXCEPTIONS = True
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': True,
+    'root': {'level': 'CRITICAL'},
+}
+
+DEBUG = False
+
+
+def _sqlite_legacy_alter_table(sender, connection, **kwargs):
+    # needed by the allianceauth_pve migrations that rename tables referenced by views
+    if connection.vendor == 'sqlite':
+        connection.cursor().execute('PRAGMA legacy_alter_table = ON')
+
+
+connection_created.connect(_sqlite_legacy_alter_table)
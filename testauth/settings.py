@@ -45,6 +45,8 @@ SECRET_KEY = "wow I'm a really bad default secret key"
 
 # Celery configuration
 BROKER_URL = "redis://localhost:6379/0"
+CELERY_ALWAYS_EAGER = True
+CELERY_EAGER_PROPAGATES_EXCEPTIONS = True
 CELERYBEAT_SCHEDULER = "django_celery_beat.schedulers.DatabaseScheduler"
 CELERYBEAT_SCHEDULE = {
     "esi_cleanup_callbackredirect": {
@@ -350,7 +352,7 @@ GRAPHENE = {
 }
 
 AUTHENTICATION_BACKENDS += [
-    "graphql_jwt.backends.JSONWebTokenBackend",
+    "allianceauth_graphql.authentication.backends.JSONWebTokenBackend",
 ]
 
 GRAPHQL_JWT = {